@@ -0,0 +1,87 @@
+"""
+Модуль сравнивает полную выгрузку фильмов обычным извлекателем и извлекателем COPY.
+
+Оба извлекателя выгружают все данные процесса, как при первичной загрузке, без загрузки в Elasticsearch.
+
+Запуск из каталога etl:
+    python -m benchmarks.extractors --process movie_film_work
+"""
+import argparse
+from time import perf_counter
+
+import psycopg2
+from psycopg2.extras import DictCursor
+
+from config.settings import (
+    PG_DSL, QUERY_TYPE, DB_BUFFER_SIZE, DB_COPY_BUFFER_CHUNKS, ETL_JSON_DOCUMENTS, ETLProcessType,
+)
+from services.process.extractors.extractors import BaseExtractor, PostgreExtractor, CopyPostgreExtractor
+from services.process.queries.queries import ETLQueryFactory
+from services.storages.key_value_storages import MemoryStorage
+
+# Outbox выгружает фильмы по очереди изменений, а не целиком, поэтому COPY для него не используется.
+EXCLUDED_PROCESS_TYPES = (ETLProcessType.MOVIE_OUTBOX,)
+
+
+def measure_extractor(extractor: BaseExtractor) -> float:
+    """
+    Функция замеряет полную выгрузку данных извлекателем.
+
+    Args:
+        extractor: извлекатель данных.
+
+    Returns:
+        время выгрузки в секундах.
+    """
+    started = perf_counter()
+
+    for _ in extractor.extract():
+        pass
+
+    return perf_counter() - started
+
+
+def main():
+    """Основная функция, запускающая замер извлекателей."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--process',
+        dest='process_type',
+        type=ETLProcessType,
+        choices=[process_type for process_type in ETLProcessType if process_type not in EXCLUDED_PROCESS_TYPES],
+        default=ETLProcessType.MOVIE_FILM_WORK,
+        help='процесс, данные которого выгружаются',
+    )
+    args = parser.parse_args()
+    query = ETLQueryFactory.query_by_type(
+        query_type=QUERY_TYPE.get(args.process_type),
+        process_type=args.process_type,
+        state_storage=MemoryStorage(),
+    )
+
+    pg_conn = psycopg2.connect(**PG_DSL, cursor_factory=DictCursor)
+    try:
+        extractors = {
+            'fetchmany': PostgreExtractor(pg_conn, query, DB_BUFFER_SIZE, json_documents=ETL_JSON_DOCUMENTS),
+            'copy': CopyPostgreExtractor(
+                pg_conn,
+                query,
+                DB_BUFFER_SIZE,
+                json_documents=ETL_JSON_DOCUMENTS,
+                copy_buffer_chunks=DB_COPY_BUFFER_CHUNKS,
+            ),
+        }
+
+        for extractor_name, extractor in extractors.items():
+            elapsed = measure_extractor(extractor)
+            pg_conn.rollback()
+            print(
+                f'{extractor_name}: {extractor.extracted_count} строк за {elapsed:.2f} с, '
+                f'{extractor.extracted_count / elapsed:.0f} строк/с',
+            )
+    finally:
+        pg_conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+Модуль сравнивает обычные и подготовленные запросы ETL-процессов на текущих состояниях из Redis.
+
+Для каждого процесса выводится время планирования и выполнения по EXPLAIN ANALYZE и полная задержка запроса.
+Первые пять выполнений подготовленного запроса PostgreSQL планирует заново, поэтому запусков должно быть больше.
+
+Запуск из каталога etl:
+    python -m benchmarks.queries --runs 20 --process movie_film_work --process movie_genre
+"""
+import argparse
+
+import psycopg2
+from psycopg2.extras import DictCursor
+
+from config.settings import (
+    PG_DSL, REDIS_HOST, REDIS_PORT, DB_BATCH_SIZE, ETL_BATCH_MODE, QUERY_TYPE, ETLProcessType,
+    get_active_process_types,
+)
+from services.context_managers.managers import redis_context
+from services.metrics.queries import get_query_reports
+from services.process.helpers import get_redis_state_storage
+from services.process.queries.queries import ETLQueryFactory
+
+# Запросы outbox блокируют записи очереди, поэтому в замерах не участвуют.
+EXCLUDED_PROCESS_TYPES = (ETLProcessType.MOVIE_OUTBOX,)
+
+
+def main():
+    """Основная функция, запускающая замер запросов."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--runs', type=int, default=20, help='количество запусков каждого запроса')
+    parser.add_argument(
+        '--process',
+        dest='process_types',
+        action='append',
+        type=ETLProcessType,
+        choices=[process_type for process_type in ETLProcessType if process_type not in EXCLUDED_PROCESS_TYPES],
+        help='процесс для замера, можно указать несколько раз. По умолчанию - все активные процессы.',
+    )
+    args = parser.parse_args()
+    process_types = args.process_types or [
+        process_type
+        for process_type in get_active_process_types(change_capture=False)
+        if process_type not in EXCLUDED_PROCESS_TYPES
+    ]
+
+    with redis_context(REDIS_HOST, REDIS_PORT) as redis:
+        state_storage = get_redis_state_storage(redis)
+        queries = {
+            process_type: ETLQueryFactory.query_by_type(
+                query_type=QUERY_TYPE.get(process_type),
+                process_type=process_type,
+                state_storage=state_storage,
+                batch_size=DB_BATCH_SIZE if ETL_BATCH_MODE else None,
+            )
+            for process_type in process_types
+        }
+
+        pg_conn = psycopg2.connect(**PG_DSL, cursor_factory=DictCursor)
+        try:
+            for report in get_query_reports(pg_conn, queries, args.runs):
+                print(report.describe())
+        finally:
+            pg_conn.close()
+
+
+if __name__ == '__main__':
+    main()
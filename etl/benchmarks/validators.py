@@ -0,0 +1,97 @@
+"""
+Модуль сравнивает скорость построчной и пакетной валидации фильмов.
+
+Запуск из каталога etl:
+    python -m benchmarks.validators --rows 100000 --invalid-share 0.01
+"""
+import argparse
+import random
+from time import perf_counter
+from uuid import uuid4
+
+from config.settings import ES_VALIDATOR_BATCH_SIZE
+from services.process.validators.pydantic_models import Movie
+from services.process.validators.validators import ElasticsearchValidator, BatchElasticsearchValidator
+
+
+def make_person() -> dict:
+    """
+    Функция создает персону фильма.
+
+    Returns:
+        персона.
+    """
+    return {'id': str(uuid4()), 'name': f'Person {random.randint(0, 10000)}'}
+
+
+def make_movie(is_valid: bool) -> dict:
+    """
+    Функция создает строку фильма в том виде, в котором ее отдает PostgreToElasticsearchAdapter.
+
+    Args:
+        is_valid: True - строка валидна.
+
+    Returns:
+        строка фильма.
+    """
+    actors = [make_person() for _ in range(random.randint(1, 10))]
+    writers = [make_person() for _ in range(random.randint(0, 3))]
+    directors = [make_person() for _ in range(random.randint(0, 2))]
+    film_id = str(uuid4())
+
+    return {
+        'id': film_id if is_valid else None,
+        'imdb_rating': round(random.uniform(0, 10), 1),
+        'genres': [{'id': str(uuid4()), 'name': 'Drama'} for _ in range(random.randint(1, 3))],
+        'title': f'Movie {film_id}',
+        'description': 'Description ' * 20,
+        'persons': [person['id'] for person in actors + writers + directors],
+        'directors_names': [person['name'] for person in directors],
+        'actors_names': [person['name'] for person in actors],
+        'writers_names': [person['name'] for person in writers],
+        'actors': actors,
+        'writers': writers,
+        'directors': directors,
+        '_id': film_id,
+    }
+
+
+def measure(validator: ElasticsearchValidator, rows: list[dict]) -> tuple[float, int]:
+    """
+    Функция измеряет время валидации строк.
+
+    Args:
+        validator: валидатор.
+        rows: строки для проверки.
+
+    Returns:
+        количество строк в секунду и количество валидных строк.
+    """
+    started = perf_counter()
+    valid_count = sum(1 for _ in validator.get_valid_data(rows))
+    return len(rows) / (perf_counter() - started), valid_count
+
+
+def main():
+    """Основная функция, запускающая сравнение валидаторов."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=100000, help='количество строк')
+    parser.add_argument('--invalid-share', type=float, default=0.01, help='доля невалидных строк')
+    parser.add_argument('--batch-size', type=int, default=ES_VALIDATOR_BATCH_SIZE, help='размер пачки')
+    args = parser.parse_args()
+
+    random.seed(0)
+    rows = [make_movie(random.random() >= args.invalid_share) for _ in range(args.rows)]
+
+    validators = {
+        'row': ElasticsearchValidator(Movie),
+        'batch': BatchElasticsearchValidator(Movie, batch_size=args.batch_size),
+    }
+
+    for name, validator in validators.items():
+        rows_per_second, valid_count = measure(validator, rows)
+        print(f'{name:>5}: {rows_per_second:>12,.0f} rows/s, valid rows: {valid_count}')
+
+
+if __name__ == '__main__':
+    main()
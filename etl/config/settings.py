@@ -1,5 +1,6 @@
 """Модуль содержит настройки для работы ETL."""
 import os
+import socket
 from collections import namedtuple
 from dataclasses import dataclass
 from pathlib import Path
@@ -20,12 +21,84 @@ load_dotenv(find_dotenv(os.path.join(
 )))
 
 
+@dataclass(frozen=True)
+class EsBulkSettings:
+    """
+    Класс описывает параметры массовой (bulk) загрузки данных в индекс эластики.
+
+    chunk_size и max_chunk_bytes адаптивный загрузчик использует как начальный размер пачки, а затем подбирает
+    его в пределах от min_chunk_size до max_chunk_size документов так, чтобы bulk-запрос выполнялся
+    примерно target_latency_ms миллисекунд.
+    """
+
+    thread_count: int = 4
+    chunk_size: int = 500
+    max_chunk_bytes: int = 10 * 1024 * 1024
+    queue_size: int = 4
+    target_latency_ms: int = 500
+    min_chunk_size: int = 10
+    max_chunk_size: int = 10000
+
+
+def get_es_bulk_settings(index_name: str, **defaults) -> EsBulkSettings:
+    """
+    Функция формирует параметры bulk-загрузки для индекса.
+
+    Значения берутся из переменных окружения вида ES_<INDEX>_BULK_<PARAMETER>, например
+    ES_MOVIES_BULK_THREAD_COUNT. Если переменная не задана, используется значение по умолчанию.
+
+    Args:
+        index_name: наименование индекса.
+        defaults: значения параметров по умолчанию.
+
+    Returns:
+        EsBulkSettings
+    """
+    bulk_settings = EsBulkSettings(**defaults)
+    env_prefix = f'ES_{index_name.upper()}_BULK'
+
+    return EsBulkSettings(
+        thread_count=int(os.environ.get(f'{env_prefix}_THREAD_COUNT', bulk_settings.thread_count)),
+        chunk_size=int(os.environ.get(f'{env_prefix}_CHUNK_SIZE', bulk_settings.chunk_size)),
+        max_chunk_bytes=int(os.environ.get(f'{env_prefix}_MAX_CHUNK_BYTES', bulk_settings.max_chunk_bytes)),
+        queue_size=int(os.environ.get(f'{env_prefix}_QUEUE_SIZE', bulk_settings.queue_size)),
+        target_latency_ms=int(os.environ.get(f'{env_prefix}_TARGET_LATENCY_MS', bulk_settings.target_latency_ms)),
+        min_chunk_size=int(os.environ.get(f'{env_prefix}_MIN_CHUNK_SIZE', bulk_settings.min_chunk_size)),
+        max_chunk_size=int(os.environ.get(f'{env_prefix}_MAX_CHUNK_SIZE', bulk_settings.max_chunk_size)),
+    )
+
+
 @dataclass(frozen=True)
 class EsIndexInfo:
     """Класс описывает информацию об индексе эластики."""
 
     name: str
     file_path: str
+    bulk_settings: EsBulkSettings = EsBulkSettings()
+
+
+@dataclass(frozen=True)
+class Shard:
+    """Класс описывает долю фильмов, которую обрабатывает один исполнитель ETL в режиме шардирования."""
+
+    index: int
+    count: int
+
+
+def get_shard_state_name(state_name: str, shard: Shard) -> str:
+    """
+    Функция возвращает наименование состояния для шарда.
+
+    Количество шардов входит в наименование: при его изменении шарды начинают загрузку с начала.
+
+    Args:
+        state_name: наименование состояния.
+        shard: шард.
+
+    Returns:
+        наименование состояния шарда.
+    """
+    return f'{state_name}_shard_{shard.index}_of_{shard.count}'
 
 
 class ETLProcessType(str, Enum):
@@ -34,6 +107,9 @@ class ETLProcessType(str, Enum):
     MOVIE_FILM_WORK = 'movie_film_work'
     MOVIE_GENRE = 'movie_genre'
     MOVIE_PERSON = 'movie_person'
+    MOVIE_MERGED = 'movie_merged'
+    MOVIE_OUTBOX = 'movie_outbox'
+    MOVIE_DOCUMENT = 'movie_document'
     GENRE_CREATED_LINK = 'genre_created_link'
     PERSON_CREATED_LINK = 'person_created_link'
     GENRE_MODIFIED = 'genre_modified'
@@ -46,56 +122,173 @@ class QueryType(str, Enum):
     PG_MOVIE_FILM_WORK = 'pg_movie_filmwork'
     PG_MOVIE_GENRE = 'pg_movie_genre'
     PG_MOVIE_PERSON = 'pg_movie_person'
+    PG_MOVIE_MERGED = 'pg_movie_merged'
+    PG_MOVIE_OUTBOX = 'pg_movie_outbox'
+    PG_MOVIE_DOCUMENT = 'pg_movie_document'
     PG_GENRE_CREATED_LINK = 'pg_genre_created_link'
     PG_PERSON_CREATED_LINK = 'pg_person_created_link'
     PG_PERSON_MODIFIED = 'pg_person_modified'
     PG_GENRE_MODIFIED = 'pg_genre_modified'
 
 
+class LoaderType(str, Enum):
+    """Класс описывает доступные режимы загрузки данных в Elasticsearch."""
+
+    SERIAL = 'serial'
+    PARALLEL = 'parallel'
+    ADAPTIVE = 'adaptive'
+    DEAD_LETTER = 'dead_letter'
+
+
+class DeadLetterStorageType(str, Enum):
+    """Класс описывает доступные хранилища документов, которые не удалось загрузить в Elasticsearch."""
+
+    REDIS = 'redis'
+    FILE = 'file'
+
+
+class ValidatorType(str, Enum):
+    """Класс описывает доступные способы валидации данных перед загрузкой в Elasticsearch."""
+
+    ROW = 'row'
+    BATCH = 'batch'
+
+
+class SchedulerType(str, Enum):
+    """Класс описывает доступные способы запуска ETL-процессов."""
+
+    SEQUENTIAL = 'sequential'
+    CONCURRENT = 'concurrent'
+    ASYNC = 'async'
+
+
 class ElasticsearchIndex(Enum):
     """Класс описывает индексы для работы с Elasticsearch."""
 
-    MOVIES = EsIndexInfo('movies', os.path.join(BASE_DIR, 'config', 'es_movies_index.json'))
-    GENRES = EsIndexInfo('genres', os.path.join(BASE_DIR, 'config', 'es_genres_index.json'))
-    PERSONS = EsIndexInfo('persons', os.path.join(BASE_DIR, 'config', 'es_persons_index.json'))
+    MOVIES = EsIndexInfo(
+        'movies',
+        os.path.join(BASE_DIR, 'config', 'es_movies_index.json'),
+        get_es_bulk_settings('movies', thread_count=4, chunk_size=500),
+    )
+    GENRES = EsIndexInfo(
+        'genres',
+        os.path.join(BASE_DIR, 'config', 'es_genres_index.json'),
+        get_es_bulk_settings('genres', thread_count=2, chunk_size=500),
+    )
+    PERSONS = EsIndexInfo(
+        'persons',
+        os.path.join(BASE_DIR, 'config', 'es_persons_index.json'),
+        get_es_bulk_settings('persons', thread_count=2, chunk_size=500),
+    )
 
 
 TIME_TO_RESTART_PROCESSES_SECONDS = 10
 
+ETL_SCHEDULER_TYPE = SchedulerType(os.environ.get('ETL_SCHEDULER_TYPE', SchedulerType.SEQUENTIAL.value))
+
 REDIS_PORT = os.getenv('REDIS_PORT')
 
 REDIS_HOST = os.getenv('REDIS_HOST')
 
+# Режим выбора плана для подготовленных запросов: auto, force_generic_plan или force_custom_plan.
+DB_PLAN_CACHE_MODE = os.environ.get('DB_PLAN_CACHE_MODE', 'auto')
+
 PG_DSL = {
     'dbname': os.environ.get('PG_DB_NAME'),
     'user': os.environ.get('PG_DB_USER'),
     'password': os.environ.get('PG_DB_PASSWORD'),
     'host': os.environ.get('PG_DB_HOST'),
     'port': os.environ.get('PG_DB_PORT'),
+    'options': f'-c plan_cache_mode={DB_PLAN_CACHE_MODE}',
 }
 
+# Параметры подключения asyncpg для планировщика async.
+ASYNC_PG_DSL = {
+    'database': PG_DSL['dbname'],
+    'user': PG_DSL['user'],
+    'password': PG_DSL['password'],
+    'host': PG_DSL['host'],
+    'port': PG_DSL['port'],
+    'server_settings': {'plan_cache_mode': DB_PLAN_CACHE_MODE},
+}
+
+ASYNC_PG_POOL_SIZE = int(os.environ.get('ASYNC_PG_POOL_SIZE', len(ElasticsearchIndex)))
+
+# Сколько пачек может ждать в очереди между стадиями извлечения, валидации и загрузки планировщика async.
+ETL_ASYNC_QUEUE_SIZE = int(os.environ.get('ETL_ASYNC_QUEUE_SIZE', 4))
+
 ES_HOST = os.environ.get('ES_HOST')
 
 ES_PORT = os.environ.get('ES_PORT')
 
 ES_CONNECTION = f'http://{ES_HOST}:{ES_PORT}'
 
-PROCESS_IS_STARTED_STATE = 'process_is_started'
+ES_LOADER_TYPE = LoaderType(os.environ.get('ES_LOADER_TYPE', LoaderType.SERIAL.value))
+
+# Куда загрузчик dead_letter складывает документы, которые Elasticsearch отклонил окончательно.
+ES_DEAD_LETTER_STORAGE_TYPE = DeadLetterStorageType(
+    os.environ.get('ES_DEAD_LETTER_STORAGE_TYPE', DeadLetterStorageType.REDIS.value),
+)
+
+ES_DEAD_LETTER_KEY = os.environ.get('ES_DEAD_LETTER_KEY', 'etl_dead_letters')
+
+ES_DEAD_LETTER_MAX_LENGTH = int(os.environ.get('ES_DEAD_LETTER_MAX_LENGTH', 100000))
+
+ES_DEAD_LETTER_FILE = os.environ.get('ES_DEAD_LETTER_FILE', 'dead_letters.jsonl')
+
+PROCESS_LOCK_PREFIX = 'etl_lock'
+
+ETL_LOCK_TTL_MS = int(os.environ.get('ETL_LOCK_TTL_MS', 30000))
+
+ETL_LOCK_WAIT_SECONDS = float(os.environ.get('ETL_LOCK_WAIT_SECONDS', 0))
 
 MODIFIED_STATE = {
     ETLProcessType.MOVIE_FILM_WORK: 'modified_film_work',
     ETLProcessType.MOVIE_GENRE: 'modified_film_work_genre',
     ETLProcessType.MOVIE_PERSON: 'modified_film_work_person',
+    ETLProcessType.MOVIE_DOCUMENT: 'modified_film_work_document',
     ETLProcessType.PERSON_CREATED_LINK: 'modified_person_created_link',
     ETLProcessType.GENRE_CREATED_LINK: 'modified_genre_created_link',
     ETLProcessType.PERSON_MODIFIED: 'modified_person',
     ETLProcessType.GENRE_MODIFIED: 'modified_genre',
 }
 
+MODIFIED_STATE_ID = {
+    ETLProcessType.MOVIE_FILM_WORK: 'modified_film_work_id',
+    ETLProcessType.MOVIE_GENRE: 'modified_film_work_genre_id',
+    ETLProcessType.MOVIE_PERSON: 'modified_film_work_person_id',
+    ETLProcessType.MOVIE_DOCUMENT: 'modified_film_work_document_id',
+}
+
+# Процессы, которые при включении выполняются вместо перечисленных процессов.
+REPLACED_PROCESS_TYPES = {
+    ETLProcessType.MOVIE_MERGED: (
+        ETLProcessType.MOVIE_FILM_WORK,
+        ETLProcessType.MOVIE_GENRE,
+        ETLProcessType.MOVIE_PERSON,
+    ),
+    ETLProcessType.MOVIE_OUTBOX: (
+        ETLProcessType.MOVIE_FILM_WORK,
+        ETLProcessType.MOVIE_GENRE,
+        ETLProcessType.MOVIE_PERSON,
+        ETLProcessType.MOVIE_MERGED,
+    ),
+    ETLProcessType.MOVIE_DOCUMENT: (
+        ETLProcessType.MOVIE_FILM_WORK,
+        ETLProcessType.MOVIE_GENRE,
+        ETLProcessType.MOVIE_PERSON,
+        ETLProcessType.MOVIE_MERGED,
+        ETLProcessType.MOVIE_OUTBOX,
+    ),
+}
+
 QUERY_TYPE = {
     ETLProcessType.MOVIE_FILM_WORK: QueryType.PG_MOVIE_FILM_WORK,
     ETLProcessType.MOVIE_GENRE: QueryType.PG_MOVIE_GENRE,
     ETLProcessType.MOVIE_PERSON: QueryType.PG_MOVIE_PERSON,
+    ETLProcessType.MOVIE_MERGED: QueryType.PG_MOVIE_MERGED,
+    ETLProcessType.MOVIE_OUTBOX: QueryType.PG_MOVIE_OUTBOX,
+    ETLProcessType.MOVIE_DOCUMENT: QueryType.PG_MOVIE_DOCUMENT,
     ETLProcessType.PERSON_CREATED_LINK: QueryType.PG_PERSON_CREATED_LINK,
     ETLProcessType.GENRE_CREATED_LINK: QueryType.PG_GENRE_CREATED_LINK,
     ETLProcessType.PERSON_MODIFIED: QueryType.PG_PERSON_MODIFIED,
@@ -106,12 +299,176 @@ PROCESS_ES_INDEX = {
     ETLProcessType.MOVIE_FILM_WORK: ElasticsearchIndex.MOVIES,
     ETLProcessType.MOVIE_GENRE: ElasticsearchIndex.MOVIES,
     ETLProcessType.MOVIE_PERSON: ElasticsearchIndex.MOVIES,
+    ETLProcessType.MOVIE_MERGED: ElasticsearchIndex.MOVIES,
+    ETLProcessType.MOVIE_OUTBOX: ElasticsearchIndex.MOVIES,
+    ETLProcessType.MOVIE_DOCUMENT: ElasticsearchIndex.MOVIES,
     ETLProcessType.GENRE_CREATED_LINK: ElasticsearchIndex.GENRES,
     ETLProcessType.PERSON_CREATED_LINK: ElasticsearchIndex.PERSONS,
     ETLProcessType.PERSON_MODIFIED: ElasticsearchIndex.PERSONS,
     ETLProcessType.GENRE_MODIFIED: ElasticsearchIndex.GENRES,
 }
 
-DATETIME_FORMAT = '%Y-%m-%d %H:%M:%S.%f'
+# Процессы, которые загружают индекс целиком при полной переиндексации.
+REINDEX_PROCESS_TYPES = {
+    ElasticsearchIndex.MOVIES: (ETLProcessType.MOVIE_FILM_WORK,),
+    ElasticsearchIndex.GENRES: (ETLProcessType.GENRE_CREATED_LINK,),
+    ElasticsearchIndex.PERSONS: (ETLProcessType.PERSON_CREATED_LINK,),
+}
+
+# Процессы, которые не догружают изменения при переиндексации. Объединенный процесс повторяет процессы
+# фильмов, жанров и персон с теми же состояниями, а outbox разбирает очередь изменений основного ETL.
+REINDEX_SKIPPED_PROCESS_TYPES = (ETLProcessType.MOVIE_MERGED, ETLProcessType.MOVIE_OUTBOX)
+
+# Процессы, которые догружают в новую версию индекса изменения, сделанные во время переиндексации.
+REINDEX_CATCH_UP_PROCESS_TYPES = {
+    index: tuple(
+        process_type
+        for process_type, process_index in PROCESS_ES_INDEX.items()
+        if process_index == index and process_type not in REINDEX_SKIPPED_PROCESS_TYPES
+    )
+    for index in ElasticsearchIndex
+}
+
+# Процессы, которые в режиме шардирования выполняются отдельно для каждого шарда фильмов.
+SHARDED_PROCESS_TYPES = (
+    ETLProcessType.MOVIE_FILM_WORK,
+    ETLProcessType.MOVIE_GENRE,
+    ETLProcessType.MOVIE_PERSON,
+    ETLProcessType.MOVIE_MERGED,
+)
+
+ETL_SHARDING = os.environ.get('ETL_SHARDING', 'False') == 'True'
+
+ETL_SHARD_COUNT = int(os.environ.get('ETL_SHARD_COUNT', 16))
+
+ETL_WORKER_ID = os.environ.get('ETL_WORKER_ID', f'{socket.gethostname()}:{os.getpid()}')
+
+ETL_WORKER_TTL_SECONDS = float(os.environ.get('ETL_WORKER_TTL_SECONDS', 30))
+
+ETL_WORKERS_KEY = 'etl_workers'
+
+REINDEX_FORCEMERGE_TIMEOUT_SECONDS = int(os.environ.get('REINDEX_FORCEMERGE_TIMEOUT_SECONDS', 3600))
+
+# Количество процессов, которые параллельно загружают процессы из SHARDED_PROCESS_TYPES при переиндексации.
+REINDEX_WORKERS = int(os.environ.get('REINDEX_WORKERS', 1))
+
+# Состояния хранятся со смещением часового пояса и сравниваются как timestamptz, поэтому не зависят
+# от TimeZone сессии PostgreSQL и от того, в каком поясе драйвер (psycopg2 или asyncpg) вернул время.
+DATETIME_FORMAT = '%Y-%m-%d %H:%M:%S.%f%z'
 
 DB_BUFFER_SIZE = int(os.environ.get('DB_BUFFER_SIZE', 100))
+
+ETL_BATCH_MODE = os.environ.get('ETL_BATCH_MODE', 'False') == 'True'
+
+DB_BATCH_SIZE = int(os.environ.get('DB_BATCH_SIZE', 1000))
+
+DB_USE_SERVER_SIDE_CURSOR = os.environ.get('DB_USE_SERVER_SIDE_CURSOR', 'False') == 'True'
+
+DB_CURSOR_ITERSIZE = int(os.environ.get('DB_CURSOR_ITERSIZE', DB_BUFFER_SIZE))
+
+# Подготовленные запросы выполняются обычным курсором, поэтому их лучше включать вместе с ETL_BATCH_MODE.
+DB_PREPARED_STATEMENTS = os.environ.get('DB_PREPARED_STATEMENTS', 'False') == 'True'
+
+ETL_JSON_DOCUMENTS = os.environ.get('ETL_JSON_DOCUMENTS', 'False') == 'True'
+
+# Процессы без сохраненных состояний (первичная загрузка и переиндексация) выгружают данные командой COPY.
+ETL_COPY_BACKFILL = os.environ.get('ETL_COPY_BACKFILL', 'False') == 'True'
+
+# Сколько кусков данных COPY по 64 КБ может ждать загрузки в Elasticsearch.
+DB_COPY_BUFFER_CHUNKS = int(os.environ.get('DB_COPY_BUFFER_CHUNKS', 16))
+
+ES_VALIDATOR_TYPE = ValidatorType(os.environ.get('ES_VALIDATOR_TYPE', ValidatorType.ROW.value))
+
+ES_VALIDATOR_BATCH_SIZE = int(os.environ.get('ES_VALIDATOR_BATCH_SIZE', DB_BUFFER_SIZE))
+
+ETL_MERGE_MOVIE_PROCESSES = os.environ.get('ETL_MERGE_MOVIE_PROCESSES', 'False') == 'True'
+
+ETL_CHANGE_CAPTURE = os.environ.get('ETL_CHANGE_CAPTURE', 'False') == 'True'
+
+# Документы фильмов читаются из content.film_work_document, которую поддерживают триггеры PostgreSQL.
+ETL_MOVIE_DOCUMENTS = os.environ.get('ETL_MOVIE_DOCUMENTS', 'False') == 'True'
+
+ETL_OUTBOX_CONSUMER_NAME = 'etl'
+
+ETL_LISTEN_NOTIFY = os.environ.get('ETL_LISTEN_NOTIFY', 'False') == 'True'
+
+ETL_NOTIFY_CHANNEL = 'etl_changes'
+
+ETL_FALLBACK_POLL_INTERVAL_SECONDS = float(os.environ.get('ETL_FALLBACK_POLL_INTERVAL_SECONDS', 300))
+
+ETL_NOTIFY_DEBOUNCE_SECONDS = float(os.environ.get('ETL_NOTIFY_DEBOUNCE_SECONDS', 0.05))
+
+# Процессы, которые нужно запустить при изменении таблицы. Неактивные процессы отбрасываются.
+TABLE_PROCESS_TYPES = {
+    'film_work': (
+        ETLProcessType.MOVIE_FILM_WORK,
+        ETLProcessType.MOVIE_MERGED,
+        ETLProcessType.MOVIE_OUTBOX,
+        ETLProcessType.MOVIE_DOCUMENT,
+    ),
+    'genre': (
+        ETLProcessType.MOVIE_GENRE,
+        ETLProcessType.MOVIE_MERGED,
+        ETLProcessType.MOVIE_OUTBOX,
+        ETLProcessType.MOVIE_DOCUMENT,
+        ETLProcessType.GENRE_MODIFIED,
+    ),
+    'person': (
+        ETLProcessType.MOVIE_PERSON,
+        ETLProcessType.MOVIE_MERGED,
+        ETLProcessType.MOVIE_OUTBOX,
+        ETLProcessType.MOVIE_DOCUMENT,
+        ETLProcessType.PERSON_MODIFIED,
+    ),
+    'genre_film_work': (
+        ETLProcessType.MOVIE_OUTBOX,
+        ETLProcessType.MOVIE_DOCUMENT,
+        ETLProcessType.GENRE_CREATED_LINK,
+    ),
+    'person_film_work': (
+        ETLProcessType.MOVIE_OUTBOX,
+        ETLProcessType.MOVIE_DOCUMENT,
+        ETLProcessType.PERSON_CREATED_LINK,
+    ),
+}
+
+
+def get_active_process_types(
+    merge_movie_processes: bool = ETL_MERGE_MOVIE_PROCESSES,
+    change_capture: bool = ETL_CHANGE_CAPTURE,
+    movie_documents: bool = ETL_MOVIE_DOCUMENTS,
+) -> list[ETLProcessType]:
+    """
+    Функция возвращает типы ETL-процессов, которые нужно выполнять в каждом цикле.
+
+    Заменяющие процессы (REPLACED_PROCESS_TYPES) выполняются вместо заменяемых, если это включено
+    настройками, и не выполняются в противном случае.
+
+    Args:
+        merge_movie_processes: True - процессы фильмов объединяются в один процесс.
+        change_capture: True - изменения фильмов считываются из outbox.
+        movie_documents: True - фильмы считываются из таблицы готовых документов.
+
+    Returns:
+        список типов процессов в порядке выполнения.
+    """
+    enabled_process_types = set()
+    if merge_movie_processes:
+        enabled_process_types.add(ETLProcessType.MOVIE_MERGED)
+    if change_capture:
+        enabled_process_types.add(ETLProcessType.MOVIE_OUTBOX)
+    if movie_documents:
+        enabled_process_types.add(ETLProcessType.MOVIE_DOCUMENT)
+
+    replaced_process_types = {
+        process_type
+        for enabled_process_type in enabled_process_types
+        for process_type in REPLACED_PROCESS_TYPES[enabled_process_type]
+    }
+
+    return [
+        process_type
+        for process_type in ETLProcessType
+        if process_type not in replaced_process_types
+        and (process_type not in REPLACED_PROCESS_TYPES or process_type in enabled_process_types)
+    ]
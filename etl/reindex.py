@@ -0,0 +1,42 @@
+"""Модуль отвечает за полную переиндексацию Elasticsearch без простоя."""
+import argparse
+from functools import partial
+
+import psycopg2
+from psycopg2.extras import DictCursor
+from config.settings import PG_DSL, ES_CONNECTION, REINDEX_WORKERS, ElasticsearchIndex
+from services.decorators.resiliency import backoff
+from services.context_managers.managers import es_context
+from services.process.reindex import ElasticsearchReindexer
+
+INDEXES = {index.value.name: index for index in ElasticsearchIndex}
+
+
+def main():
+    """Основная функция, перестраивающая индексы Elasticsearch."""
+    parser = argparse.ArgumentParser(description='Полная переиндексация Elasticsearch с переключением алиаса.')
+    parser.add_argument(
+        '--index',
+        dest='indexes',
+        action='append',
+        choices=sorted(INDEXES),
+        help='индекс для переиндексации, можно указать несколько раз. По умолчанию - все индексы.',
+    )
+    parser.add_argument('--delete-old', action='store_true', help='удалить старые версии индексов')
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=REINDEX_WORKERS,
+        help='количество процессов для основной загрузки фильмов',
+    )
+    args = parser.parse_args()
+
+    connect = partial(backoff()(psycopg2.connect), **PG_DSL, cursor_factory=DictCursor)
+
+    with es_context(ES_CONNECTION) as es:
+        for index_name in args.indexes or sorted(INDEXES):
+            ElasticsearchReindexer(connect, es, INDEXES[index_name], args.workers).run(delete_old=args.delete_old)
+
+
+if __name__ == '__main__':
+    main()
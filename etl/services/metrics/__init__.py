@@ -0,0 +1 @@
+"""Инициализирующий модуль для metrics."""
@@ -0,0 +1,184 @@
+"""Модуль отвечает за сбор метрик потребления памяти ETL-процессами."""
+import resource
+import sys
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+from config.settings import ETLProcessType
+
+from ..logs.logs_setup import get_logger
+
+logger = get_logger()
+
+PROC_CLEAR_REFS_PATH = '/proc/self/clear_refs'
+
+PROC_STATUS_PATH = '/proc/self/status'
+
+RESET_PEAK_RSS_COMMAND = '5'
+
+PEAK_RSS_KB: Dict[ETLProcessType, int] = {}
+
+CYCLE_PEAK_RSS_KB: Dict[str, int] = {}
+
+
+def get_peak_rss_kb() -> int:
+    """
+    Функция возвращает пиковое потребление памяти (RSS) текущим процессом в килобайтах.
+
+    В Linux значение берется из VmHWM, которое можно сбросить перед началом замера.
+    На остальных платформах используется пик за все время работы процесса.
+
+    Returns:
+        пиковое значение RSS в килобайтах.
+    """
+    try:
+        with open(PROC_STATUS_PATH, 'r') as status_file:
+            for line in status_file:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # В macOS ru_maxrss возвращается в байтах, в Linux - в килобайтах.
+    if sys.platform == 'darwin':
+        return peak_rss // 1024
+
+    return peak_rss
+
+
+def reset_peak_rss() -> bool:
+    """
+    Функция сбрасывает пиковое значение RSS текущего процесса до текущего значения.
+
+    Returns:
+        True - значение сброшено, False - платформа не поддерживает сброс.
+    """
+    try:
+        with open(PROC_CLEAR_REFS_PATH, 'w') as clear_refs_file:
+            clear_refs_file.write(RESET_PEAK_RSS_COMMAND)
+    except OSError:
+        return False
+
+    return True
+
+
+@dataclass
+class PeakRssMeasurements:
+    """
+    Учет замеров пикового потребления памяти, которые выполняются в процессе ETL.
+
+    VmHWM - один счетчик на весь процесс ETL. Сбрасывать его можно, только когда не идет ни один замер,
+    иначе сброс обнулит пик другого замера. А приписать пик замеру можно, только если замер выполнялся один:
+    не начался во время другого замера и за время замера не начался другой. Замер цикла охватывает замеры
+    своих процессов, поэтому они ему не мешают.
+
+    Attributes:
+        active: количество выполняющихся замеров.
+        started: количество замеров, начатых за все время работы ETL.
+        lock: блокировка, под которой меняются счетчики. Замеры идут из разных потоков.
+    """
+
+    active: int = 0
+    started: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def start(self) -> Tuple[Optional[int], bool]:
+        """
+        Метод начинает замер и сбрасывает пик памяти, если другие замеры не выполняются.
+
+        Returns:
+            номер замера (None - замер начался во время другого замера) и признак сброса пика памяти.
+        """
+        with self.lock:
+            is_alone = not self.active
+            is_reset = is_alone and reset_peak_rss()
+            self.active += 1
+            self.started += 1
+
+            return (self.started if is_alone else None), is_reset
+
+    def finish(self, number: Optional[int], is_enclosing: bool = False) -> bool:
+        """
+        Метод завершает замер.
+
+        Args:
+            number: номер замера, полученный при его начале.
+            is_enclosing: True - замеры, начатые за время этого замера, входят в него (замер цикла).
+
+        Returns:
+            True - замер выполнялся один, и пик памяти относится только к нему, иначе - False.
+        """
+        with self.lock:
+            self.active -= 1
+
+            return number is not None and (is_enclosing or number == self.started)
+
+
+MEASUREMENTS = PeakRssMeasurements()
+
+
+@contextmanager
+def peak_rss_metric(process_type: ETLProcessType):
+    """
+    Контекстный менеджер замеряет пиковое потребление памяти (RSS) за время выполнения ETL-процесса.
+
+    Результат пишется в лог и сохраняется в PEAK_RSS_KB как максимум по всем запускам процесса этого типа.
+    Пик памяти общий для всего процесса ETL, поэтому замер учитывается, только если ETL-процесс выполнялся один.
+    Процессы, которые планировщик выполняет одновременно, в PEAK_RSS_KB не попадают: их память учитывает
+    замер цикла (см. cycle_peak_rss_metric).
+
+    Args:
+        process_type: тип ETL-процесса.
+
+    Yields:
+        None
+    """
+    number, is_reset = MEASUREMENTS.start()
+    try:
+        yield
+    finally:
+        if MEASUREMENTS.finish(number):
+            peak_rss = get_peak_rss_kb()
+            PEAK_RSS_KB[process_type] = max(PEAK_RSS_KB.get(process_type, 0), peak_rss)
+            scope = 'за время выполнения' if is_reset else 'за все время работы ETL к моменту завершения'
+            logger.info(
+                f'Пиковое потребление памяти (RSS) {scope} процесса {process_type}: {peak_rss} КБ. '
+                f'Максимум для этого типа процессов: {PEAK_RSS_KB[process_type]} КБ.',
+            )
+        else:
+            logger.debug(
+                f'Процесс {process_type} выполнялся одновременно с другими, '
+                'его пиковое потребление памяти не замерено отдельно.',
+            )
+
+
+@contextmanager
+def cycle_peak_rss_metric(scheduler_name: str):
+    """
+    Контекстный менеджер замеряет пиковое потребление памяти (RSS) за один цикл ETL-процессов.
+
+    Нужен планировщикам, которые выполняют процессы одновременно: память таких процессов не делится
+    между ними, поэтому замеряется один раз на весь цикл. Результат пишется в лог и сохраняется
+    в CYCLE_PEAK_RSS_KB как максимум по всем циклам планировщика.
+
+    Args:
+        scheduler_name: наименование планировщика.
+
+    Yields:
+        None
+    """
+    number, is_reset = MEASUREMENTS.start()
+    try:
+        yield
+    finally:
+        if MEASUREMENTS.finish(number, is_enclosing=True):
+            peak_rss = get_peak_rss_kb()
+            CYCLE_PEAK_RSS_KB[scheduler_name] = max(CYCLE_PEAK_RSS_KB.get(scheduler_name, 0), peak_rss)
+            scope = 'за цикл' if is_reset else 'за все время работы ETL к моменту завершения цикла'
+            logger.info(
+                f'Пиковое потребление памяти (RSS) {scope} планировщика {scheduler_name}: {peak_rss} КБ. '
+                f'Максимум для этого планировщика: {CYCLE_PEAK_RSS_KB[scheduler_name]} КБ.',
+            )
@@ -0,0 +1,162 @@
+"""Модуль отвечает за замер времени планирования и выполнения запросов ETL-процессов."""
+from dataclasses import dataclass, field
+from statistics import mean
+from time import perf_counter
+from typing import Any, Dict, List, Optional
+
+from psycopg2.extensions import connection as postgre_conn, cursor as postgre_cursor
+
+from config.settings import ETLProcessType
+
+from ..logs.logs_setup import get_logger
+from ..process.queries.prepared import PreparedStatements, to_positional_sql
+from ..process.queries.queries import BaseETLQuery
+
+logger = get_logger()
+
+EXPLAIN_PREFIX = 'EXPLAIN (ANALYZE, FORMAT JSON) '
+
+
+@dataclass
+class QueryTimings:
+    """
+    Замеры одного способа выполнения запроса.
+
+    Attributes:
+        planning_ms: время планирования по EXPLAIN ANALYZE для каждого запуска.
+        execution_ms: время выполнения по EXPLAIN ANALYZE для каждого запуска.
+        latency_ms: время от отправки запроса до получения всех строк для каждого запуска.
+        plan_node: корневой узел плана последнего запуска.
+    """
+
+    planning_ms: List[float] = field(default_factory=list)
+    execution_ms: List[float] = field(default_factory=list)
+    latency_ms: List[float] = field(default_factory=list)
+    plan_node: Optional[str] = None
+
+    def describe(self) -> str:
+        """
+        Метод возвращает средние значения замеров.
+
+        Returns:
+            строка отчета.
+        """
+        return (
+            f'планирование {mean(self.planning_ms):.2f} мс, выполнение {mean(self.execution_ms):.2f} мс, '
+            f'задержка {mean(self.latency_ms):.2f} мс, план {self.plan_node}'
+        )
+
+
+@dataclass
+class QueryReport:
+    """
+    Отчет по запросу ETL-процесса.
+
+    Attributes:
+        process_type: тип ETL-процесса.
+        inline: замеры обычного запроса, который планируется при каждом выполнении.
+        prepared: замеры подготовленного запроса.
+    """
+
+    process_type: ETLProcessType
+    inline: QueryTimings
+    prepared: QueryTimings
+
+    def describe(self) -> str:
+        """
+        Метод возвращает отчет по запросу.
+
+        Returns:
+            строка отчета.
+        """
+        saved_ms = mean(self.inline.latency_ms) - mean(self.prepared.latency_ms)
+        return (
+            f'{self.process_type.value}:\n'
+            f'    обычный запрос:      {self.inline.describe()}\n'
+            f'    подготовленный:      {self.prepared.describe()}\n'
+            f'    экономия на запросе: {saved_ms:.2f} мс'
+        )
+
+
+def measure_query(pg_conn: postgre_conn, query: BaseETLQuery, runs: int) -> Dict[str, QueryTimings]:
+    """
+    Функция замеряет запрос ETL-процесса обычным и подготовленным способом.
+
+    Каждый запуск выполняется дважды: через EXPLAIN ANALYZE, чтобы отделить планирование от выполнения,
+    и обычным образом, чтобы замерить задержку вместе с передачей строк. После замеров транзакция
+    откатывается.
+
+    Args:
+        pg_conn: соединение с PostgreSQL.
+        query: запрос ETL-процесса.
+        runs: количество запусков каждого способа.
+
+    Returns:
+        словарь, где ключ - способ выполнения (inline или prepared), значение - замеры.
+    """
+    sql = query.get_sql()
+    params = query.get_params()
+    timings = {'inline': QueryTimings(), 'prepared': QueryTimings()}
+    prepared_statements = PreparedStatements(pg_conn)
+
+    try:
+        with pg_conn.cursor() as cursor:
+            statement_name = prepared_statements.prepare(cursor, sql)
+            _, param_names = to_positional_sql(sql)
+            execute_sql = PreparedStatements.get_execute_sql(statement_name, param_names)
+
+            for _ in range(runs):
+                _measure_run(cursor, sql, params, timings['inline'])
+                _measure_run(cursor, execute_sql, params, timings['prepared'])
+    finally:
+        pg_conn.rollback()
+
+    return timings
+
+
+def _measure_run(cursor: postgre_cursor, sql: str, params: Dict[str, Any], timings: QueryTimings):
+    """
+    Функция выполняет один запуск запроса и добавляет замеры.
+
+    Args:
+        cursor: курсор PostgreSQL.
+        sql: sql-запрос или команда EXECUTE.
+        params: параметры sql-запроса.
+        timings: замеры, в которые добавляется результат.
+    """
+    cursor.execute(f'{EXPLAIN_PREFIX}{sql}', params)
+    explain = cursor.fetchone()[0][0]
+    timings.planning_ms.append(explain['Planning Time'])
+    timings.execution_ms.append(explain['Execution Time'])
+    timings.plan_node = explain['Plan']['Node Type']
+
+    started = perf_counter()
+    cursor.execute(sql, params)
+    cursor.fetchall()
+    timings.latency_ms.append((perf_counter() - started) * 1000)
+
+
+def get_query_reports(
+    pg_conn: postgre_conn,
+    queries: Dict[ETLProcessType, BaseETLQuery],
+    runs: int,
+) -> List[QueryReport]:
+    """
+    Функция замеряет запросы ETL-процессов и возвращает отчеты по ним.
+
+    Args:
+        pg_conn: соединение с PostgreSQL.
+        queries: запросы ETL-процессов.
+        runs: количество запусков каждого способа.
+
+    Returns:
+        отчеты по запросам.
+    """
+    reports = []
+
+    for process_type, query in queries.items():
+        logger.info(f'Замеряем запрос {process_type}.')
+        timings = measure_query(pg_conn, query, runs)
+        reports.append(QueryReport(process_type, timings['inline'], timings['prepared']))
+
+    return reports
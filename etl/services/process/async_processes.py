@@ -0,0 +1,344 @@
+"""Модуль отвечает за асинхронный ETL-процесс, в котором извлечение, валидация и загрузка выполняются одновременно."""
+import asyncio
+from dataclasses import dataclass
+from typing import AsyncGenerator, List, Optional, Tuple
+
+import asyncpg
+from asyncpg import Pool
+from elasticsearch import AsyncElasticsearch
+from redis import Redis
+
+from config.settings import (
+    ASYNC_PG_DSL, ASYNC_PG_POOL_SIZE, DB_BATCH_SIZE, DB_BUFFER_SIZE, ETL_ASYNC_QUEUE_SIZE, ETL_BATCH_MODE,
+    ETL_JSON_DOCUMENTS, ETL_LOCK_TTL_MS, ES_VALIDATOR_TYPE, QUERY_TYPE, ETLProcessType, Shard,
+)
+from services.logs.logs_setup import get_logger
+from services.metrics.memory import peak_rss_metric
+from services.process.exceptions import AnotherProcessIsStartedError
+from services.process.extractors.adapters import (
+    BaseExtractorAdapter, PostgreToElasticsearchAdapter, PostgreJsonToElasticsearchAdapter,
+)
+from services.process.extractors.async_extractors import AsyncPostgreExtractor, init_connection
+from services.process.helpers import get_index_info_by_process, get_lock_name_by_index, get_redis_state_storage
+from services.process.loaders.async_loaders import AsyncElasticsearchLoader
+from services.process.processes import ETLProcess, ETLProcessParameters
+from services.process.queries.queries import ETLQueryFactory
+from services.process.validators.pydantic_models import get_model_for_process_type
+from services.process.validators.validators import BaseValidator, ElasticsearchValidatorFactory
+from services.storages.key_value_storages import KeyValueStorage
+from services.storages.key_value_decorators import BaseKeyValueDecorator, FencedKeyValueDecorator
+from services.storages.locks import BaseLock, RedisLock
+
+logger = get_logger()
+
+
+@dataclass
+class AsyncETLProcessParameters:
+    """Класс описывает параметры для асинхронного ETL-процесса."""
+
+    process_type: ETLProcessType
+    state_storage: KeyValueStorage | BaseKeyValueDecorator
+    extractor: AsyncPostgreExtractor
+    adapter: BaseExtractorAdapter
+    validator: BaseValidator
+    loader: AsyncElasticsearchLoader
+    is_batched: bool = False
+    lock: Optional[BaseLock] = None
+    queue_size: int = ETL_ASYNC_QUEUE_SIZE
+    state_names: Tuple[str, ...] = ()
+
+
+async def drain_queue(actions_queue: asyncio.Queue) -> AsyncGenerator[dict, None]:
+    """
+    Функция отдает bulk-действия из очереди пачек, пока в очереди не встретится None.
+
+    Args:
+        actions_queue: очередь пачек bulk-действий.
+
+    Yields:
+        bulk-действия.
+    """
+    while True:
+        actions = await actions_queue.get()
+
+        if actions is None:
+            return
+
+        for action in actions:
+            yield action
+
+
+class AsyncETLProcess(ETLProcess):
+    """
+    Класс отвечает за асинхронный процесс перегонки данных из PostgreSQL в Elasticsearch.
+
+    Процесс состоит из трех стадий, связанных ограниченными очередями пачек: извлечение строк из PostgreSQL,
+    адаптация и валидация строк и загрузка bulk-действий в Elasticsearch. Пока одна пачка загружается,
+    следующая валидируется, а еще одна считывается из PostgreSQL. Валидация нагружает процессор,
+    поэтому выполняется в отдельном потоке и не останавливает обмен данными с PostgreSQL и Elasticsearch.
+    Если стадия не успевает, очередь перед ней заполняется, и предыдущая стадия ждет.
+
+    Блокировка и сохранение состояний такие же, как у ETLProcess. Работать с классом нужно через
+    асинхронный контекстный менеджер async with.
+    """
+
+    def __init__(self, etl_params: AsyncETLProcessParameters):
+        """
+        Инициализирующий метод.
+
+        Args:
+            etl_params: параметры асинхронного ETL процесса.
+        """
+        super().__init__(ETLProcessParameters(
+            process_type=etl_params.process_type,
+            state_storage=etl_params.state_storage,
+            extractor=etl_params.adapter,
+            loader=etl_params.loader,
+            is_batched=etl_params.is_batched,
+            lock=etl_params.lock,
+            state_names=etl_params.state_names,
+        ))
+        self._async_extractor = etl_params.extractor
+        self._validator = etl_params.validator
+        self._queue_size = etl_params.queue_size
+
+    async def __aenter__(self):
+        """
+        Метод для асинхронного контекстного менеджера.
+
+        Блокирует работу для других процессов, пока этот процесс не завершится.
+
+        Returns:
+            AsyncETLProcess
+        """
+        await asyncio.to_thread(self.block_process_state)
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """
+        Метод для асинхронного контекстного менеджера.
+
+        Разблокирует состояние процесса, чтобы другие процессы могли начать выполнение.
+
+        Args:
+            exc_type: стандартная сигнатура запуска контекстного менеджера.
+            exc_val: стандартная сигнатура запуска контекстного менеджера.
+            exc_tb: стандартная сигнатура запуска контекстного менеджера.
+        """
+        await asyncio.to_thread(self.open_process_state)
+
+    async def start(self) -> bool:
+        """
+        Метод стартует процесс по перегонке данных.
+
+        Returns:
+            True - процесс завершен успешно, иначе - False.
+        """
+        try:
+            with peak_rss_metric(self._process_type):
+                if self._is_batched:
+                    return await self._load_batches()
+
+                return await self._load()
+        except Exception:
+            logger.error(
+                f'Во время выполнения ETL-процесса {self._process_type} произошла непредвиденная ошибка.',
+                exc_info=True,
+            )
+            return False
+
+    async def _load(self) -> bool:
+        """
+        Метод извлекает данные, загружает их в целевую систему и запоминает новое состояние.
+
+        Если одна из стадий завершилась с ошибкой, остальные стадии отменяются.
+
+        Returns:
+            True - загрузка завершена успешно, иначе - False.
+        """
+        rows_queue = asyncio.Queue(maxsize=self._queue_size)
+        actions_queue = asyncio.Queue(maxsize=self._queue_size)
+        stages = [
+            asyncio.create_task(self._extract_stage(rows_queue)),
+            asyncio.create_task(self._transform_stage(rows_queue, actions_queue)),
+            asyncio.create_task(self._loader.load(drain_queue(actions_queue))),
+        ]
+
+        try:
+            *_, is_success_load = await asyncio.gather(*stages)
+        finally:
+            for stage in stages:
+                stage.cancel()
+            await asyncio.gather(*stages, return_exceptions=True)
+
+        if is_success_load:
+            await asyncio.to_thread(self._remember_last_modified_state)
+            self._extractor.acknowledge()
+
+        return is_success_load
+
+    async def _load_batches(self) -> bool:
+        """
+        Метод загружает данные пачками, пока источник не вернет пустую пачку.
+
+        Состояние сохраняется после того, как каждая пачка принята целевой системой.
+
+        Returns:
+            True - все пачки загружены успешно, иначе - False.
+        """
+        previous_states = None
+
+        while True:
+            if not await self._load():
+                return False
+
+            if not self._lock.is_held:
+                logger.error(f'Процесс {self._process_type} потерял блокировку {self._lock.name} и остановлен.')
+                return False
+
+            if not self._extractor.extracted_count:
+                return True
+
+            current_states = self._extractor.last_states
+            if current_states and current_states == previous_states:
+                logger.warning(f'Состояние процесса {self._process_type} не изменилось после загрузки пачки.')
+                return True
+
+            previous_states = current_states
+
+    async def _extract_stage(self, rows_queue: asyncio.Queue):
+        """
+        Метод считывает пачки строк из PostgreSQL в очередь. В конце в очередь кладется None.
+
+        Args:
+            rows_queue: очередь пачек строк.
+        """
+        async for rows in self._async_extractor.extract():
+            await rows_queue.put(rows)
+
+        await rows_queue.put(None)
+
+    async def _transform_stage(self, rows_queue: asyncio.Queue, actions_queue: asyncio.Queue):
+        """
+        Метод адаптирует и валидирует пачки строк в отдельном потоке. В конце в очередь кладется None.
+
+        Args:
+            rows_queue: очередь пачек строк.
+            actions_queue: очередь пачек bulk-действий.
+        """
+        while True:
+            rows = await rows_queue.get()
+
+            if rows is None:
+                break
+
+            await actions_queue.put(await asyncio.to_thread(self._transform, rows))
+
+        await actions_queue.put(None)
+
+    def _transform(self, rows: List[dict]) -> List[dict]:
+        """
+        Метод превращает пачку строк в пачку валидных bulk-действий.
+
+        Args:
+            rows: пачка строк.
+
+        Returns:
+            bulk-действия.
+        """
+        return list(self._validator.get_valid_data(self._extractor.adapt(rows)))
+
+
+async def create_pg_pool() -> Pool:
+    """
+    Функция создает пул соединений asyncpg с PostgreSQL.
+
+    Returns:
+        пул соединений.
+    """
+    return await asyncpg.create_pool(**ASYNC_PG_DSL, min_size=1, max_size=ASYNC_PG_POOL_SIZE, init=init_connection)
+
+
+def get_async_etl_params(
+    etl_process_type: ETLProcessType,
+    pg_pool: Pool,
+    redis_client: Redis,
+    es_client: AsyncElasticsearch,
+    state_storage: Optional[KeyValueStorage | BaseKeyValueDecorator] = None,
+    shard: Optional[Shard] = None,
+) -> AsyncETLProcessParameters:
+    """
+    Функция возвращает параметры для асинхронного ETL-процесса из PostgreSQL в Elasticsearch.
+
+    Хранилище состояний и блокировка - в Redis, как и у синхронного процесса.
+
+    Args:
+        etl_process_type: тип ETL-процесса.
+        pg_pool: пул соединений asyncpg.
+        redis_client: клиент Redis.
+        es_client: асинхронный клиент Elasticsearch.
+        state_storage: хранилище состояний цикла. По умолчанию создается новое.
+        shard: шард фильмов. По умолчанию процесс обрабатывает все фильмы.
+
+    Returns:
+        AsyncETLProcessParameters
+    """
+    index_info = get_index_info_by_process(etl_process_type)
+    lock = RedisLock(redis_client, get_lock_name_by_index(index_info, shard), ETL_LOCK_TTL_MS)
+    state_storage = FencedKeyValueDecorator(state_storage or get_redis_state_storage(redis_client), lock)
+    query = ETLQueryFactory.query_by_type(
+        query_type=QUERY_TYPE.get(etl_process_type),
+        process_type=etl_process_type,
+        state_storage=state_storage,
+        batch_size=DB_BATCH_SIZE if ETL_BATCH_MODE else None,
+        shard=shard,
+    )
+    extractor = AsyncPostgreExtractor(pg_pool, query, DB_BUFFER_SIZE, json_documents=ETL_JSON_DOCUMENTS)
+    adapter_class = PostgreJsonToElasticsearchAdapter if ETL_JSON_DOCUMENTS else PostgreToElasticsearchAdapter
+
+    return AsyncETLProcessParameters(
+        process_type=etl_process_type,
+        state_storage=state_storage,
+        extractor=extractor,
+        adapter=adapter_class(extractor),
+        validator=ElasticsearchValidatorFactory.validator_by_type(
+            ES_VALIDATOR_TYPE,
+            get_model_for_process_type(etl_process_type),
+        ),
+        loader=AsyncElasticsearchLoader(es_client, index_info.name, index_info.bulk_settings),
+        is_batched=query.is_batched,
+        lock=lock,
+        state_names=tuple(query.state_fields),
+    )
+
+
+async def run_async_etl_process(
+    etl_process_type: ETLProcessType,
+    pg_pool: Pool,
+    redis_client: Redis,
+    es_client: AsyncElasticsearch,
+    state_storage: Optional[KeyValueStorage | BaseKeyValueDecorator] = None,
+    shard: Optional[Shard] = None,
+) -> bool:
+    """
+    Функция запускает асинхронный ETL-процесс из PostgreSQL в Elasticsearch.
+
+    Args:
+        etl_process_type: тип ETL-процесса.
+        pg_pool: пул соединений asyncpg.
+        redis_client: клиент Redis.
+        es_client: асинхронный клиент Elasticsearch.
+        state_storage: хранилище состояний цикла. По умолчанию создается новое.
+        shard: шард фильмов. По умолчанию процесс обрабатывает все фильмы.
+
+    Returns:
+        True - процесс завершен успешно, иначе - False.
+    """
+    etl_params = get_async_etl_params(etl_process_type, pg_pool, redis_client, es_client, state_storage, shard)
+
+    try:
+        async with AsyncETLProcess(etl_params) as process:
+            return await process.start()
+    except AnotherProcessIsStartedError as error:
+        logger.info(f'{error.message} Процесс пропущен в этом цикле.')
+        return False
@@ -0,0 +1,164 @@
+"""Модуль отвечает за параллельную полную загрузку индекса несколькими процессами."""
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from multiprocessing import get_context
+from typing import Dict, List, Optional
+
+import psycopg2
+from psycopg2.extras import DictCursor
+
+from config.settings import (
+    ES_CONNECTION, PG_DSL, MODIFIED_STATE_ID, QUERY_TYPE, ETLProcessType, Shard, get_shard_state_name,
+)
+from services.context_managers.managers import es_context
+from services.decorators.resiliency import backoff
+from services.logs.logs_setup import get_logger
+from services.process.exceptions import ReindexError
+from services.process.helpers import get_etl_params
+from services.process.processes import ETLProcess
+from services.process.queries.queries import ETLQueryFactory
+from services.storages.key_value_storages import KeyValueStorage, MemoryStorage
+
+logger = get_logger()
+
+Watermarks = Dict[str, Optional[str]]
+
+
+def load_partition(
+    process_type: ETLProcessType,
+    index_name: str,
+    shard: Shard,
+    state_names: List[str],
+) -> Optional[Watermarks]:
+    """
+    Функция загружает в индекс одну часть фильмов. Выполняется в отдельном процессе.
+
+    У каждой части свое соединение с PostgreSQL, свой клиент Elasticsearch и свои состояния в памяти.
+
+    Args:
+        process_type: тип ETL-процесса.
+        index_name: наименование индекса.
+        shard: часть фильмов.
+        state_names: наименования состояний-меток процесса без учета части.
+
+    Returns:
+        значения состояний-меток части после загрузки. None - процесс завершился с ошибкой.
+    """
+    state_storage = MemoryStorage()
+    pg_conn = backoff()(psycopg2.connect)(**PG_DSL, cursor_factory=DictCursor)
+
+    try:
+        with es_context(ES_CONNECTION) as es:
+            etl_params = get_etl_params(process_type, pg_conn, state_storage, es, index_name, shard=shard)
+
+            with ETLProcess(etl_params) as process:
+                if not process.start():
+                    return None
+    finally:
+        pg_conn.close()
+
+    return {state_name: state_storage.get_value(get_shard_state_name(state_name, shard)) for state_name in state_names}
+
+
+class ParallelBackfill:
+    """
+    Класс загружает все данные ETL-процесса в индекс несколькими процессами Python.
+
+    Фильмы делятся на части тем же хешем id, что и при шардировании ETL. Каждая часть загружается
+    в отдельном процессе, поэтому время загрузки масштабируется по ядрам, а не упирается в один поток Python.
+    После загрузки состояния-метки частей сводятся в одно состояние процесса: берется наименьшая метка.
+    Изменения, сделанные после нее, догружаются обычным ETL-процессом; часть из них может загрузиться
+    повторно, но ни одно изменение не пропускается.
+    """
+
+    def __init__(self, process_type: ETLProcessType, index_name: str, workers: int):
+        """
+        Инициализирующий метод.
+
+        Args:
+            process_type: тип ETL-процесса.
+            index_name: наименование индекса для загрузки.
+            workers: количество частей и процессов.
+        """
+        self._process_type = process_type
+        self._index_name = index_name
+        self._workers = workers
+
+    def run(self, state_storage: KeyValueStorage) -> Watermarks:
+        """
+        Метод загружает все части и сохраняет сводные состояния-метки процесса.
+
+        Args:
+            state_storage: хранилище состояний процесса.
+
+        Returns:
+            сводные состояния-метки.
+
+        Raises:
+            ReindexError: загрузка одной из частей завершилась с ошибкой.
+        """
+        state_names = self._get_state_names(state_storage)
+        shards = [Shard(index=index, count=self._workers) for index in range(self._workers)]
+        logger.info(f'Загружаем {self._process_type} в {self._index_name} в {self._workers} процессах.')
+
+        with ProcessPoolExecutor(max_workers=self._workers, mp_context=get_context('spawn')) as executor:
+            futures = [
+                executor.submit(load_partition, self._process_type, self._index_name, shard, state_names)
+                for shard in shards
+            ]
+            partition_watermarks = [future.result() for future in futures]
+
+        if any(watermarks is None for watermarks in partition_watermarks):
+            raise ReindexError(self._index_name, self._process_type)
+
+        watermarks = merge_watermarks(state_names, partition_watermarks)
+        state_storage.set_many({state_name: value for state_name, value in watermarks.items() if value is not None})
+        logger.info(f'Загрузка {self._process_type} завершена. Сводные состояния: {watermarks}.')
+        return watermarks
+
+    def _get_state_names(self, state_storage: KeyValueStorage) -> List[str]:
+        """
+        Метод возвращает наименования состояний-меток времени процесса.
+
+        id последней записи не сводится: после сведения пачки начинаются с первой записи сводной метки.
+
+        Args:
+            state_storage: хранилище состояний процесса.
+
+        Returns:
+            наименования состояний.
+        """
+        query = ETLQueryFactory.query_by_type(
+            query_type=QUERY_TYPE.get(self._process_type),
+            process_type=self._process_type,
+            state_storage=state_storage,
+        )
+        id_state_names = set(MODIFIED_STATE_ID.values())
+        return [state_name for state_name in query.state_fields if state_name not in id_state_names]
+
+
+def merge_watermarks(state_names: List[str], partition_watermarks: List[Watermarks]) -> Watermarks:
+    """
+    Функция сводит состояния-метки частей в состояния процесса.
+
+    Для каждого состояния берется наименьшая метка среди частей: все изменения до нее загружены всеми
+    частями. Части без данных не учитываются.
+
+    Args:
+        state_names: наименования состояний.
+        partition_watermarks: состояния-метки частей.
+
+    Returns:
+        сводные состояния-метки. None - ни одна часть не загрузила данных.
+    """
+    watermarks = {}
+
+    for state_name in state_names:
+        values = [
+            watermarks_of_partition[state_name]
+            for watermarks_of_partition in partition_watermarks
+            if watermarks_of_partition.get(state_name) is not None
+        ]
+        watermarks[state_name] = min(values, key=datetime.fromisoformat, default=None)
+
+    return watermarks
@@ -14,3 +14,20 @@ class AnotherProcessIsStartedError(Exception):
         self.process_type = process_type
         self.message = f'Невозможно запустить процесс {process_type}, так как другой процесс находится на выполнении.'
         super().__init__(self.message)
+
+
+class ReindexError(Exception):
+    """Класс-исключение. Райзится тогда, когда ETL-процесс переиндексации завершился с ошибкой."""
+
+    def __init__(self, index_name: str, process_type: str):
+        """
+        Инициализирующий метод.
+
+        Args:
+            index_name: наименование переиндексируемого индекса.
+            process_type: тип процесса.
+        """
+        self.index_name = index_name
+        self.process_type = process_type
+        self.message = f'Переиндексация {index_name} прервана: процесс {process_type} завершился с ошибкой.'
+        super().__init__(self.message)
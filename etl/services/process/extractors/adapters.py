@@ -2,8 +2,7 @@
 
 
 from abc import ABC, abstractmethod
-from datetime import datetime
-from typing import Generator, Optional
+from typing import Any, Dict, Generator, Iterable, Tuple
 
 from .extractors import BaseExtractor
 
@@ -36,7 +35,6 @@ class BaseExtractorAdapter(ABC):
         """
         self._extractor = extractor
 
-    @abstractmethod
     def extract(self) -> Generator:
         """
         Метод позволяет извлекать данные из объекта источника, адаптирует их под нужный формат.
@@ -44,35 +42,102 @@ class BaseExtractorAdapter(ABC):
         Returns:
             Возвращает адаптированные данные из источника.
         """
-        return self._extractor.extract()
+        return self.adapt(self._extractor.extract())
+
+    @abstractmethod
+    def adapt(self, rows: Iterable[dict]) -> Generator[dict, None, None]:
+        """
+        Метод адаптирует строки источника под нужный формат.
+
+        Args:
+            rows: строки источника.
+
+        Returns:
+            Возвращает адаптированные данные.
+        """
+
+    @property
+    def last_states(self) -> Dict[str, Any]:
+        """
+        Свойство возвращает последние значения состояний, которые были извлечены с помощью extractor.
+
+        Returns:
+            словарь состояний.
+        """
+        return self._extractor.last_states
 
     @property
-    def last_modified_state(self) -> Optional[datetime]:
+    def extracted_count(self) -> int:
         """
-        Свойство возвращает последнее modified_state, которое было извлечено с помощью extractor.
+        Свойство возвращает количество записей, которое извлек extractor при последнем вызове.
 
         Returns:
-            datetime
+            количество записей.
         """
-        return self._extractor.last_modified_state
+        return self._extractor.extracted_count
+
+    @property
+    def state_columns(self) -> Tuple[str, ...]:
+        """
+        Свойство возвращает служебные поля выборки, в которых передаются значения состояний.
+
+        Returns:
+            наименования полей.
+        """
+        return self._extractor.state_columns
+
+    def acknowledge(self):
+        """Метод подтверждает источнику, что извлеченные данные загружены в целевую систему."""
+        self._extractor.acknowledge()
 
 
 class PostgreToElasticsearchAdapter(BaseExtractorAdapter):
     """Класс преобразует данные из формата PostgreЫЙД к формату, требуемому в Elasticsearch."""
 
-    def extract(self) -> Generator[dict, None, None]:
+    def adapt(self, rows: Iterable[dict]) -> Generator[dict, None, None]:
         """
-        Метод позволяет извлекать данные из объекта источника, адаптирует их под нужный формат.
+        Метод адаптирует строки источника под нужный формат.
+
+        Args:
+            rows: строки источника.
 
         Yields:
             Возвращает адаптированные данные из источника.
         """
-        extracted = super().extract()
+        fields_for_exclude = self.state_columns
 
-        fields_for_exclude = ['modified_state']
-
-        for row in extracted:
+        for row in rows:
             row = Row(row)
             row.exclude_fields(*fields_for_exclude)
+            if row.get('_op_type') is None:
+                row.exclude_fields('_op_type')
             row.update({'_id': row.get('id')})
             yield row
+
+
+class PostgreJsonToElasticsearchAdapter(BaseExtractorAdapter):
+    """
+    Класс передает в Elasticsearch документы, собранные PostgreSQL, без копирования и повторной сериализации.
+
+    Работает с извлекателем в режиме json_documents: JSON-текст документа из поля document передается
+    в bulk-запрос как есть, в _source.
+    """
+
+    def adapt(self, rows: Iterable[dict]) -> Generator[dict, None, None]:
+        """
+        Метод адаптирует строки источника под нужный формат.
+
+        Args:
+            rows: строки источника.
+
+        Yields:
+            Возвращает bulk-действия для Elasticsearch.
+        """
+        for row in rows:
+            op_type = row.get('_op_type')
+
+            if op_type is not None:
+                yield {'_op_type': op_type, '_id': row['id']}
+                continue
+
+            yield {'_id': row['id'], '_source': row['document']}
@@ -0,0 +1,139 @@
+"""Модуль отвечает за асинхронное извлечение данных из PostgreSQL через asyncpg."""
+import json
+import re
+from typing import Any, AsyncGenerator, Dict, List, Tuple
+
+from asyncpg import Connection, Pool, Record
+
+from services.logs.logs_setup import get_logger
+from .extractors import BaseExtractor
+from ..queries.prepared import to_positional_sql
+from ..queries.queries import MoviePostgreETLQuery
+
+logger = get_logger()
+
+# Состояния хранятся строками. Приведение параметра к text перед приведением к типу столбца позволяет
+# передавать в asyncpg строковые значения состояний, как и в psycopg2.
+TYPED_PARAM_PATTERN = re.compile(r'(\$\d+)::')
+
+
+def to_asyncpg_query(sql: str, params: Dict[str, Any]) -> Tuple[str, List[Any]]:
+    """
+    Функция переводит запрос ETL с именованными параметрами psycopg2 в запрос asyncpg.
+
+    Args:
+        sql: sql-запрос с параметрами вида %(name)s.
+        params: параметры sql-запроса.
+
+    Returns:
+        sql-запрос с параметрами вида $n и значения параметров в порядке их номеров.
+    """
+    positional_sql, param_names = to_positional_sql(sql)
+    return TYPED_PARAM_PATTERN.sub(r'\1::text::', positional_sql), [params[name] for name in param_names]
+
+
+async def init_connection(connection: Connection):
+    """
+    Функция настраивает новое соединение пула asyncpg так, чтобы строки совпадали со строками psycopg2.
+
+    uuid возвращаются строками, json и jsonb - разобранными объектами Python.
+
+    Args:
+        connection: соединение asyncpg.
+    """
+    await connection.set_type_codec('uuid', encoder=str, decoder=str, schema='pg_catalog')
+
+    for json_type in ('json', 'jsonb'):
+        await connection.set_type_codec(json_type, encoder=json.dumps, decoder=json.loads, schema='pg_catalog')
+
+
+class AsyncPostgreExtractor(BaseExtractor):
+    """
+    Класс для асинхронного извлечения данных из PostgreSQL.
+
+    Использует те же запросы ETL, что и PostgreExtractor. Данные считываются серверным курсором asyncpg
+    и отдаются пачками по buffer_size строк: пока следующая пачка считывается из PostgreSQL, предыдущие
+    валидируются и загружаются в Elasticsearch. asyncpg кеширует подготовленные запросы на соединении,
+    поэтому план запроса строится один раз на соединение пула.
+    """
+
+    def __init__(self, pool: Pool, query: MoviePostgreETLQuery, buffer_size: int, json_documents: bool = False):
+        """
+        Инициализаирующий метод.
+
+        Args:
+            pool: пул соединений asyncpg.
+            query: Запрос, который необходимо выполнить для извлечения данных.
+            buffer_size: Размер пачки строк.
+            json_documents: True - PostgreSQL возвращает готовый JSON-документ в поле document.
+        """
+        super().__init__()
+        self._pool = pool
+        self._query = query
+        self._buffer_size = buffer_size
+        self._json_documents = json_documents
+
+    async def extract(self) -> AsyncGenerator[List[Dict[str, Any]], None]:
+        """
+        Метод позволяет извлекать данные из объекта источника пачками.
+
+        Yields:
+            пачки строк из объекта.
+
+        Raises:
+            asyncpg.PostgresError: ошибка выполнения sql-команды.
+        """
+        logger.info('Считываем данные из PostgreSQL.')
+        self.last_states = {}
+        self.extracted_count = 0
+        sql, args = to_asyncpg_query(self._get_sql(), self._query.get_params())
+
+        async with self._pool.acquire() as connection:
+            async with connection.transaction(readonly=True):
+                cursor = await connection.cursor(sql, *args)
+
+                while True:
+                    records = await cursor.fetch(self._buffer_size)
+
+                    if not records:
+                        break
+
+                    self._remember_states(records[-1])
+                    self.extracted_count += len(records)
+                    yield [dict(record) for record in records]
+
+        logger.info('Считали все данные из PostgreSQL.')
+
+    @property
+    def state_columns(self) -> Tuple[str, ...]:
+        """
+        Свойство возвращает служебные поля выборки, в которых передаются значения состояний.
+
+        Returns:
+            наименования полей.
+        """
+        return tuple(self._query.state_fields.values())
+
+    def _get_sql(self) -> str:
+        """
+        Метод возвращает SQL для извлечения данных с учетом режима извлечения.
+
+        Returns:
+            sql-запрос.
+        """
+        if self._json_documents:
+            return self._query.get_document_sql()
+
+        return self._query.get_sql()
+
+    def _remember_states(self, record: Record):
+        """
+        Метод запоминает значения состояний из последней считанной строки.
+
+        Args:
+            record: последняя считанная строка.
+        """
+        self.last_states = {
+            state_name: record.get(column)
+            for state_name, column in self._query.state_fields.items()
+        }
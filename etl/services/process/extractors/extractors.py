@@ -1,29 +1,54 @@
 """Модуль отвечает за описание классов и функций для извлечения данных из источника."""
 
+import json
+import queue
+import threading
 from abc import ABC, abstractmethod
-from typing import Generator
-from datetime import datetime
+from typing import Any, Dict, Generator, List, Optional, Tuple
+from uuid import uuid4
 
-from psycopg2.extensions import connection as _connection
+from psycopg2.extensions import connection as _connection, cursor as _cursor
 from psycopg2.extras import DictRow
 
 from services.logs.logs_setup import get_logger
-from ..queries.queries import MoviePostgreETLQuery
+from ..queries.pg_templates import COPY_DOCUMENT_QUERY
+from ..queries.prepared import PreparedStatements
+from ..queries.queries import MoviePostgreETLQuery, OutboxMoviePostgreETLQuery
 
 logger = get_logger()
 
+COPY_CHUNK_SIZE = 64 * 1024
+
+COPY_BUFFER_CHUNKS = 16
+
+COPY_PUT_TIMEOUT_SECONDS = 0.5
+
+COPY_FIELD_DELIMITER = '\x02'
+
 
 class BaseExtractor(ABC):
     """
     Базовый класс, отвечающий за выгрузку данных.
 
     Attributes:
-        last_modified_state (datetime): последнее modified_state, которое извлекли из генератора extract.
+        last_states (Dict[str, Any]): последние значения состояний, которые извлекли из генератора extract.
+        extracted_count (int): количество записей, которое извлекли при последнем вызове extract.
     """
 
     def __init__(self):
         """Инициализирующий метод."""
-        self.last_modified_state: datetime = None
+        self.last_states: Dict[str, Any] = {}
+        self.extracted_count: int = 0
+
+    @property
+    def state_columns(self) -> Tuple[str, ...]:
+        """
+        Свойство возвращает служебные поля выборки, в которых передаются значения состояний.
+
+        Returns:
+            наименования полей.
+        """
+        return ()
 
     @abstractmethod
     def extract(self) -> Generator:
@@ -35,11 +60,36 @@ class BaseExtractor(ABC):
         """
         pass
 
+    def acknowledge(self):
+        """
+        Метод подтверждает источнику, что извлеченные данные загружены в целевую систему.
+
+        По умолчанию ничего не делает: большинство источников не хранят информацию о загруженных данных.
+        """
+
 
 class PostgreExtractor(BaseExtractor):
-    """Класс для извлечения данных из PostgreSQL."""
+    """
+    Класс для извлечения данных из PostgreSQL.
+
+    Может работать в потоковом режиме через именованный (серверный) курсор. В этом режиме PostgreSQL
+    отдает данные порциями по itersize строк, и в памяти ETL-процесса никогда не оказывается вся выборка.
+
+    Может выполнять запросы как подготовленные запросы PostgreSQL: план строится один раз на соединение
+    и переиспользуется в следующих циклах. Подготовленный запрос нельзя выполнить через именованный курсор,
+    поэтому в этом режиме всегда используется обычный курсор.
+    """
 
-    def __init__(self, connection: _connection, query: MoviePostgreETLQuery, buffer_size: int):
+    def __init__(
+        self,
+        connection: _connection,
+        query: MoviePostgreETLQuery,
+        buffer_size: int,
+        use_server_side_cursor: bool = False,
+        itersize: Optional[int] = None,
+        json_documents: bool = False,
+        prepared_statements: bool = False,
+    ):
         """
         Инициализаирующий метод.
 
@@ -47,11 +97,22 @@ class PostgreExtractor(BaseExtractor):
             connection: соединение с PostgreSQL.
             query: Запрос, который необходимо выполнить для извлечения данных.
             buffer_size: Размер буфера для выгрузки данных.
+            use_server_side_cursor: True - данные считываются потоково через именованный курсор.
+            itersize: количество строк, которое серверный курсор отдает за одно обращение к БД.
+            json_documents: True - PostgreSQL возвращает готовый JSON-документ в поле document.
+            prepared_statements: True - запросы выполняются через PREPARE/EXECUTE.
         """
         super().__init__()
         self._conn = connection
         self._query = query
         self._buffer_size = buffer_size
+        self._prepared_statements = PreparedStatements(connection) if prepared_statements else None
+        self._use_server_side_cursor = use_server_side_cursor and not prepared_statements
+        self._itersize = itersize or buffer_size
+        self._json_documents = json_documents
+
+        if use_server_side_cursor and prepared_statements:
+            logger.warning('Подготовленные запросы не работают с именованным курсором. Используется обычный курсор.')
 
     def extract(self) -> Generator[DictRow, None, None]:
         """
@@ -64,18 +125,444 @@ class PostgreExtractor(BaseExtractor):
             psycopg2.Error: ошибка выполнения sql-команды.
         """
         logger.info('Считываем данные из PostgreSQL.')
+        self.last_states = {}
+        self.extracted_count = 0
 
-        with self._conn.cursor() as cursor:
-            cursor.execute(self._query.get_sql())
+        with self._get_cursor() as cursor:
+            self._execute(cursor, self._get_sql(), self._query.get_params())
 
             while True:
-                table_data = cursor.fetchmany(self._buffer_size)
+                table_data = cursor.fetchmany(self._get_fetch_size())
 
                 if not table_data:
                     break
 
-                for row in table_data:
-                    yield row
-                    self.last_modified_state = row.get('modified_state')
+                yield from table_data
+                self._remember_states(table_data[-1])
+                self.extracted_count += len(table_data)
 
             logger.info('Считали все данные из PostgreSQL.')
+
+    @property
+    def state_columns(self) -> Tuple[str, ...]:
+        """
+        Свойство возвращает служебные поля выборки, в которых передаются значения состояний.
+
+        Returns:
+            наименования полей.
+        """
+        return tuple(self._query.state_fields.values())
+
+    def _get_sql(self) -> str:
+        """
+        Метод возвращает SQL для извлечения данных с учетом режима извлечения.
+
+        Returns:
+            sql-запрос.
+        """
+        if self._json_documents:
+            return self._query.get_document_sql()
+
+        return self._query.get_sql()
+
+    def _execute(self, cursor: _cursor, sql: str, params: Optional[Dict[str, Any]]):
+        """
+        Метод выполняет запрос с учетом режима подготовленных запросов.
+
+        Args:
+            cursor: курсор PostgreSQL.
+            sql: sql-запрос.
+            params: параметры sql-запроса.
+        """
+        if self._prepared_statements is None:
+            cursor.execute(sql, params)
+            return
+
+        self._prepared_statements.execute(cursor, sql, params)
+
+    def _remember_states(self, row: DictRow):
+        """
+        Метод запоминает значения состояний из последней считанной строки.
+
+        Args:
+            row: последняя считанная строка.
+        """
+        self.last_states = {
+            state_name: row.get(column)
+            for state_name, column in self._query.state_fields.items()
+        }
+
+    def _get_cursor(self) -> _cursor:
+        """
+        Метод создает курсор для выполнения запроса.
+
+        Для потокового режима создается именованный курсор: результат запроса остается на стороне PostgreSQL
+        и считывается порциями.
+
+        Returns:
+            курсор PostgreSQL.
+        """
+        if not self._use_server_side_cursor:
+            return self._conn.cursor()
+
+        cursor = self._conn.cursor(name=f'etl_{uuid4().hex}')
+        cursor.itersize = self._itersize
+        return cursor
+
+    def _get_fetch_size(self) -> int:
+        """
+        Метод возвращает количество строк, которое считывается из курсора за одно обращение.
+
+        Returns:
+            размер порции данных.
+        """
+        if self._use_server_side_cursor:
+            return self._itersize
+
+        return self._buffer_size
+
+
+class OutboxPostgreExtractor(PostgreExtractor):
+    """
+    Класс для извлечения фильмов из PostgreSQL по изменениям, записанным в outbox.
+
+    Пачка изменений outbox блокируется через FOR UPDATE SKIP LOCKED и остается заблокированной до вызова
+    acknowledge. Поэтому несколько ETL-процессов могут разбирать outbox одновременно, не мешая друг другу,
+    а изменения упавшей пачки будут обработаны повторно. Для удаленных фильмов извлекаются операции удаления
+    документов.
+    """
+
+    def __init__(
+        self,
+        connection: _connection,
+        query: OutboxMoviePostgreETLQuery,
+        buffer_size: int,
+        use_server_side_cursor: bool = False,
+        itersize: Optional[int] = None,
+        json_documents: bool = False,
+        prepared_statements: bool = False,
+    ):
+        """
+        Инициализаирующий метод.
+
+        Args:
+            connection: соединение с PostgreSQL.
+            query: Запрос, который необходимо выполнить для извлечения данных.
+            buffer_size: Размер буфера для выгрузки данных.
+            use_server_side_cursor: True - данные считываются потоково через именованный курсор.
+            itersize: количество строк, которое серверный курсор отдает за одно обращение к БД.
+            json_documents: True - PostgreSQL возвращает готовый JSON-документ в поле document.
+            prepared_statements: True - запросы выполняются через PREPARE/EXECUTE.
+        """
+        super().__init__(
+            connection,
+            query,
+            buffer_size,
+            use_server_side_cursor,
+            itersize,
+            json_documents,
+            prepared_statements,
+        )
+        self._query = query
+
+    def extract(self) -> Generator[Dict[str, Any], None, None]:
+        """
+        Метод позволяет извлекать данные из объекта источника.
+
+        extracted_count после извлечения равен количеству обработанных записей outbox.
+
+        Yields:
+            Generator[Dict[str, Any], None, None]: генератор данных из объекта.
+
+        Raises:
+            psycopg2.Error: ошибка выполнения sql-команды.
+        """
+        # Откатываем незавершенную транзакцию, чтобы снять блокировки с пачки, которую не удалось загрузить.
+        self._conn.rollback()
+        self._query.outbox_ids = self._lock_outbox_batch()
+
+        if not self._query.outbox_ids:
+            logger.info('Новых изменений в outbox нет.')
+            self.last_states = {}
+            self.extracted_count = 0
+            return
+
+        yield from super().extract()
+        yield from self._extract_deleted()
+        self.extracted_count = len(self._query.outbox_ids)
+
+    def acknowledge(self):
+        """Метод удаляет загруженную пачку изменений из outbox и снимает с нее блокировку."""
+        if not self._query.outbox_ids:
+            return
+
+        with self._conn.cursor() as cursor:
+            self._execute(cursor, self._query.get_drain_sql(), self._query.get_params())
+
+        self._conn.commit()
+        logger.info(f'Из outbox удалено обработанных изменений: {len(self._query.outbox_ids)}.')
+        self._query.outbox_ids = []
+
+    def _lock_outbox_batch(self) -> List[int]:
+        """
+        Метод выбирает и блокирует очередную пачку изменений outbox.
+
+        Returns:
+            идентификаторы записей outbox.
+        """
+        with self._conn.cursor() as cursor:
+            self._execute(cursor, self._query.get_batch_sql(), self._query.get_params())
+            return [row[0] for row in cursor.fetchall()]
+
+    def _extract_deleted(self) -> Generator[Dict[str, Any], None, None]:
+        """
+        Метод извлекает операции удаления документов для фильмов, удаленных из PostgreSQL.
+
+        Yields:
+            Generator[Dict[str, Any], None, None]: операции удаления документов.
+        """
+        with self._conn.cursor() as cursor:
+            self._execute(cursor, self._query.get_deleted_sql(), self._query.get_params())
+
+            for row in cursor.fetchall():
+                yield {'_op_type': 'delete', 'id': row[0]}
+
+
+class CopyStream:
+    """
+    Класс ограниченного буфера между командой COPY и разбором ее строк.
+
+    psycopg2 пишет данные COPY TO STDOUT методом write в фоновом потоке, а извлекатель читает их построчно.
+    В очереди не больше max_chunks кусков: пока загрузчик не успевает, COPY ждет, поэтому в памяти никогда
+    не оказывается вся выборка.
+    """
+
+    def __init__(self, max_chunks: int):
+        """
+        Инициализирующий метод.
+
+        Args:
+            max_chunks: максимальное количество кусков данных COPY в буфере.
+        """
+        self._chunks: queue.Queue = queue.Queue(maxsize=max_chunks)
+        self._closed = threading.Event()
+        self.error: Optional[Exception] = None
+
+    def write(self, data: bytes) -> int:
+        """
+        Метод принимает очередной кусок данных COPY. После закрытия буфера данные отбрасываются.
+
+        Args:
+            data: кусок данных COPY.
+
+        Returns:
+            количество принятых байт.
+        """
+        self._put(data)
+        return len(data)
+
+    def finish(self, error: Optional[Exception] = None):
+        """
+        Метод сообщает читателю, что COPY завершена.
+
+        Args:
+            error: ошибка, с которой завершилась COPY.
+        """
+        self.error = error
+        self._put(None)
+
+    def close(self):
+        """Метод закрывает буфер со стороны читателя, чтобы COPY не ждала освобождения очереди."""
+        self._closed.set()
+
+    def lines(self) -> Generator[bytes, None, None]:
+        """
+        Метод отдает строки COPY по мере поступления данных.
+
+        Yields:
+            строка COPY без символа перевода строки.
+
+        Raises:
+            Exception: ошибка, с которой завершилась COPY.
+        """
+        tail = b''
+
+        while True:
+            chunk = self._chunks.get()
+
+            if chunk is None:
+                break
+
+            lines = (tail + chunk).split(b'\n')
+            tail = lines.pop()
+            yield from lines
+
+        if self.error is not None:
+            raise self.error
+
+        if tail:
+            yield tail
+
+    def _put(self, chunk: Optional[bytes]):
+        """
+        Метод кладет кусок данных в очередь, ожидая свободного места, пока буфер не закрыт.
+
+        Args:
+            chunk: кусок данных COPY. None - признак завершения COPY.
+        """
+        while not self._closed.is_set():
+            try:
+                self._chunks.put(chunk, timeout=COPY_PUT_TIMEOUT_SECONDS)
+            except queue.Full:
+                continue
+            return
+
+
+class CopyPostgreExtractor(PostgreExtractor):
+    """
+    Класс для полной выгрузки данных из PostgreSQL командой COPY.
+
+    Используется, когда у процесса еще нет состояний: при первичной загрузке и при переиндексации.
+    Запрос документов выполняется как COPY (...) TO STDOUT: PostgreSQL отдает JSON-документ и значения
+    состояний одной строкой текста, а psycopg2 не строит строки курсора. COPY выполняется в фоновом потоке
+    и пишет данные в ограниченный буфер, строки которого разбираются по мере загрузки в Elasticsearch.
+
+    COPY не принимает параметры, поэтому параметры запроса подставляются в текст запроса на стороне клиента.
+    Серверный курсор и подготовленные запросы в этом режиме не используются.
+    """
+
+    def __init__(
+        self,
+        connection: _connection,
+        query: MoviePostgreETLQuery,
+        buffer_size: int,
+        use_server_side_cursor: bool = False,
+        itersize: Optional[int] = None,
+        json_documents: bool = False,
+        prepared_statements: bool = False,
+        copy_buffer_chunks: int = COPY_BUFFER_CHUNKS,
+    ):
+        """
+        Инициализаирующий метод.
+
+        Args:
+            connection: соединение с PostgreSQL.
+            query: Запрос, который необходимо выполнить для извлечения данных.
+            buffer_size: Размер буфера для выгрузки данных.
+            use_server_side_cursor: не используется, COPY всегда отдает данные потоково.
+            itersize: не используется.
+            json_documents: True - документ передается дальше JSON-текстом, иначе разбирается в словарь.
+            prepared_statements: не используется, COPY нельзя подготовить.
+            copy_buffer_chunks: максимальное количество кусков данных COPY в буфере.
+        """
+        super().__init__(connection, query, buffer_size, json_documents=json_documents)
+        self._copy_buffer_chunks = copy_buffer_chunks
+
+    def extract(self) -> Generator[Dict[str, Any], None, None]:
+        """
+        Метод позволяет извлекать данные из объекта источника.
+
+        Если загрузка прервана до конца выгрузки, COPY отменяется, а транзакция откатывается.
+
+        Yields:
+            Generator[Dict[str, Any], None, None]: генератор данных из объекта.
+
+        Raises:
+            psycopg2.Error: ошибка выполнения sql-команды.
+        """
+        logger.info('Считываем данные из PostgreSQL командой COPY.')
+        self.last_states = {}
+        self.extracted_count = 0
+        state_columns = self.state_columns
+        stream = CopyStream(self._copy_buffer_chunks)
+        copy_thread = threading.Thread(
+            target=self._copy,
+            args=(self._get_copy_sql(state_columns), stream),
+            name='etl_copy',
+            daemon=True,
+        )
+        copy_thread.start()
+        row = None
+        is_finished = False
+
+        try:
+            for line in stream.lines():
+                row = self._parse_line(line, state_columns)
+                yield row
+                self.extracted_count += 1
+            is_finished = True
+        finally:
+            stream.close()
+
+            if copy_thread.is_alive():
+                self._conn.cancel()
+
+            copy_thread.join()
+
+            if not is_finished:
+                self._conn.rollback()
+
+        if row is not None:
+            self._remember_states(row)
+
+        logger.info('Считали все данные из PostgreSQL.')
+
+    def _get_copy_sql(self, state_columns: Tuple[str, ...]) -> str:
+        """
+        Метод возвращает команду COPY для запроса документов с подставленными параметрами.
+
+        Args:
+            state_columns: поля состояний.
+
+        Returns:
+            sql-команда.
+        """
+        with self._conn.cursor() as cursor:
+            query = cursor.mogrify(self._query.get_document_sql(), self._query.get_params()).decode()
+
+        return COPY_DOCUMENT_QUERY.format(
+            query=query,
+            state_columns=''.join(f', c.{column}' for column in state_columns),
+        )
+
+    def _copy(self, copy_sql: str, stream: CopyStream):
+        """
+        Метод выполняет COPY и пишет данные в буфер. Выполняется в фоновом потоке.
+
+        Args:
+            copy_sql: sql-команда COPY.
+            stream: буфер для данных COPY.
+        """
+        error = None
+
+        try:
+            with self._conn.cursor() as cursor:
+                cursor.copy_expert(copy_sql, stream, size=COPY_CHUNK_SIZE)
+        except Exception as copy_error:
+            error = copy_error
+
+        stream.finish(error)
+
+    def _parse_line(self, line: bytes, state_columns: Tuple[str, ...]) -> Dict[str, Any]:
+        """
+        Метод разбирает строку COPY.
+
+        Пустой документ означает, что фильм удален, и строка превращается в операцию удаления документа.
+
+        Args:
+            line: строка COPY: id, документ и значения состояний через COPY_FIELD_DELIMITER.
+            state_columns: поля состояний.
+
+        Returns:
+            данные строки.
+        """
+        row_id, document, *state_values = line.decode().split(COPY_FIELD_DELIMITER)
+        row = dict(zip(state_columns, (state_value or None for state_value in state_values)))
+
+        if not document:
+            return {**row, 'id': row_id, '_op_type': 'delete'}
+
+        if self._json_documents:
+            return {**row, 'id': row_id, 'document': document}
+
+        return {**json.loads(document), **row}
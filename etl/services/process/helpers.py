@@ -1,24 +1,49 @@
 """Модуль содержит классы и функции, помогающие задавать параметры для ETL-процессов."""
 import json
+from functools import partial
 
 from http import HTTPStatus
+from typing import Callable, Iterable, Optional
 from psycopg2.extensions import connection as postgre_conn
 from redis import Redis
 from elasticsearch import Elasticsearch
-from config.settings import QUERY_TYPE, DB_BUFFER_SIZE, PROCESS_ES_INDEX, EsIndexInfo
+from config.settings import (
+    PROCESS_LOCK_PREFIX, ETL_LOCK_TTL_MS, QUERY_TYPE, DB_BUFFER_SIZE, PROCESS_ES_INDEX, EsIndexInfo,
+    MODIFIED_STATE, MODIFIED_STATE_ID, DB_USE_SERVER_SIDE_CURSOR, DB_CURSOR_ITERSIZE, ETL_BATCH_MODE, DB_BATCH_SIZE,
+    ES_LOADER_TYPE,
+    ETL_OUTBOX_CONSUMER_NAME, ES_VALIDATOR_TYPE, ETL_JSON_DOCUMENTS, DB_PREPARED_STATEMENTS, Shard,
+    ETL_COPY_BACKFILL, DB_COPY_BUFFER_CHUNKS, LoaderType,
+    get_shard_state_name,
+)
 from services.logs.logs_setup import get_logger
-from services.process.extractors.adapters import PostgreToElasticsearchAdapter
-from services.process.extractors.extractors import PostgreExtractor
-from services.process.processes import ETLProcessType, ETLProcessParameters
-from services.process.queries.queries import ETLQueryFactory
-from services.process.loaders.loaders import ElasticsearchLoader
-from services.process.validators.validators import ElasticsearchValidator
+from services.process.extractors.adapters import PostgreToElasticsearchAdapter, PostgreJsonToElasticsearchAdapter
+from services.process.extractors.extractors import (
+    BaseExtractor, PostgreExtractor, OutboxPostgreExtractor, CopyPostgreExtractor,
+)
+from services.process.exceptions import AnotherProcessIsStartedError
+from services.process.processes import ETLProcessType, ETLProcessParameters, ETLProcess
+from services.process.queries.queries import BaseETLQuery, ETLQueryFactory
+from services.process.queries.pg_templates import (
+    OUTBOX_TABLE_EXISTS_QUERY, OUTBOX_REGISTER_CONSUMER_QUERY, OUTBOX_UNREGISTER_CONSUMER_QUERY, OUTBOX_CLEAR_QUERY,
+)
+from services.process.loaders.loaders import ElasticsearchLoaderFactory
+from services.process.validators.validators import ElasticsearchValidatorFactory
 from services.process.validators.pydantic_models import get_model_for_process_type
-from services.storages.key_value_storages import RedisStorage
-from services.storages.key_value_decorators import BackoffKeyValueDecorator
+from services.storages.key_value_storages import KeyValueStorage, RedisStorage
+from services.storages.key_value_decorators import (
+    BaseKeyValueDecorator, BackoffKeyValueDecorator, PreloadedKeyValueDecorator, FencedKeyValueDecorator,
+)
+from services.storages.dead_letters import BaseDeadLetterStorage, get_dead_letter_storage
+from services.storages.locks import BaseLock, LocalLock, RedisLock
 
 logger = get_logger()
 
+PROCESS_EXTRACTORS = {
+    ETLProcessType.MOVIE_OUTBOX: OutboxPostgreExtractor,
+}
+
+WATERMARK_STATE_NAMES = (*MODIFIED_STATE.values(), *MODIFIED_STATE_ID.values())
+
 
 def get_index_info_by_process(process_type: ETLProcessType) -> EsIndexInfo:
     """
@@ -37,44 +62,248 @@ def get_index_info_by_process(process_type: ETLProcessType) -> EsIndexInfo:
         raise error
 
 
-def get_etl_params_for_redis_pg_es(
+def get_lock_name_by_index(index_info: EsIndexInfo, shard: Optional[Shard] = None) -> str:
+    """
+    Функция возвращает наименование блокировки для процессов, которые загружают данные в индекс.
+
+    Процессы разных индексов блокируют друг друга только в рамках своего индекса,
+    процессы разных шардов одного индекса - только в рамках своего шарда.
+
+    Args:
+        index_info: информация об индексе.
+        shard: шард фильмов.
+
+    Returns:
+        наименование блокировки.
+    """
+    lock_name = f'{PROCESS_LOCK_PREFIX}_{index_info.name}'
+
+    if shard is None:
+        return lock_name
+
+    return get_shard_state_name(lock_name, shard)
+
+
+def get_etl_params(
     etl_process_type: ETLProcessType,
     pg_conn: postgre_conn,
-    redis_client: Redis,
+    state_storage: KeyValueStorage | BaseKeyValueDecorator,
     es_client: Elasticsearch,
+    target_index: Optional[str] = None,
+    lock: Optional[BaseLock] = None,
+    shard: Optional[Shard] = None,
+    dead_letters: Optional[BaseDeadLetterStorage] = None,
 ) -> ETLProcessParameters:
     """
-    Функция возвращает параметры для ETL-процесса.
-
-    В данном случае это выгрузка из PostgreSQL в Elasticsearch, где хранилище состояний - Redis.
+    Функция возвращает параметры для ETL-процесса из PostgreSQL в Elasticsearch.
 
     Args:
         etl_process_type: тип ETL-процесса.
         pg_conn: содениение с PostgreSQL.
-        redis_client: клиент Redis.
+        state_storage: хранилище состояний.
         es_client: клиент Elasticsearch
+        target_index: индекс для загрузки. По умолчанию - индекс процесса из PROCESS_ES_INDEX.
+        lock: блокировка процесса. По умолчанию - блокировка индекса в рамках текущего процесса Python.
+        shard: шард фильмов. По умолчанию процесс обрабатывает все фильмы.
+        dead_letters: хранилище незагруженных документов для загрузчика dead_letter. По умолчанию - файл.
 
     Returns:
         ETLProcessParameters
     """
     index_info = get_index_info_by_process(etl_process_type)
-    state_storage = BackoffKeyValueDecorator(RedisStorage(redis_client))
     query = ETLQueryFactory.query_by_type(
         query_type=QUERY_TYPE.get(etl_process_type),
         process_type=etl_process_type,
         state_storage=state_storage,
+        batch_size=DB_BATCH_SIZE if ETL_BATCH_MODE else None,
+        shard=shard,
+    )
+    extractor_class = get_extractor_class(etl_process_type, query)
+    adapter_class = PostgreJsonToElasticsearchAdapter if ETL_JSON_DOCUMENTS else PostgreToElasticsearchAdapter
+    extractor = adapter_class(extractor_class(
+        pg_conn,
+        query,
+        DB_BUFFER_SIZE,
+        use_server_side_cursor=DB_USE_SERVER_SIDE_CURSOR,
+        itersize=DB_CURSOR_ITERSIZE,
+        json_documents=ETL_JSON_DOCUMENTS,
+        prepared_statements=DB_PREPARED_STATEMENTS,
+    ))
+    validator = ElasticsearchValidatorFactory.validator_by_type(
+        ES_VALIDATOR_TYPE,
+        get_model_for_process_type(etl_process_type),
+    )
+    loader_options = {'dead_letters': dead_letters} if ES_LOADER_TYPE == LoaderType.DEAD_LETTER else {}
+    loader = ElasticsearchLoaderFactory.loader_by_type(
+        ES_LOADER_TYPE,
+        es_client,
+        target_index or index_info.name,
+        validator,
+        index_info.bulk_settings,
+        **loader_options,
     )
-    extractor = PostgreToElasticsearchAdapter(PostgreExtractor(pg_conn, query, DB_BUFFER_SIZE))
-    validator = ElasticsearchValidator(get_model_for_process_type(etl_process_type))
-    loader = ElasticsearchLoader(es_client, index_info.name, validator)
 
     return ETLProcessParameters(
         state_storage=state_storage,
         process_type=etl_process_type,
         extractor=extractor,
         loader=loader,
+        is_batched=query.is_batched,
+        lock=lock or LocalLock(get_lock_name_by_index(index_info, shard)),
+        state_names=tuple(query.state_fields),
+    )
+
+
+def get_extractor_class(etl_process_type: ETLProcessType, query: BaseETLQuery) -> Callable[..., BaseExtractor]:
+    """
+    Функция возвращает класс извлекателя данных для ETL-процесса.
+
+    Если включен ETL_COPY_BACKFILL и процесс еще не сохранял состояния, то есть выгружает все данные,
+    используется извлекатель COPY.
+
+    Args:
+        etl_process_type: тип ETL-процесса.
+        query: запрос ETL-процесса.
+
+    Returns:
+        класс извлекателя данных.
+    """
+    if etl_process_type in PROCESS_EXTRACTORS:
+        return PROCESS_EXTRACTORS[etl_process_type]
+
+    if ETL_COPY_BACKFILL and not query.has_saved_states:
+        logger.info(f'Процесс {etl_process_type} выгружает все данные командой COPY.')
+        return partial(CopyPostgreExtractor, copy_buffer_chunks=DB_COPY_BUFFER_CHUNKS)
+
+    return PostgreExtractor
+
+
+def get_redis_state_storage(redis_client: Redis, shards: Iterable[Shard] = ()) -> PreloadedKeyValueDecorator:
+    """
+    Функция возвращает отказоустойчивое хранилище состояний в Redis для одного цикла ETL-процессов.
+
+    Все состояния-метки (modified и id) загружаются одной командой MGET при создании хранилища.
+
+    Args:
+        redis_client: клиент Redis.
+        shards: шарды, состояния-метки которых тоже нужно загрузить.
+
+    Returns:
+        хранилище состояний.
+    """
+    state_names = [
+        *WATERMARK_STATE_NAMES,
+        *(get_shard_state_name(state_name, shard) for shard in shards for state_name in WATERMARK_STATE_NAMES),
+    ]
+    return PreloadedKeyValueDecorator(BackoffKeyValueDecorator(RedisStorage(redis_client)), state_names)
+
+
+def get_etl_params_for_redis_pg_es(
+    etl_process_type: ETLProcessType,
+    pg_conn: postgre_conn,
+    redis_client: Redis,
+    es_client: Elasticsearch,
+    state_storage: Optional[KeyValueStorage | BaseKeyValueDecorator] = None,
+    shard: Optional[Shard] = None,
+) -> ETLProcessParameters:
+    """
+    Функция возвращает параметры для ETL-процесса.
+
+    В данном случае это выгрузка из PostgreSQL в Elasticsearch, где хранилище состояний - Redis.
+
+    Args:
+        etl_process_type: тип ETL-процесса.
+        pg_conn: содениение с PostgreSQL.
+        redis_client: клиент Redis.
+        es_client: клиент Elasticsearch
+        state_storage: хранилище состояний цикла. По умолчанию создается новое.
+        shard: шард фильмов. По умолчанию процесс обрабатывает все фильмы.
+
+    Returns:
+        ETLProcessParameters
+    """
+    state_storage = state_storage or get_redis_state_storage(redis_client)
+    lock_name = get_lock_name_by_index(get_index_info_by_process(etl_process_type), shard)
+    lock = RedisLock(redis_client, lock_name, ETL_LOCK_TTL_MS)
+    return get_etl_params(
+        etl_process_type,
+        pg_conn,
+        FencedKeyValueDecorator(state_storage, lock),
+        es_client,
+        lock=lock,
+        shard=shard,
+        dead_letters=get_dead_letter_storage(redis_client),
+    )
+
+
+def run_etl_process(
+    etl_process_type: ETLProcessType,
+    pg_conn: postgre_conn,
+    redis_client: Redis,
+    es_client: Elasticsearch,
+    state_storage: Optional[KeyValueStorage | BaseKeyValueDecorator] = None,
+    shard: Optional[Shard] = None,
+) -> bool:
+    """
+    Функция запускает ETL-процесс из PostgreSQL в Elasticsearch.
+
+    Args:
+        etl_process_type: тип ETL-процесса.
+        pg_conn: содениение с PostgreSQL.
+        redis_client: клиент Redis.
+        es_client: клиент Elasticsearch
+        state_storage: хранилище состояний цикла. По умолчанию создается новое.
+        shard: шард фильмов. По умолчанию процесс обрабатывает все фильмы.
+
+    Returns:
+        True - процесс завершен успешно, иначе - False.
+    """
+    etl_params = get_etl_params_for_redis_pg_es(
+        etl_process_type,
+        pg_conn,
+        redis_client,
+        es_client,
+        state_storage,
+        shard,
     )
 
+    try:
+        with ETLProcess(etl_params) as process:
+            return process.start()
+    except AnotherProcessIsStartedError as error:
+        logger.info(f'{error.message} Процесс пропущен в этом цикле.')
+        return False
+
+
+def set_outbox_consumer(pg_conn: postgre_conn, is_active: bool, consumer_name: str = ETL_OUTBOX_CONSUMER_NAME):
+    """
+    Функция регистрирует ETL как потребителя outbox или снимает регистрацию.
+
+    Триггеры пишут изменения в outbox, только пока у него есть хотя бы один потребитель. Если потребителей
+    не осталось, накопленные изменения удаляются: ETL будет догонять изменения опросом по modified.
+
+    Args:
+        pg_conn: содениение с PostgreSQL.
+        is_active: True - зарегистрировать потребителя, False - снять регистрацию.
+        consumer_name: наименование потребителя.
+    """
+    with pg_conn.cursor() as cursor:
+        cursor.execute(OUTBOX_TABLE_EXISTS_QUERY)
+
+        if not cursor.fetchone()[0]:
+            logger.warning('Таблицы outbox в PostgreSQL нет. Нужно применить миграции movies_admin.')
+            pg_conn.rollback()
+            return
+
+        if is_active:
+            cursor.execute(OUTBOX_REGISTER_CONSUMER_QUERY, {'name': consumer_name})
+        else:
+            cursor.execute(OUTBOX_UNREGISTER_CONSUMER_QUERY, {'name': consumer_name})
+            cursor.execute(OUTBOX_CLEAR_QUERY)
+
+    pg_conn.commit()
+    logger.info(f'Потребитель outbox {consumer_name} {"зарегистрирован" if is_active else "снят с регистрации"}.')
+
 
 def drop_es_index(es_client: Elasticsearch, *indexes: str):
     """
@@ -0,0 +1,140 @@
+"""Модуль отвечает за ожидание изменений в PostgreSQL через LISTEN/NOTIFY."""
+import select
+from time import monotonic
+from typing import Callable, Iterable, List, Optional, Set
+
+import psycopg2
+from psycopg2 import sql
+from psycopg2.extensions import connection as postgre_conn, ISOLATION_LEVEL_AUTOCOMMIT
+from config.settings import ETLProcessType, TABLE_PROCESS_TYPES
+from services.logs.logs_setup import get_logger
+
+logger = get_logger()
+
+PostgreConnector = Callable[[], postgre_conn]
+
+
+class PostgreChangeListener:
+    """
+    Класс ожидает уведомлений об изменениях таблиц, которые триггеры отправляют в канал PostgreSQL.
+
+    Для прослушивания открывается отдельное соединение в режиме autocommit: уведомления доставляются только
+    соединениям вне транзакции. Настоятельно рекомендуется работать с классом через контекстный менеджер with.
+    """
+
+    def __init__(self, pg_connector: PostgreConnector, channel: str, debounce_seconds: float = 0):
+        """
+        Инициализирующий метод.
+
+        Args:
+            pg_connector: функция, открывающая новое соединение с PostgreSQL.
+            channel: канал уведомлений.
+            debounce_seconds: сколько ждать следующих уведомлений после первого, чтобы обработать их одним циклом.
+        """
+        self._pg_connector = pg_connector
+        self._channel = channel
+        self._debounce_seconds = debounce_seconds
+        self._conn: Optional[postgre_conn] = None
+
+    def __enter__(self):
+        """
+        Метод для контекстного менеджера.
+
+        Returns:
+            PostgreChangeListener
+        """
+        self.listen()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """
+        Метод для контекстного менеджера. Закрывает соединение слушателя.
+
+        Args:
+            exc_type: стандартная сигнатура запуска контекстного менеджера.
+            exc_val: стандартная сигнатура запуска контекстного менеджера.
+            exc_tb: стандартная сигнатура запуска контекстного менеджера.
+        """
+        self.close()
+
+    def listen(self):
+        """Метод открывает соединение и подписывается на канал уведомлений."""
+        self.close()
+        self._conn = self._pg_connector()
+        self._conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+
+        with self._conn.cursor() as cursor:
+            cursor.execute(sql.SQL('LISTEN {channel}').format(channel=sql.Identifier(self._channel)))
+
+        logger.info(f'Слушаем уведомления PostgreSQL в канале {self._channel}.')
+
+    def close(self):
+        """Метод закрывает соединение слушателя."""
+        if self._conn is not None and not self._conn.closed:
+            self._conn.close()
+        self._conn = None
+
+    def wait(self, timeout: float) -> Optional[Set[str]]:
+        """
+        Метод ждет уведомлений не дольше timeout секунд.
+
+        Args:
+            timeout: максимальное время ожидания в секундах.
+
+        Returns:
+            наименования измененных таблиц. Пустое множество - уведомлений не было.
+            None - соединение было потеряно, уведомления могли быть пропущены.
+        """
+        try:
+            tables = self._poll(timeout)
+
+            if tables and self._debounce_seconds:
+                deadline = monotonic() + self._debounce_seconds
+                while (remaining := deadline - monotonic()) > 0:
+                    tables |= self._poll(remaining)
+
+            return tables
+        except psycopg2.Error:
+            logger.warning('Соединение слушателя уведомлений потеряно. Переподключаемся.', exc_info=True)
+            self.listen()
+            return None
+
+    def _poll(self, timeout: float) -> Set[str]:
+        """
+        Метод ждет, пока соединение станет доступно для чтения, и забирает накопленные уведомления.
+
+        Args:
+            timeout: максимальное время ожидания в секундах.
+
+        Returns:
+            наименования измененных таблиц.
+        """
+        if not self._conn.notifies:
+            select.select([self._conn], [], [], timeout)
+            self._conn.poll()
+
+        tables = {notify.payload for notify in self._conn.notifies}
+        self._conn.notifies.clear()
+        return tables
+
+
+def get_process_types_for_tables(
+    tables: Iterable[str],
+    active_process_types: Iterable[ETLProcessType],
+) -> List[ETLProcessType]:
+    """
+    Функция возвращает активные ETL-процессы, которые зависят от измененных таблиц.
+
+    Args:
+        tables: наименования измененных таблиц.
+        active_process_types: типы процессов, которые выполняются в каждом цикле.
+
+    Returns:
+        список типов процессов в порядке active_process_types.
+    """
+    woken_process_types = {
+        process_type
+        for table in tables
+        for process_type in TABLE_PROCESS_TYPES.get(table, ())
+    }
+    return [process_type for process_type in active_process_types if process_type in woken_process_types]
@@ -0,0 +1,68 @@
+"""Модуль отвечает за асинхронную загрузку данных в Elasticsearch."""
+from typing import AsyncIterable, Optional
+
+from elasticsearch import AsyncElasticsearch
+from elasticsearch.helpers import async_streaming_bulk
+
+from config.settings import EsBulkSettings
+from services.logs.logs_setup import get_logger
+
+from .loaders import IGNORED_BULK_STATUSES
+
+logger = get_logger()
+
+
+class AsyncElasticsearchLoader:
+    """
+    Класс, отвечающий за асинхронную загрузку данных в Elasticsearch.
+
+    Принимает уже провалидированные bulk-действия: валидация выполняется отдельной стадией асинхронного
+    ETL-процесса.
+    """
+
+    def __init__(
+        self,
+        client: AsyncElasticsearch,
+        target_index: str,
+        bulk_settings: Optional[EsBulkSettings] = None,
+    ):
+        """
+        Инициализирующий метод.
+
+        Args:
+            client: асинхронный клиент Elasticsearch.
+            target_index: целевой индекс для загрузки.
+            bulk_settings: параметры bulk-загрузки для целевого индекса.
+        """
+        self._client = client
+        self._target_index = target_index
+        self._bulk_settings = bulk_settings or EsBulkSettings()
+
+    async def load(self, data_for_load: AsyncIterable[dict]) -> bool:
+        """
+        Метод позволяет загружать данные в целевой объект.
+
+        Args:
+            data_for_load: bulk-действия для загрузки.
+
+        Returns:
+            True - загрузка прошла успешно.
+
+        Raises:
+            BulkIndexError: Elasticsearch не принял часть документов.
+        """
+        logger.info('Загружаем данные в Elasticsearch.')
+        loaded_count = 0
+
+        async for is_success, _ in async_streaming_bulk(
+            self._client,
+            data_for_load,
+            index=self._target_index,
+            chunk_size=self._bulk_settings.chunk_size,
+            max_chunk_bytes=self._bulk_settings.max_chunk_bytes,
+            ignore_status=IGNORED_BULK_STATUSES,
+        ):
+            loaded_count += is_success
+
+        logger.info(f'Загрузили данные в Elasticsearch. Загружено документов: {loaded_count}.')
+        return True
@@ -0,0 +1,127 @@
+"""Модуль отвечает за подбор размера bulk-пачек по задержке Elasticsearch."""
+import threading
+from typing import Dict
+
+from config.settings import EsBulkSettings
+from services.logs.logs_setup import get_logger
+
+logger = get_logger()
+
+# Нижняя граница объема пачки и верхняя, с запасом до http.max_content_length Elasticsearch по умолчанию (100 МБ).
+MIN_CHUNK_BYTES = 64 * 1024
+MAX_CHUNK_BYTES = 90 * 1024 * 1024
+
+# Задержка в пределах LATENCY_TOLERANCE от целевой не меняет размер пачки.
+LATENCY_TOLERANCE = 0.2
+
+# За один запрос пачка растет не больше чем в MAX_GROWTH раз и уменьшается не больше чем в MAX_SHRINK раз.
+MAX_GROWTH = 1.25
+MAX_SHRINK = 0.5
+
+# Во сколько раз уменьшается пачка, если Elasticsearch отклонил документы из-за переполнения очереди записи.
+REJECTION_SHRINK = 0.5
+
+
+class AdaptiveChunkController:
+    """
+    Класс подбирает размер bulk-пачки так, чтобы bulk-запрос выполнялся за целевое время.
+
+    После каждого запроса размер пачки в документах и в байтах меняется пропорционально отношению целевой
+    задержки к измеренной: медленный запрос уменьшает пачку, быстрый - увеличивает. Если Elasticsearch
+    отклонил документы со статусом 429, очередь записи переполнена, и пачка уменьшается вдвое независимо
+    от задержки.
+
+    Контроллер общий для всех загрузчиков индекса, поэтому подобранный размер сохраняется между циклами ETL.
+    """
+
+    _controllers: Dict[str, 'AdaptiveChunkController'] = {}
+    _controllers_guard = threading.Lock()
+
+    def __init__(self, bulk_settings: EsBulkSettings):
+        """
+        Инициализирующий метод.
+
+        Args:
+            bulk_settings: параметры bulk-загрузки индекса.
+        """
+        self._target_latency_ms = bulk_settings.target_latency_ms
+        self._min_chunk_size = bulk_settings.min_chunk_size
+        self._max_chunk_size = bulk_settings.max_chunk_size
+        self._lock = threading.Lock()
+        self.chunk_size = self._clamp(bulk_settings.chunk_size, self._min_chunk_size, self._max_chunk_size)
+        self.max_chunk_bytes = self._clamp(bulk_settings.max_chunk_bytes, MIN_CHUNK_BYTES, MAX_CHUNK_BYTES)
+
+    @classmethod
+    def for_index(cls, index_name: str, bulk_settings: EsBulkSettings) -> 'AdaptiveChunkController':
+        """
+        Метод возвращает контроллер индекса, создавая его при первом обращении.
+
+        Args:
+            index_name: наименование индекса.
+            bulk_settings: параметры bulk-загрузки индекса.
+
+        Returns:
+            контроллер размера пачек.
+        """
+        with cls._controllers_guard:
+            return cls._controllers.setdefault(index_name, cls(bulk_settings))
+
+    def record(self, latency_ms: float, rejected_count: int = 0):
+        """
+        Метод учитывает результат bulk-запроса и пересчитывает размер пачки.
+
+        Args:
+            latency_ms: задержка bulk-запроса в миллисекундах.
+            rejected_count: количество документов, отклоненных со статусом 429.
+        """
+        with self._lock:
+            factor = self._get_factor(latency_ms, rejected_count)
+
+            if factor == 1:
+                return
+
+            self.chunk_size = self._clamp(
+                round(self.chunk_size * factor),
+                self._min_chunk_size,
+                self._max_chunk_size,
+            )
+            self.max_chunk_bytes = self._clamp(round(self.max_chunk_bytes * factor), MIN_CHUNK_BYTES, MAX_CHUNK_BYTES)
+
+        logger.debug(
+            f'Задержка bulk-запроса {latency_ms:.0f} мс, отклонено документов {rejected_count}. '
+            f'Новый размер пачки: {self.chunk_size} документов, {self.max_chunk_bytes} байт.',
+        )
+
+    def _get_factor(self, latency_ms: float, rejected_count: int) -> float:
+        """
+        Метод вычисляет, во сколько раз нужно изменить размер пачки.
+
+        Args:
+            latency_ms: задержка bulk-запроса в миллисекундах.
+            rejected_count: количество документов, отклоненных со статусом 429.
+
+        Returns:
+            множитель размера пачки.
+        """
+        if rejected_count:
+            return REJECTION_SHRINK
+
+        if abs(latency_ms - self._target_latency_ms) <= self._target_latency_ms * LATENCY_TOLERANCE:
+            return 1
+
+        return self._clamp(self._target_latency_ms / max(latency_ms, 1), MAX_SHRINK, MAX_GROWTH)
+
+    @staticmethod
+    def _clamp(value: float, min_value: float, max_value: float) -> float:
+        """
+        Метод ограничивает значение заданными пределами.
+
+        Args:
+            value: значение.
+            min_value: нижний предел.
+            max_value: верхний предел.
+
+        Returns:
+            значение в пределах.
+        """
+        return max(min_value, min(value, max_value))
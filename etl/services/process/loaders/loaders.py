@@ -1,16 +1,36 @@
 """Модуль отвечает за описание Загрузчиков данных в целевую базу."""
 
 from abc import ABC, abstractmethod
-from typing import Iterable
+from http import HTTPStatus
+from datetime import datetime, timezone
+from time import perf_counter, sleep
+from typing import Any, Dict, Generator, Iterable, List, Optional, Tuple
 
-from elasticsearch import Elasticsearch
-from elasticsearch.helpers import bulk
+from elasticsearch import ApiError, Elasticsearch
+from elasticsearch.helpers import BulkIndexError, bulk, expand_action, parallel_bulk, streaming_bulk
+from config.settings import EsBulkSettings, LoaderType, ES_DEAD_LETTER_FILE
 from services.logs.logs_setup import get_logger
+from services.storages.dead_letters import BaseDeadLetterStorage, FileDeadLetterStorage
 
+from .chunking import AdaptiveChunkController
 from ..validators.validators import ElasticsearchValidator
 
 logger = get_logger()
 
+# Удаление документа, которого уже нет в индексе, не считается ошибкой загрузки.
+IGNORED_BULK_STATUSES = (HTTPStatus.NOT_FOUND,)
+
+# Документы, отклоненные из-за переполнения очереди записи, отправляются повторно с паузой,
+# которая удваивается с каждой попыткой.
+BULK_MAX_RETRIES = 5
+BULK_INITIAL_BACKOFF_SECONDS = 1
+
+# Сколько записей о незагруженных документах копится перед записью в хранилище.
+DEAD_LETTER_BATCH_SIZE = 100
+
+# Сериализованная строка действия bulk-запроса и строка документа (None для удаления).
+BulkItem = Tuple[bytes, Optional[bytes]]
+
 
 class BaseLoader(ABC):
     """Базовый класс, отвечающий за загрузку данных в целевой объект."""
@@ -32,7 +52,13 @@ class BaseLoader(ABC):
 class ElasticsearchLoader(BaseLoader):
     """Класс, отвечающий за загрузку данных в Elasticsearch."""
 
-    def __init__(self, client: Elasticsearch, target_index: str, validator: ElasticsearchValidator):
+    def __init__(
+        self,
+        client: Elasticsearch,
+        target_index: str,
+        validator: ElasticsearchValidator,
+        bulk_settings: Optional[EsBulkSettings] = None,
+    ):
         """
         Инициализирующий метод.
 
@@ -40,10 +66,12 @@ class ElasticsearchLoader(BaseLoader):
             client: клиент Elasticsearch.
             target_index: целевой индекс для загрузки.
             validator: валидатор загружаемых данных.
+            bulk_settings: параметры bulk-загрузки для целевого индекса.
         """
         self._client = client
         self._validator = validator
         self._target_index = target_index
+        self._bulk_settings = bulk_settings or EsBulkSettings()
 
     def load(self, data_for_load: Iterable[dict]) -> bool:
         """
@@ -57,6 +85,386 @@ class ElasticsearchLoader(BaseLoader):
         """
         logger.info('Загружаем данные в Elasticsearch.')
         valid_data = self._validator.get_valid_data(data_for_load)
-        bulk(self._client, valid_data, index=self._target_index)
+        bulk(
+            self._client,
+            valid_data,
+            index=self._target_index,
+            chunk_size=self._bulk_settings.chunk_size,
+            max_chunk_bytes=self._bulk_settings.max_chunk_bytes,
+            ignore_status=IGNORED_BULK_STATUSES,
+        )
         logger.info('Загрузили данные в Elasticsearch.')
         return True
+
+
+class ParallelElasticsearchLoader(ElasticsearchLoader):
+    """
+    Класс, отвечающий за загрузку данных в Elasticsearch несколькими параллельными bulk-запросами.
+
+    Пачки отправляются пулом из thread_count потоков. Данные для загрузки читаются пулом в отдельном потоке,
+    поэтому извлечение данных из источника идет одновременно с индексацией уже сформированных пачек.
+    """
+
+    def load(self, data_for_load: Iterable[dict]) -> bool:
+        """
+        Метод позволяет загружать данные в целевой объект.
+
+        Args:
+            data_for_load: данные для загрузки.
+
+        Returns:
+            True - загрузка прошла успешно, False - загрузка завершилась с ошибками.
+        """
+        logger.info(
+            f'Загружаем данные в Elasticsearch в {self._bulk_settings.thread_count} потоков.',
+        )
+        valid_data = self._validator.get_valid_data(data_for_load)
+        loaded_count = 0
+
+        for is_success, _ in parallel_bulk(
+            self._client,
+            valid_data,
+            index=self._target_index,
+            thread_count=self._bulk_settings.thread_count,
+            chunk_size=self._bulk_settings.chunk_size,
+            max_chunk_bytes=self._bulk_settings.max_chunk_bytes,
+            queue_size=self._bulk_settings.queue_size,
+            ignore_status=IGNORED_BULK_STATUSES,
+        ):
+            loaded_count += is_success
+
+        logger.info(f'Загрузили данные в Elasticsearch. Загружено документов: {loaded_count}.')
+        return True
+
+
+class AdaptiveElasticsearchLoader(ElasticsearchLoader):
+    """
+    Класс, отвечающий за загрузку данных в Elasticsearch пачками, размер которых подбирается по задержке.
+
+    Размер каждой пачки в документах и в байтах задает AdaptiveChunkController индекса. После bulk-запроса
+    контроллер получает его задержку и количество документов, отклоненных со статусом 429, и пересчитывает
+    размер следующей пачки. Отклоненные документы отправляются повторно.
+    """
+
+    def __init__(
+        self,
+        client: Elasticsearch,
+        target_index: str,
+        validator: ElasticsearchValidator,
+        bulk_settings: Optional[EsBulkSettings] = None,
+    ):
+        """
+        Инициализирующий метод.
+
+        Args:
+            client: клиент Elasticsearch.
+            target_index: целевой индекс для загрузки.
+            validator: валидатор загружаемых данных.
+            bulk_settings: параметры bulk-загрузки для целевого индекса.
+        """
+        super().__init__(client, target_index, validator, bulk_settings)
+        self._controller = AdaptiveChunkController.for_index(target_index, self._bulk_settings)
+        self._serializer = client.transport.serializers.get_serializer('application/json')
+
+    def load(self, data_for_load: Iterable[dict]) -> bool:
+        """
+        Метод позволяет загружать данные в целевой объект.
+
+        Args:
+            data_for_load: данные для загрузки.
+
+        Returns:
+            True - загрузка прошла успешно, False - загрузка завершилась с ошибками.
+        """
+        logger.info('Загружаем данные в Elasticsearch пачками адаптивного размера.')
+        valid_data = self._validator.get_valid_data(data_for_load)
+        loaded_count = 0
+
+        for chunk in self._get_chunks(valid_data):
+            self._send_chunk(chunk)
+            loaded_count += len(chunk)
+
+        logger.info(
+            f'Загрузили данные в Elasticsearch. Загружено документов: {loaded_count}. '
+            f'Размер пачки: {self._controller.chunk_size} документов, {self._controller.max_chunk_bytes} байт.',
+        )
+        return True
+
+    def _get_chunks(self, actions: Iterable[dict]) -> Generator[List[BulkItem], None, None]:
+        """
+        Метод делит действия на пачки по текущему размеру пачки контроллера.
+
+        Пачки формируются лениво, поэтому каждая следующая пачка учитывает результат предыдущего запроса.
+
+        Args:
+            actions: действия bulk-загрузки.
+
+        Yields:
+            пачка сериализованных действий.
+        """
+        chunk: List[BulkItem] = []
+        chunk_bytes = 0
+
+        for action in actions:
+            item = self._serialize(action)
+            item_bytes = sum(len(line) + 1 for line in item if line is not None)
+
+            if chunk and chunk_bytes + item_bytes > self._controller.max_chunk_bytes:
+                yield chunk
+                chunk, chunk_bytes = [], 0
+
+            chunk.append(item)
+            chunk_bytes += item_bytes
+
+            if len(chunk) >= self._controller.chunk_size:
+                yield chunk
+                chunk, chunk_bytes = [], 0
+
+        if chunk:
+            yield chunk
+
+    def _serialize(self, action: dict) -> BulkItem:
+        """
+        Метод сериализует действие bulk-загрузки так же, как это делает bulk из elasticsearch.helpers.
+
+        Args:
+            action: действие bulk-загрузки.
+
+        Returns:
+            строка действия и строка документа.
+        """
+        action_line, source = expand_action(action)
+        action_line = self._serializer.dumps(action_line)
+
+        if source is None or isinstance(source, bytes):
+            return action_line, source
+
+        if isinstance(source, str):
+            return action_line, source.encode()
+
+        return action_line, self._serializer.dumps(source)
+
+    def _send_chunk(self, chunk: List[BulkItem]):
+        """
+        Метод отправляет пачку bulk-запросом и повторяет отправку документов, отклоненных со статусом 429.
+
+        Args:
+            chunk: пачка сериализованных действий.
+
+        Raises:
+            BulkIndexError: документы не загружены.
+        """
+        pending = chunk
+
+        for attempt in range(BULK_MAX_RETRIES + 1):
+            if attempt:
+                sleep(BULK_INITIAL_BACKOFF_SECONDS * 2 ** (attempt - 1))
+
+            pending = self._send_bulk(pending)
+
+            if not pending:
+                return
+
+        raise BulkIndexError(f'Elasticsearch отклонил документов после повторных попыток: {len(pending)}.', [])
+
+    def _send_bulk(self, chunk: List[BulkItem]) -> List[BulkItem]:
+        """
+        Метод выполняет один bulk-запрос и передает его результат контроллеру.
+
+        Args:
+            chunk: пачка сериализованных действий.
+
+        Returns:
+            действия, отклоненные со статусом 429.
+
+        Raises:
+            BulkIndexError: документы не загружены по причине, отличной от переполнения очереди.
+        """
+        operations = [line for item in chunk for line in item if line is not None]
+        started = perf_counter()
+
+        try:
+            response = self._client.bulk(operations=operations, index=self._target_index)
+        except ApiError as error:
+            if error.status_code != HTTPStatus.TOO_MANY_REQUESTS:
+                raise
+
+            self._controller.record((perf_counter() - started) * 1000, len(chunk))
+            return chunk
+
+        latency_ms = (perf_counter() - started) * 1000
+        rejected = []
+        errors = []
+
+        for item, item_result in zip(chunk, response['items']):
+            status = next(iter(item_result.values()))['status']
+
+            if status == HTTPStatus.TOO_MANY_REQUESTS:
+                rejected.append(item)
+            elif status >= HTTPStatus.MULTIPLE_CHOICES and status not in IGNORED_BULK_STATUSES:
+                errors.append(item_result)
+
+        self._controller.record(latency_ms, len(rejected))
+        took_ms = response['took']
+        logger.debug(f'Bulk-запрос: {len(chunk)} документов, took {took_ms} мс, задержка {latency_ms:.0f} мс.')
+
+        if errors:
+            raise BulkIndexError(f'Не загружено документов: {len(errors)}.', errors)
+
+        return rejected
+
+
+class DeadLetterElasticsearchLoader(ElasticsearchLoader):
+    """
+    Класс, отвечающий за загрузку данных в Elasticsearch с обработкой ошибок по каждому документу.
+
+    Документы, отклоненные со статусом 429, отправляются повторно с паузой. Документы, которые Elasticsearch
+    отклонил окончательно, сохраняются в хранилище незагруженных документов (dead letters), и загрузка
+    считается успешной. Поэтому один некорректный документ не мешает сохранить состояние процесса и не
+    заставляет заново выгружать всю пачку в каждом цикле. Ошибки соединения с Elasticsearch по-прежнему
+    прерывают загрузку.
+    """
+
+    def __init__(
+        self,
+        client: Elasticsearch,
+        target_index: str,
+        validator: ElasticsearchValidator,
+        bulk_settings: Optional[EsBulkSettings] = None,
+        dead_letters: Optional[BaseDeadLetterStorage] = None,
+    ):
+        """
+        Инициализирующий метод.
+
+        Args:
+            client: клиент Elasticsearch.
+            target_index: целевой индекс для загрузки.
+            validator: валидатор загружаемых данных.
+            bulk_settings: параметры bulk-загрузки для целевого индекса.
+            dead_letters: хранилище незагруженных документов. По умолчанию - файл ES_DEAD_LETTER_FILE.
+        """
+        super().__init__(client, target_index, validator, bulk_settings)
+        self._dead_letters = dead_letters or FileDeadLetterStorage(ES_DEAD_LETTER_FILE)
+
+    def load(self, data_for_load: Iterable[dict]) -> bool:
+        """
+        Метод позволяет загружать данные в целевой объект.
+
+        Args:
+            data_for_load: данные для загрузки.
+
+        Returns:
+            True - загрузка прошла успешно, False - загрузка завершилась с ошибками.
+        """
+        logger.info('Загружаем данные в Elasticsearch с обработкой ошибок по документам.')
+        pending_actions: Dict[str, dict] = {}
+        dead_letters: List[Dict[str, Any]] = []
+        loaded_count = 0
+        failed_count = 0
+
+        for is_success, result in streaming_bulk(
+            self._client,
+            self._track_actions(self._validator.get_valid_data(data_for_load), pending_actions),
+            index=self._target_index,
+            chunk_size=self._bulk_settings.chunk_size,
+            max_chunk_bytes=self._bulk_settings.max_chunk_bytes,
+            max_retries=BULK_MAX_RETRIES,
+            initial_backoff=BULK_INITIAL_BACKOFF_SECONDS,
+            raise_on_error=False,
+            ignore_status=IGNORED_BULK_STATUSES,
+        ):
+            op_type, item_result = next(iter(result.items()))
+            action = pending_actions.pop(str(item_result.get('_id')), None)
+
+            if is_success or item_result.get('status') in IGNORED_BULK_STATUSES:
+                loaded_count += 1
+                continue
+
+            failed_count += 1
+            dead_letters.append(self._get_dead_letter(op_type, item_result, action))
+
+            if len(dead_letters) >= DEAD_LETTER_BATCH_SIZE:
+                self._dead_letters.put_many(dead_letters)
+                dead_letters = []
+
+        self._dead_letters.put_many(dead_letters)
+
+        if failed_count:
+            logger.warning(
+                f'Не загружено в {self._target_index} документов: {failed_count}. Они сохранены в dead letters.',
+            )
+
+        logger.info(f'Загрузили данные в Elasticsearch. Загружено документов: {loaded_count}.')
+        return True
+
+    @staticmethod
+    def _track_actions(actions: Iterable[dict], pending_actions: Dict[str, dict]) -> Generator[dict, None, None]:
+        """
+        Метод запоминает отправляемые действия, чтобы сохранить документ, если его не удастся загрузить.
+
+        Результаты bulk-запроса не содержат исходных документов, а повторно отправленные документы
+        возвращаются не по порядку, поэтому действия сопоставляются с результатами по _id.
+
+        Args:
+            actions: действия bulk-загрузки.
+            pending_actions: действия, результат которых еще не получен, по _id.
+
+        Yields:
+            действия bulk-загрузки.
+        """
+        for action in actions:
+            pending_actions[str(action.get('_id'))] = action
+            yield action
+
+    def _get_dead_letter(self, op_type: str, item_result: Dict[str, Any], action: Optional[dict]) -> Dict[str, Any]:
+        """
+        Метод формирует запись о незагруженном документе.
+
+        Args:
+            op_type: операция bulk-запроса.
+            item_result: результат операции.
+            action: исходное действие bulk-загрузки.
+
+        Returns:
+            запись о незагруженном документе.
+        """
+        return {
+            'index': self._target_index,
+            'op_type': op_type,
+            'id': item_result.get('_id'),
+            'status': item_result.get('status'),
+            'error': item_result.get('error'),
+            'action': action,
+            'failed_at': datetime.now(timezone.utc).isoformat(),
+        }
+
+
+class ElasticsearchLoaderFactory:
+    """Фабрика классов для загрузчиков данных в Elasticsearch."""
+
+    loaders = {
+        LoaderType.SERIAL: ElasticsearchLoader,
+        LoaderType.PARALLEL: ParallelElasticsearchLoader,
+        LoaderType.ADAPTIVE: AdaptiveElasticsearchLoader,
+        LoaderType.DEAD_LETTER: DeadLetterElasticsearchLoader,
+    }
+
+    @staticmethod
+    def loader_by_type(loader_type: LoaderType, *args, **kwargs) -> ElasticsearchLoader:
+        """
+        Метод возвращает инстанс загрузчика по заданному типу.
+
+        Args:
+            loader_type: тип загрузчика.
+            args: позиционные аргументы.
+            kwargs: именнованные аргументы.
+
+        Returns:
+            loader (ElasticsearchLoader): загрузчик.
+        """
+        try:
+            loader_class = ElasticsearchLoaderFactory.loaders[loader_type]
+            return loader_class(*args, **kwargs)
+        except KeyError as error:
+            logger.error(f'Для типа {loader_type} не существует реализации загрузчика.', exc_info=True)
+            raise error
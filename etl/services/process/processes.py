@@ -1,16 +1,18 @@
 """Модуль отвечает за основной процесс по выгрузке данных из источника и загрузке данных в целевой объект."""
 from dataclasses import dataclass
 from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
 
-from config.settings import ETLProcessType, PROCESS_IS_STARTED_STATE, MODIFIED_STATE, DATETIME_FORMAT
+from config.settings import ETLProcessType, PROCESS_LOCK_PREFIX, DATETIME_FORMAT, ETL_LOCK_WAIT_SECONDS
 
 from .extractors.extractors import BaseExtractor
 from .loaders.loaders import BaseLoader
 from .extractors.adapters import BaseExtractorAdapter
 from .exceptions import AnotherProcessIsStartedError
-from ..decorators.resiliency import backoff
+from ..metrics.memory import peak_rss_metric
 from ..storages.key_value_storages import KeyValueStorage
 from ..storages.key_value_decorators import BaseKeyValueDecorator
+from ..storages.locks import BaseLock, LocalLock
 from ..logs.logs_setup import get_logger
 
 logger = get_logger()
@@ -24,6 +26,9 @@ class ETLProcessParameters:
     state_storage: KeyValueStorage | BaseKeyValueDecorator
     extractor: BaseExtractor | BaseExtractorAdapter
     loader: BaseLoader
+    is_batched: bool = False
+    lock: Optional[BaseLock] = None
+    state_names: Tuple[str, ...] = ()
 
 
 class ETLProcess:
@@ -41,7 +46,11 @@ class ETLProcess:
         state_storage (Хранилище состояний, из него берем состояния для процесса),
         extractor (Извлекатель данных, может быть передан обернутым в адаптер, если такой есть. Это нужно
         для того, чтобы подогнать данные под loader),
-        loader (Загрузчик данных в целевую систему.).
+        loader (Загрузчик данных в целевую систему.),
+        is_batched (Данные загружаются пачками, состояние сохраняется после каждой пачки.),
+        lock (Блокировка процесса. Процессы с одинаковой блокировкой не выполняются одновременно.
+        По умолчанию - блокировка в рамках текущего процесса Python.),
+        state_names (Состояния процесса. Они перечитываются из хранилища после взятия блокировки.).
 
         Args:
             etl_params: параметры ETL процесса.
@@ -50,14 +59,16 @@ class ETLProcess:
         self._state_storage = etl_params.state_storage
         self._extractor = etl_params.extractor
         self._loader = etl_params.loader
+        self._is_batched = etl_params.is_batched
+        self._lock = etl_params.lock or LocalLock(PROCESS_LOCK_PREFIX)
+        self._state_names = etl_params.state_names
 
-    @backoff()
     def __enter__(self):
         """
         Метод для контекстного менеджера.
 
         Блокирует работу для других процессов, пока этот процесс не завершится.
-        Если есть другие запущенные процессы, то уйдет в ожидание до тех пор, пока другой процесс не завершится.
+        Если блокировку держит другой процесс, ждет ее не дольше ETL_LOCK_WAIT_SECONDS.
 
         Returns:
             ETLProcess
@@ -86,14 +97,11 @@ class ETLProcess:
             True - процесс завершен успешно, иначе - False.
         """
         try:
-            data_for_load = self._extractor.extract()
-            is_success_load = self._loader.load(data_for_load)
+            with peak_rss_metric(self._process_type):
+                if self._is_batched:
+                    return self._load_batches()
 
-            if is_success_load:
-                self._remember_last_modified_state()
-                return True
-
-            return False
+                return self._load()
         except Exception:
             logger.error(
                 f'Во время выполнения ETL-процесса {self._process_type} произошла непредвиденная ошибка.',
@@ -101,71 +109,117 @@ class ETLProcess:
             )
             return False
 
-    def block_process_state(self):
+    def _load(self) -> bool:
         """
-        Метод блокирует выполнение для других процессов в случае, если оно уже не заблокировано.
+        Метод извлекает данные, загружает их в целевую систему и запоминает новое состояние.
 
-        Raise:
-            AnotherProcessIsStartedError
+        Returns:
+            True - загрузка завершена успешно, иначе - False.
         """
-        if self._is_another_process_started():
-            raise AnotherProcessIsStartedError(self._process_type)
+        data_for_load = self._extractor.extract()
+        is_success_load = self._loader.load(data_for_load)
 
-        logger.info(f'Процесс {self._process_type} заблокировал работу для других процессов.')
-        self._toggle_process(True)
+        if is_success_load:
+            self._remember_last_modified_state()
+            self._extractor.acknowledge()
 
-    def open_process_state(self):
-        """Разблокирует выполнение для других процессов."""
-        logger.info(f'Процесс {self._process_type} завершился. Другие процессы могут начать выполнение.')
-        self._toggle_process(False)
+        return is_success_load
 
-    def _is_another_process_started(self) -> bool:
+    def _load_batches(self) -> bool:
         """
-        Метод проверяет, не запущен ли другой процесс.
+        Метод загружает данные пачками, пока источник не вернет пустую пачку.
 
-        Проверка происходит на основе состояния PROCESS_IS_STARTED_STATE.
+        Состояние сохраняется после того, как каждая пачка принята целевой системой. При падении процесса
+        повторно будет загружена только последняя незавершенная пачка.
 
         Returns:
-            True - другие процессы сейчас запущены. False - другие процессы не запущены.
+            True - все пачки загружены успешно, иначе - False.
         """
-        is_started = self._state_storage.get_value(PROCESS_IS_STARTED_STATE)
+        previous_states = None
 
-        try:
-            is_started = bool(int(is_started))
-        except (ValueError, TypeError):
-            logger.info('Непонятное значение в хранилище состояний. Думаем, что другие процессы не стартавали.')
-            is_started = False
+        while True:
+            if not self._load():
+                return False
+
+            if not self._lock.is_held:
+                logger.error(f'Процесс {self._process_type} потерял блокировку {self._lock.name} и остановлен.')
+                return False
+
+            if not self._extractor.extracted_count:
+                return True
+
+            current_states = self._extractor.last_states
+            if current_states and current_states == previous_states:
+                logger.warning(f'Состояние процесса {self._process_type} не изменилось после загрузки пачки.')
+                return True
 
-        return is_started
+            previous_states = current_states
 
-    def _toggle_process(self, is_started: bool):
+    def block_process_state(self):
         """
-        Метод переключает состояние процесса с помозью хранилища состояний.
+        Метод блокирует выполнение для других процессов в случае, если оно уже не заблокировано.
 
-        Args:
-            is_started: True - процесс запущен, False - процесс завершен.
+        После взятия блокировки состояния процесса перечитываются из хранилища: пока блокировку держала
+        другая реплика, она могла сохранить более новые состояния, чем загруженные в начале цикла.
+
+        Raise:
+            AnotherProcessIsStartedError
         """
-        self._state_storage.set_value(PROCESS_IS_STARTED_STATE, int(is_started))
+        if not self._lock.acquire(ETL_LOCK_WAIT_SECONDS):
+            raise AnotherProcessIsStartedError(self._process_type)
+
+        self._state_storage.refresh(*self._state_names)
+
+        logger.info(f'Процесс {self._process_type} заблокировал работу для других процессов ({self._lock.name}).')
+
+    def open_process_state(self):
+        """Разблокирует выполнение для других процессов."""
+        logger.info(f'Процесс {self._process_type} завершился. Другие процессы могут начать выполнение.')
+        self._lock.release()
 
     def _remember_last_modified_state(self):
         """
-        Метод устанавливает новое значение для modified_state запущенного процесса.
+        Метод устанавливает новые значения состояний запущенного процесса.
 
         Если данные из loader действительно использовались и мы что-то загрузили, то запишем состояние.
         """
-        modified_state = self._extractor.last_modified_state
-        modified_state_name = MODIFIED_STATE.get(self._process_type)
-
-        if modified_state:
-            try:
-                new_value = datetime.strftime(modified_state, DATETIME_FORMAT)
-            except TypeError as error:
-                logger.error(f'Не удалось сохранить состояние {modified_state_name} со значением {modified_state}')
-                raise error
-            self._state_storage.set_value(modified_state_name, new_value)
-            logger.info(f'Для состояния {modified_state_name} установлено новое значение {new_value}')
-        else:
+        last_states = self._extractor.last_states
+
+        if not last_states:
             logger.info(f"""
             Данных нет, или они не использовались для загрузки.
-            Не требуется установка нового значения состояния {modified_state_name}
+            Не требуется установка новых значений состояний для процесса {self._process_type}
             """)
+            return
+
+        formatted_states = self._format_states(last_states)
+        self._state_storage.set_many(formatted_states)
+
+        for state_name, state_value in formatted_states.items():
+            logger.info(f'Для состояния {state_name} установлено новое значение {state_value}')
+
+    @staticmethod
+    def _format_states(states: Dict[str, Any]) -> Dict[str, str]:
+        """
+        Метод приводит значения состояний к виду, в котором они хранятся в хранилище состояний.
+
+        Пустые значения пропускаются: для них состояние не меняется.
+
+        Args:
+            states: словарь состояний.
+
+        Returns:
+            словарь состояний со строковыми значениями.
+        """
+        formatted_states = {}
+
+        for state_name, state_value in states.items():
+            if state_value is None:
+                continue
+
+            if isinstance(state_value, datetime):
+                state_value = datetime.strftime(state_value, DATETIME_FORMAT)
+
+            formatted_states[state_name] = str(state_value)
+
+        return formatted_states
@@ -46,7 +46,7 @@ MOVIE_BASE_QUERY = """
                )
            ) FILTER (WHERE p.id IS NOT NULL AND pfw.role = 'director'),
            '[]'
-        ) as directors,
+        ) as directors
         {modified_state_field}
     FROM content.film_work fw
     LEFT JOIN content.person_film_work pfw ON pfw.film_work_id = fw.id
@@ -56,6 +56,7 @@ MOVIE_BASE_QUERY = """
     {where_condition}
     GROUP BY fw.id, fw.modified
     {order_by}
+    {limit}
 """
 
 PERSON_CREATED_LINK_QUERY = """
@@ -136,3 +137,130 @@ GENRE_MODIFIED_QUERY = """
     {where_condition}
     ORDER BY g.modified
 """
+
+OUTBOX_BATCH_QUERY = """
+    SELECT
+        o.id
+    FROM
+        content.etl_outbox o
+    ORDER BY
+        o.id
+    LIMIT %(limit)s
+    FOR UPDATE SKIP LOCKED
+"""
+
+OUTBOX_FILM_IDS_CTE = """
+    WITH outbox AS (
+        SELECT
+            o.entity,
+            o.entity_id
+        FROM
+            content.etl_outbox o
+        WHERE
+            o.id = ANY(%(outbox_ids)s)
+    )
+    , film_ids AS (
+        SELECT
+            o.entity_id id
+        FROM
+            outbox o
+        WHERE
+            o.entity IN ('film_work', 'genre_film_work', 'person_film_work')
+        UNION
+        SELECT
+            gfw.film_work_id
+        FROM
+            content.genre_film_work gfw
+        INNER JOIN
+            outbox o
+        ON
+            o.entity = 'genre' AND o.entity_id = gfw.genre_id
+        UNION
+        SELECT
+            pfw.film_work_id
+        FROM
+            content.person_film_work pfw
+        INNER JOIN
+            outbox o
+        ON
+            o.entity = 'person' AND o.entity_id = pfw.person_id
+    )
+"""
+
+OUTBOX_DELETED_FILMS_QUERY = """
+    {cte}
+    SELECT
+        fi.id
+    FROM
+        film_ids fi
+    WHERE
+        NOT EXISTS (SELECT 1 FROM content.film_work fw WHERE fw.id = fi.id)
+"""
+
+OUTBOX_DRAIN_QUERY = """
+    DELETE FROM content.etl_outbox o WHERE o.id = ANY(%(outbox_ids)s)
+"""
+
+# Для удаленного фильма в таблице остается запись без документа, по ней формируется операция удаления.
+MOVIE_DOCUMENT_QUERY = """
+    SELECT
+        d.id,
+        {document_columns},
+        CASE WHEN d.document IS NULL THEN 'delete' END _op_type,
+        {modified_state_field}
+    FROM
+        content.film_work_document d
+    {where_condition}
+    ORDER BY d.modified, d.id
+    {limit}
+"""
+
+MOVIE_DOCUMENT_FIELDS = (
+    'imdb_rating',
+    'genres',
+    'title',
+    'description',
+    'persons',
+    'directors_names',
+    'actors_names',
+    'writers_names',
+    'actors',
+    'writers',
+    'directors',
+)
+
+OUTBOX_TABLE_EXISTS_QUERY = """
+    SELECT to_regclass('content.etl_outbox_consumer') IS NOT NULL
+"""
+
+OUTBOX_REGISTER_CONSUMER_QUERY = """
+    INSERT INTO content.etl_outbox_consumer (name) VALUES (%(name)s) ON CONFLICT (name) DO NOTHING
+"""
+
+OUTBOX_UNREGISTER_CONSUMER_QUERY = """
+    DELETE FROM content.etl_outbox_consumer WHERE name = %(name)s
+"""
+
+OUTBOX_CLEAR_QUERY = """
+    DELETE FROM content.etl_outbox o
+    WHERE NOT EXISTS (SELECT 1 FROM content.etl_outbox_consumer)
+"""
+
+JSON_DOCUMENT_QUERY = """
+    SELECT
+        d.id,
+        {document} document
+        {state_columns}
+    FROM (
+        {query}
+    ) d
+"""
+
+# Формат csv с управляющими символами в качестве разделителя и кавычки: JSON-текст документа не содержит
+# таких символов в неэкранированном виде, поэтому строки COPY приходят без экранирования, как есть.
+COPY_DOCUMENT_QUERY = """
+    COPY (
+        SELECT c.id, c.document{state_columns}
+        FROM ({query}) c
+    ) TO STDOUT WITH (FORMAT csv, DELIMITER E'\\x02', QUOTE E'\\x01')
+"""
@@ -0,0 +1,145 @@
+"""Модуль отвечает за выполнение запросов ETL как подготовленных (prepared) запросов PostgreSQL."""
+import re
+from functools import partial
+from hashlib import md5
+from typing import Any, Dict, List, Optional, Set, Tuple
+from weakref import WeakKeyDictionary
+
+from psycopg2.extensions import connection as postgre_conn, cursor as postgre_cursor
+
+from services.logs.logs_setup import get_logger
+
+logger = get_logger()
+
+PARAM_PATTERN = re.compile(r'%\((\w+)\)s|%%')
+
+STATEMENT_PREFIX = 'etl_'
+
+
+def to_positional_sql(sql: str) -> Tuple[str, List[str]]:
+    """
+    Функция переводит SQL с именованными параметрами psycopg2 в SQL с позиционными параметрами PostgreSQL.
+
+    %(name)s заменяется на $n, где n - порядковый номер параметра по первому упоминанию. %% заменяется на %.
+
+    Args:
+        sql: sql-запрос с параметрами вида %(name)s.
+
+    Returns:
+        sql-запрос с параметрами вида $n и наименования параметров в порядке их номеров.
+    """
+    param_names = list(dict.fromkeys(name for name in PARAM_PATTERN.findall(sql) if name))
+    return PARAM_PATTERN.sub(partial(_replace_param, param_names), sql), param_names
+
+
+def _replace_param(param_names: List[str], match: re.Match) -> str:
+    """
+    Функция возвращает замену для одного совпадения PARAM_PATTERN.
+
+    Args:
+        param_names: наименования параметров в порядке их номеров.
+        match: совпадение.
+
+    Returns:
+        позиционный параметр или знак %.
+    """
+    param_name = match.group(1)
+
+    if param_name is None:
+        return '%'
+
+    return f'${param_names.index(param_name) + 1}'
+
+
+def get_statement_name(sql: str) -> str:
+    """
+    Функция возвращает имя подготовленного запроса.
+
+    Имя зависит только от текста запроса, поэтому одинаковые запросы разных циклов используют один план.
+
+    Args:
+        sql: sql-запрос.
+
+    Returns:
+        имя подготовленного запроса.
+    """
+    return f'{STATEMENT_PREFIX}{md5(sql.encode()).hexdigest()}'
+
+
+class PreparedStatements:
+    """
+    Класс выполняет запросы через PREPARE/EXECUTE на заданном соединении.
+
+    Подготовленные запросы живут до закрытия сессии PostgreSQL и не отменяются откатом транзакции.
+    Поэтому список подготовленных запросов хранится для каждого соединения, пока соединение существует.
+    """
+
+    _prepared: 'WeakKeyDictionary[postgre_conn, Set[str]]' = WeakKeyDictionary()
+
+    def __init__(self, connection: postgre_conn):
+        """
+        Инициализирующий метод.
+
+        Args:
+            connection: соединение с PostgreSQL.
+        """
+        self._conn = connection
+
+    def execute(self, cursor: postgre_cursor, sql: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Метод выполняет запрос как подготовленный запрос.
+
+        При первом выполнении на соединении запрос подготавливается командой PREPARE.
+
+        Args:
+            cursor: курсор соединения.
+            sql: sql-запрос с параметрами вида %(name)s.
+            params: параметры sql-запроса.
+
+        Returns:
+            имя подготовленного запроса.
+        """
+        statement_name = self.prepare(cursor, sql)
+        _, param_names = to_positional_sql(sql)
+        cursor.execute(self.get_execute_sql(statement_name, param_names), params)
+        return statement_name
+
+    def prepare(self, cursor: postgre_cursor, sql: str) -> str:
+        """
+        Метод подготавливает запрос, если он еще не подготовлен на соединении.
+
+        Args:
+            cursor: курсор соединения.
+            sql: sql-запрос с параметрами вида %(name)s.
+
+        Returns:
+            имя подготовленного запроса.
+        """
+        statement_name = get_statement_name(sql)
+        prepared = self._prepared.setdefault(self._conn, set())
+
+        if statement_name not in prepared:
+            positional_sql, _ = to_positional_sql(sql)
+            cursor.execute(f'PREPARE {statement_name} AS {positional_sql}')
+            prepared.add(statement_name)
+            logger.info(f'Подготовлен запрос {statement_name}.')
+
+        return statement_name
+
+    @staticmethod
+    def get_execute_sql(statement_name: str, param_names: List[str]) -> str:
+        """
+        Метод возвращает команду EXECUTE для подготовленного запроса.
+
+        Args:
+            statement_name: имя подготовленного запроса.
+            param_names: наименования параметров в порядке их номеров.
+
+        Returns:
+            sql-команда с параметрами вида %(name)s.
+        """
+        if not param_names:
+            return f'EXECUTE {statement_name}'
+
+        args = ', '.join(f'%({param_name})s' for param_name in param_names)
+        return f'EXECUTE {statement_name} ({args})'
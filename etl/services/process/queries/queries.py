@@ -1,33 +1,93 @@
 """Модуль отвечает за описание запросов для ETL-процесса."""
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
-from config.settings import ETLProcessType, QueryType, MODIFIED_STATE
+from config.settings import (
+    ETLProcessType, QueryType, Shard, MODIFIED_STATE, MODIFIED_STATE_ID, DB_BATCH_SIZE, get_shard_state_name,
+)
 from services.storages.key_value_storages import KeyValueStorage
 from services.logs.logs_setup import get_logger
 from .pg_templates import (
     MOVIE_BASE_QUERY, GENRE_CREATED_LINK_QUERY, PERSON_CREATED_LINK_QUERY,
-    GENRE_MODIFIED_QUERY, PERSON_MODIFIED_QUERY,
+    GENRE_MODIFIED_QUERY, PERSON_MODIFIED_QUERY, OUTBOX_BATCH_QUERY, OUTBOX_FILM_IDS_CTE,
+    OUTBOX_DELETED_FILMS_QUERY, OUTBOX_DRAIN_QUERY, JSON_DOCUMENT_QUERY, MOVIE_DOCUMENT_QUERY, MOVIE_DOCUMENT_FIELDS,
 )
 
 logger = get_logger()
 
+MIN_UUID = '00000000-0000-0000-0000-000000000000'
+
+MIN_TIMESTAMP = '-infinity'
+
 
 class BaseETLQuery(ABC):
-    """Базовый класс, для генерации запросов для ETL-процесса."""
+    """
+    Базовый класс, для генерации запросов для ETL-процесса.
+
+    Attributes:
+        supports_batches (bool): True - запрос умеет выбирать данные пачками с помощью keyset-пагинации.
+    """
+
+    supports_batches = False
 
-    def __init__(self, process_type: ETLProcessType, state_storage: KeyValueStorage):
+    def __init__(
+        self,
+        process_type: ETLProcessType,
+        state_storage: KeyValueStorage,
+        batch_size: Optional[int] = None,
+        shard: Optional[Shard] = None,
+    ):
         """
         Инициализирующий метод.
 
         Args:
             process_type: Тип ETL-процесса
             state_storage: хранилище состояний для определения modified_state
+            batch_size: размер пачки. Учитывается только запросами, которые поддерживают пакетный режим.
+            shard: шард фильмов. У каждого шарда свои состояния в хранилище.
         """
         self._process_type = process_type
         self._state_storage = state_storage
-        self._modified_state_name = MODIFIED_STATE.get(self._process_type)
+        self._shard = shard
+        self._modified_state_name = self._get_state_name(MODIFIED_STATE.get(self._process_type))
+        self._modified_state_id_name = self._get_state_name(MODIFIED_STATE_ID.get(self._process_type))
+        self._batch_size = batch_size if self.supports_batches else None
+
+    @property
+    def is_batched(self) -> bool:
+        """
+        Свойство показывает, выбирает ли запрос данные пачками.
+
+        Returns:
+            True - запрос возвращает одну пачку данных, начиная с сохраненного состояния.
+        """
+        return self._batch_size is not None
+
+    @property
+    def state_fields(self) -> Dict[str, str]:
+        """
+        Свойство описывает, какие поля выборки нужно сохранить в хранилище состояний после загрузки.
+
+        Returns:
+            словарь, где ключ - наименование состояния, значение - наименование поля в выборке.
+        """
+        state_fields = {self._modified_state_name: 'modified_state'}
+
+        if self.is_batched:
+            state_fields[self._modified_state_id_name] = 'modified_state_id'
+
+        return state_fields
+
+    @property
+    def has_saved_states(self) -> bool:
+        """
+        Свойство показывает, сохранял ли процесс состояния. Без состояний запрос выбирает все данные.
+
+        Returns:
+            True - в хранилище есть значение хотя бы одного состояния запроса.
+        """
+        return any(self._state_storage.get_value(state_name) is not None for state_name in self.state_fields)
 
     @abstractmethod
     def get_sql(self) -> str:
@@ -38,6 +98,49 @@ class BaseETLQuery(ABC):
             sql-запрос.
         """
 
+    def get_params(self) -> Dict[str, Any]:
+        """
+        Метод возвращает параметры для SQL из get_sql.
+
+        Значения состояний передаются параметрами, а не подставляются в текст запроса. Поэтому текст запроса
+        не меняется от цикла к циклу, и PostgreSQL может переиспользовать план подготовленного запроса.
+        Если состояние еще не сохранялось, передается -infinity, то есть выбираются все записи.
+
+        Returns:
+            параметры sql-запроса.
+        """
+        params = {'modified_state': self._get_modified_state() or MIN_TIMESTAMP, **self._get_shard_params()}
+
+        if self.is_batched:
+            params['modified_state_id'] = self._get_modified_state_id()
+            params['limit'] = self._batch_size
+
+        return params
+
+    def get_document_sql(self) -> str:
+        """
+        Метод возвращает SQL, в котором PostgreSQL сам собирает документ для загрузки.
+
+        Каждая строка выборки get_sql превращается в JSON-текст без служебных полей состояний.
+        Поля состояний возвращаются отдельными столбцами, параметры запроса не меняются.
+
+        Returns:
+            sql-запрос.
+        """
+        state_columns = list(self.state_fields.values())
+        document = 'to_jsonb(d)::text'
+
+        if state_columns:
+            document = '(to_jsonb(d) - ARRAY[{columns}]::text[])::text'.format(
+                columns=', '.join(f"'{column}'" for column in state_columns),
+            )
+
+        return JSON_DOCUMENT_QUERY.format(
+            query=self.get_sql(),
+            document=document,
+            state_columns=''.join(f', d.{column}' for column in state_columns),
+        )
+
     def _get_modified_state(self) -> Optional[datetime]:
         """
         Метод возвращает временное значение из хранилища для modified_state.
@@ -45,13 +148,72 @@ class BaseETLQuery(ABC):
         Returns:
             modified_state: текущее значение moified_state в хранилище.
         """
-        modified_state = self._state_storage.get_value(self._modified_state_name)
-        logger.info(f'modified state для {self._process_type} равно: {modified_state}')
-        return modified_state
+        return self._get_state_value(self._modified_state_name)
+
+    def _get_shard_params(self) -> Dict[str, int]:
+        """
+        Метод возвращает параметры условия шарда.
+
+        Returns:
+            параметры sql-запроса. Пустой словарь - запрос обрабатывает все фильмы.
+        """
+        if self._shard is None:
+            return {}
+
+        return {'shard_count': self._shard.count, 'shard_index': self._shard.index}
+
+    def _get_state_name(self, state_name: Optional[str]) -> Optional[str]:
+        """
+        Метод возвращает наименование состояния с учетом шарда запроса.
+
+        Args:
+            state_name: наименование состояния.
+
+        Returns:
+            наименование состояния в хранилище.
+        """
+        if state_name is None or self._shard is None:
+            return state_name
+
+        return get_shard_state_name(state_name, self._shard)
+
+    def _get_state_value(self, state_name: str) -> Optional[str]:
+        """
+        Метод возвращает значение состояния из хранилища.
+
+        Args:
+            state_name: наименование состояния.
+
+        Returns:
+            текущее значение состояния в хранилище.
+        """
+        state_value = self._state_storage.get_value(state_name)
+        logger.info(f'{state_name} для {self._process_type} равно: {state_value}')
+        return state_value
+
+    def _get_modified_state_id(self) -> str:
+        """
+        Метод возвращает id последней загруженной записи для keyset-пагинации.
+
+        Если id еще не сохранялся, возвращается минимальный uuid, то есть пачка начнется с первой записи,
+        у которой modified совпадает с сохраненным modified_state.
+
+        Returns:
+            id последней загруженной записи.
+        """
+        modified_state_id = self._state_storage.get_value(self._modified_state_id_name)
+        return modified_state_id or MIN_UUID
 
 
 class MoviePostgreETLQuery(BaseETLQuery):
-    """Класс для генерации запросов к PostgreSQL."""
+    """
+    Класс для генерации запросов к PostgreSQL.
+
+    В пакетном режиме каждый запрос возвращает не более batch_size записей, следующих за сохраненной парой
+    (modified, id). После сохранения состояния следующий вызов get_sql вернет следующую пачку.
+    """
+
+    supports_batches = True
 
     def get_sql(self) -> str:
         """
@@ -61,13 +223,15 @@ class MoviePostgreETLQuery(BaseETLQuery):
             sql-запрос.
         """
         logger.info(f'Генерируем запрос для {self._process_type}')
+        modified_state_field = self._get_modified_state_field()
         query = MOVIE_BASE_QUERY.format(
             cte=self._get_cte(),
-            modified_state_field=self._get_modified_state_field(),
-            where_condition=self._get_where_condition(),
+            modified_state_field=f', {modified_state_field}' if modified_state_field else '',
+            where_condition=self._add_shard_condition(self._get_where_condition()),
             order_by=self._get_order_by(),
+            limit=self._get_limit(),
         )
-        logger.info(f'Запрос к БД: \n {query}')
+        logger.debug(f'Запрос к БД: \n {query}')
 
         return query
 
@@ -80,6 +244,57 @@ class MoviePostgreETLQuery(BaseETLQuery):
         """
         return ''
 
+    def _add_shard_condition(self, where_condition: str) -> str:
+        """
+        Метод добавляет к where условие, которое оставляет только фильмы шарда запроса.
+
+        Args:
+            where_condition: where для sql-запроса.
+
+        Returns:
+            where для sql-запроса.
+        """
+        if self._shard is None:
+            return where_condition
+
+        shard_condition = self._get_shard_condition('fw.id')
+
+        if not where_condition:
+            return f'WHERE {shard_condition}'
+
+        return f'{where_condition} AND {shard_condition}'
+
+    def _get_shard_condition(self, film_id_column: str) -> str:
+        """
+        Метод возвращает условие, которое оставляет только фильмы шарда запроса.
+
+        Args:
+            film_id_column: столбец с id фильма.
+
+        Returns:
+            условие для sql-запроса. Пустая строка - запрос обрабатывает все фильмы.
+        """
+        if self._shard is None:
+            return ''
+
+        return f'(hashtext({film_id_column}::text) & 2147483647) %% %(shard_count)s = %(shard_index)s'
+
+    def _get_link_shard_condition(self, film_id_column: str) -> str:
+        """
+        Метод возвращает условие шарда для подзапроса к связям фильмов.
+
+        Пачка жанров или персон выбирается только среди тех, у кого есть фильмы шарда. Поэтому каждый шард
+        читает свои пачки, а пустая пачка означает, что изменений для шарда больше нет.
+
+        Args:
+            film_id_column: столбец связи с id фильма.
+
+        Returns:
+            условие для sql-запроса, начинающееся с AND. Пустая строка - запрос обрабатывает все фильмы.
+        """
+        shard_condition = self._get_shard_condition(film_id_column)
+        return f' AND {shard_condition}' if shard_condition else ''
+
     def _get_where_condition(self) -> str:
         """
         Метод возвращает where условия для запроса.
@@ -98,6 +313,15 @@ class MoviePostgreETLQuery(BaseETLQuery):
         """
         return ''
 
+    def _get_limit(self) -> str:
+        """
+        Метод возвращает limit для запроса.
+
+        Returns:
+            limit для sql-запроса.
+        """
+        return ''
+
     def _get_modified_state_field(self) -> str:
         """
         Метод возвращает order by условия для запроса.
@@ -118,6 +342,9 @@ class FilmworkMoviePostgreETLQuery(MoviePostgreETLQuery):
         Returns:
             order by для sql-запроса.
         """
+        if self.is_batched:
+            return 'ORDER BY fw.modified, fw.id'
+
         return 'ORDER BY fw.modified'
 
     def _get_where_condition(self) -> str:
@@ -127,14 +354,34 @@ class FilmworkMoviePostgreETLQuery(MoviePostgreETLQuery):
         Returns:
             where для sql-запроса.
         """
-        modified_state = self._get_modified_state()
+        if self.is_batched:
+            return 'WHERE (fw.modified, fw.id) > (%(modified_state)s::timestamptz, %(modified_state_id)s::uuid)'
 
-        if modified_state is None:
-            return 'WHERE TRUE'
+        return 'WHERE fw.modified > %(modified_state)s::timestamptz'
 
-        return "WHERE fw.modified > '{modified_state}'::timestamp".format(
-            modified_state=self._get_modified_state(),
-        )
+    def _get_limit(self) -> str:
+        """
+        Метод возвращает limit для запроса.
+
+        Returns:
+            limit для sql-запроса.
+        """
+        if self.is_batched:
+            return 'LIMIT %(limit)s'
+
+        return ''
+
+    def _get_modified_state_field(self) -> str:
+        """
+        Метод возвращает поля состояния для запроса.
+
+        Returns:
+            поля состояния для sql-запроса.
+        """
+        if self.is_batched:
+            return 'fw.modified modified_state, fw.id modified_state_id'
+
+        return super()._get_modified_state_field()
 
 
 class PersonMoviePostgreETLQuery(MoviePostgreETLQuery):
@@ -147,6 +394,9 @@ class PersonMoviePostgreETLQuery(MoviePostgreETLQuery):
         Returns:
             cte для sql-запроса.
         """
+        if self.is_batched:
+            return self._get_batched_cte()
+
         cte = """
         WITH person_ids AS (
             SELECT
@@ -168,14 +418,56 @@ class PersonMoviePostgreETLQuery(MoviePostgreETLQuery):
                 pfw.person_id IN (SELECT p.id from person_ids p)
         )
         """
-        modified_state = self._get_modified_state()
+        return cte.format(where_condition='WHERE p.modified > %(modified_state)s::timestamptz')
 
-        if modified_state is None:
-            where_condition = 'WHERE TRUE'
-        else:
-            where_condition = f"WHERE p.modified > '{modified_state}'::timestamp"
+    def _get_batched_cte(self) -> str:
+        """
+        Метод возвращает SQL для cte в пакетном режиме.
 
-        return cte.format(where_condition=where_condition)
+        Пачка формируется по person: берутся batch_size записей, следующих за сохраненной парой (modified, id),
+        у которых есть фильмы шарда запроса. Последняя запись пачки попадает в last_person и становится новым
+        состоянием.
+
+        Returns:
+            cte для sql-запроса.
+        """
+        cte = """
+        WITH person_ids AS (
+            SELECT
+                p.id,
+                p.modified
+            FROM
+                content.person p
+            {where_condition}
+            AND EXISTS (SELECT 1 FROM content.person_film_work pfw WHERE pfw.person_id = p.id{shard_condition})
+            ORDER BY
+                p.modified, p.id
+            LIMIT {limit}
+        )
+        , last_person AS (
+            SELECT
+                p.id,
+                p.modified
+            FROM
+                person_ids p
+            ORDER BY
+                p.modified DESC, p.id DESC
+            LIMIT 1
+        )
+        , film_ids AS (
+            SELECT DISTINCT
+                pfw.film_work_id
+            FROM
+                content.person_film_work pfw
+            WHERE
+                pfw.person_id IN (SELECT p.id FROM person_ids p)
+        )
+        """
+        return cte.format(
+            where_condition='WHERE (p.modified, p.id) > (%(modified_state)s::timestamptz, %(modified_state_id)s::uuid)',
+            limit='%(limit)s',
+            shard_condition=self._get_link_shard_condition('pfw.film_work_id'),
+        )
 
     def _get_where_condition(self) -> str:
         """
@@ -193,6 +485,9 @@ class PersonMoviePostgreETLQuery(MoviePostgreETLQuery):
         Returns:
             order by для sql-запроса.
         """
+        if self.is_batched:
+            return 'ORDER BY fw.id'
+
         return 'ORDER BY max(p.modified)'
 
     def _get_modified_state_field(self) -> str:
@@ -202,6 +497,12 @@ class PersonMoviePostgreETLQuery(MoviePostgreETLQuery):
         Returns:
             order by для sql-запроса.
         """
+        if self.is_batched:
+            return """
+            (SELECT p.modified FROM last_person p) as modified_state,
+            (SELECT p.id FROM last_person p) as modified_state_id
+            """
+
         return 'max(p.modified) as modified_state'
 
 
@@ -215,6 +516,9 @@ class GenreMoviePostgreETLQuery(MoviePostgreETLQuery):
         Returns:
             cte для sql-запроса.
         """
+        if self.is_batched:
+            return self._get_batched_cte()
+
         cte = """
         WITH genre_ids AS (
             SELECT
@@ -236,14 +540,56 @@ class GenreMoviePostgreETLQuery(MoviePostgreETLQuery):
                 gfw.genre_id IN (TABLE genre_ids)
         )
         """
-        modified_state = self._get_modified_state()
+        return cte.format(where_condition='WHERE g.modified > %(modified_state)s::timestamptz')
+
+    def _get_batched_cte(self) -> str:
+        """
+        Метод возвращает SQL для cte в пакетном режиме.
 
-        if modified_state is None:
-            where_condition = 'WHERE TRUE'
-        else:
-            where_condition = f"WHERE g.modified > '{modified_state}'::timestamp"
+        Пачка формируется по genre: берутся batch_size записей, следующих за сохраненной парой (modified, id),
+        у которых есть фильмы шарда запроса. Последняя запись пачки попадает в last_genre и становится новым
+        состоянием.
 
-        return cte.format(where_condition=where_condition)
+        Returns:
+            cte для sql-запроса.
+        """
+        cte = """
+        WITH genre_ids AS (
+            SELECT
+                g.id,
+                g.modified
+            FROM
+                content.genre g
+            {where_condition}
+            AND EXISTS (SELECT 1 FROM content.genre_film_work gfw WHERE gfw.genre_id = g.id{shard_condition})
+            ORDER BY
+                g.modified, g.id
+            LIMIT {limit}
+        )
+        , last_genre AS (
+            SELECT
+                g.id,
+                g.modified
+            FROM
+                genre_ids g
+            ORDER BY
+                g.modified DESC, g.id DESC
+            LIMIT 1
+        )
+        , film_ids AS (
+            SELECT DISTINCT
+                gfw.film_work_id
+            FROM
+                content.genre_film_work gfw
+            WHERE
+                gfw.genre_id IN (SELECT g.id FROM genre_ids g)
+        )
+        """
+        return cte.format(
+            where_condition='WHERE (g.modified, g.id) > (%(modified_state)s::timestamptz, %(modified_state_id)s::uuid)',
+            limit='%(limit)s',
+            shard_condition=self._get_link_shard_condition('gfw.film_work_id'),
+        )
 
     def _get_where_condition(self) -> str:
         """
@@ -261,6 +607,9 @@ class GenreMoviePostgreETLQuery(MoviePostgreETLQuery):
         Returns:
             order by для sql-запроса.
         """
+        if self.is_batched:
+            return 'ORDER BY fw.id'
+
         return 'ORDER BY max(g.modified)'
 
     def _get_modified_state_field(self) -> str:
@@ -270,9 +619,368 @@ class GenreMoviePostgreETLQuery(MoviePostgreETLQuery):
         Returns:
             order by для sql-запроса.
         """
+        if self.is_batched:
+            return """
+            (SELECT g.modified FROM last_genre g) as modified_state,
+            (SELECT g.id FROM last_genre g) as modified_state_id
+            """
+
         return 'max(g.modified) as modified_state'
 
 
+class MergedMoviePostgreETLQuery(MoviePostgreETLQuery):
+    """
+    Класс помогает сгенерировать объединенный запрос для Filmwork, Genre и Person.
+
+    Сначала собираются id фильмов, затронутых изменениями во всех трех источниках, затем тяжелая агрегация
+    выполняется один раз для каждого уникального фильма. Новые значения всех трех состояний вычисляются
+    в том же запросе и сохраняются только после загрузки данных.
+    """
+
+    supports_batches = False
+
+    film_work_state_name = MODIFIED_STATE[ETLProcessType.MOVIE_FILM_WORK]
+    genre_state_name = MODIFIED_STATE[ETLProcessType.MOVIE_GENRE]
+    person_state_name = MODIFIED_STATE[ETLProcessType.MOVIE_PERSON]
+
+    @property
+    def state_fields(self) -> Dict[str, str]:
+        """
+        Свойство описывает, какие поля выборки нужно сохранить в хранилище состояний после загрузки.
+
+        Returns:
+            словарь, где ключ - наименование состояния, значение - наименование поля в выборке.
+        """
+        return {
+            self._get_state_name(self.film_work_state_name): 'modified_film_work_state',
+            self._get_state_name(self.genre_state_name): 'modified_genre_state',
+            self._get_state_name(self.person_state_name): 'modified_person_state',
+        }
+
+    def get_params(self) -> Dict[str, Any]:
+        """
+        Метод возвращает параметры для SQL из get_sql.
+
+        Каждое из трех состояний передается параметром с тем же именем, что и поле состояния в выборке.
+
+        Returns:
+            параметры sql-запроса.
+        """
+        params = {
+            column: self._get_state_value(state_name) or MIN_TIMESTAMP
+            for state_name, column in self.state_fields.items()
+        }
+        params.update(self._get_shard_params())
+        return params
+
+    def _get_cte(self) -> str:
+        """
+        Метод возвращает SQL для cte, который нужно выполнить для получения данных.
+
+        Returns:
+            cte для sql-запроса.
+        """
+        cte = """
+        WITH changed_film_works AS (
+            SELECT
+                fw.id,
+                fw.modified
+            FROM
+                content.film_work fw
+            {film_work_condition}
+        )
+        , changed_genres AS (
+            SELECT
+                g.id,
+                g.modified
+            FROM
+                content.genre g
+            {genre_condition}
+        )
+        , changed_persons AS (
+            SELECT
+                p.id,
+                p.modified
+            FROM
+                content.person p
+            {person_condition}
+        )
+        , film_ids AS (
+            SELECT
+                cfw.id
+            FROM
+                changed_film_works cfw
+            UNION
+            SELECT
+                gfw.film_work_id
+            FROM
+                content.genre_film_work gfw
+            WHERE
+                gfw.genre_id IN (SELECT cg.id FROM changed_genres cg)
+            UNION
+            SELECT
+                pfw.film_work_id
+            FROM
+                content.person_film_work pfw
+            WHERE
+                pfw.person_id IN (SELECT cp.id FROM changed_persons cp)
+        )
+        """
+
+        return cte.format(
+            film_work_condition=self._get_modified_condition('fw', 'modified_film_work_state'),
+            genre_condition=self._get_modified_condition('g', 'modified_genre_state'),
+            person_condition=self._get_modified_condition('p', 'modified_person_state'),
+        )
+
+    def _get_where_condition(self) -> str:
+        """
+        Метод возвращает where условия для запроса.
+
+        Returns:
+            where для sql-запроса.
+        """
+        return 'WHERE fw.id IN (TABLE film_ids)'
+
+    def _get_order_by(self) -> str:
+        """
+        Метод возвращает order by условия для запроса.
+
+        Returns:
+            order by для sql-запроса.
+        """
+        return 'ORDER BY fw.id'
+
+    def _get_modified_state_field(self) -> str:
+        """
+        Метод возвращает поля состояния для запроса.
+
+        Returns:
+            поля состояния для sql-запроса.
+        """
+        return """
+            (SELECT max(cfw.modified) FROM changed_film_works cfw) as modified_film_work_state,
+            (SELECT max(cg.modified) FROM changed_genres cg) as modified_genre_state,
+            (SELECT max(cp.modified) FROM changed_persons cp) as modified_person_state
+        """
+
+    @staticmethod
+    def _get_modified_condition(table_alias: str, param_name: str) -> str:
+        """
+        Метод возвращает where условие для поиска измененных записей таблицы.
+
+        Args:
+            table_alias: псевдоним таблицы в запросе.
+            param_name: наименование параметра, в котором передается последнее загруженное изменение таблицы.
+
+        Returns:
+            where для sql-запроса.
+        """
+        return f'WHERE {table_alias}.modified > %({param_name})s::timestamptz'
+
+
+class OutboxMoviePostgreETLQuery(MoviePostgreETLQuery):
+    """
+    Класс помогает сгенерировать запросы для загрузки фильмов по изменениям из outbox.
+
+    Триггеры в PostgreSQL пишут в content.etl_outbox каждое изменение фильмов, жанров, персон и связей.
+    Запросы класса находят фильмы, затронутые пачкой изменений outbox. Состояние хранится в самой таблице
+    outbox: обработанные записи удаляются после загрузки, поэтому в хранилище состояний ничего не пишется.
+    """
+
+    def __init__(
+        self,
+        process_type: ETLProcessType,
+        state_storage: KeyValueStorage,
+        batch_size: Optional[int] = None,
+        shard: Optional[Shard] = None,
+    ):
+        """
+        Инициализирующий метод.
+
+        Args:
+            process_type: Тип ETL-процесса
+            state_storage: хранилище состояний.
+            batch_size: размер пачки изменений outbox. Outbox всегда обрабатывается пачками.
+            shard: шард фильмов.
+        """
+        super().__init__(process_type, state_storage, batch_size or DB_BATCH_SIZE, shard)
+        self.outbox_ids: List[int] = []
+
+    @property
+    def state_fields(self) -> Dict[str, str]:
+        """
+        Свойство описывает, какие поля выборки нужно сохранить в хранилище состояний после загрузки.
+
+        Returns:
+            пустой словарь: состояние outbox хранится в PostgreSQL.
+        """
+        return {}
+
+    def get_params(self) -> Dict[str, Any]:
+        """
+        Метод возвращает параметры для SQL из get_sql.
+
+        Returns:
+            параметры sql-запроса.
+        """
+        return {'outbox_ids': self.outbox_ids, 'limit': self._batch_size, **self._get_shard_params()}
+
+    def get_batch_sql(self) -> str:
+        """
+        Метод возвращает SQL для выбора и блокировки очередной пачки изменений outbox.
+
+        Returns:
+            sql-запрос.
+        """
+        return OUTBOX_BATCH_QUERY
+
+    def get_deleted_sql(self) -> str:
+        """
+        Метод возвращает SQL для поиска фильмов из пачки изменений, которые были удалены.
+
+        Returns:
+            sql-запрос.
+        """
+        return OUTBOX_DELETED_FILMS_QUERY.format(cte=self._get_cte())
+
+    def get_drain_sql(self) -> str:
+        """
+        Метод возвращает SQL для удаления обработанной пачки изменений из outbox.
+
+        Returns:
+            sql-запрос.
+        """
+        return OUTBOX_DRAIN_QUERY
+
+    def _get_cte(self) -> str:
+        """
+        Метод возвращает SQL для cte, который нужно выполнить для получения данных.
+
+        Returns:
+            cte для sql-запроса.
+        """
+        return OUTBOX_FILM_IDS_CTE
+
+    def _get_where_condition(self) -> str:
+        """
+        Метод возвращает where условия для запроса.
+
+        Returns:
+            where для sql-запроса.
+        """
+        return 'WHERE fw.id IN (TABLE film_ids)'
+
+    def _get_order_by(self) -> str:
+        """
+        Метод возвращает order by условия для запроса.
+
+        Returns:
+            order by для sql-запроса.
+        """
+        return 'ORDER BY fw.id'
+
+    def _get_modified_state_field(self) -> str:
+        """
+        Метод возвращает поля состояния для запроса.
+
+        Returns:
+            пустая строка: состояние outbox хранится в PostgreSQL, в выборке и документах полей состояния нет.
+        """
+        return ''
+
+
+class DocumentMoviePostgreETLQuery(BaseETLQuery):
+    """
+    Класс помогает сгенерировать запрос для готовых документов фильмов.
+
+    Документы собирают триггеры PostgreSQL в таблице content.film_work_document при изменении фильмов,
+    жанров, персон и связей. Поэтому запрос не агрегирует данные, а читает диапазон индекса (modified, id).
+    """
+
+    supports_batches = True
+
+    def get_sql(self) -> str:
+        """
+        Метод возвращает SQL, который нужно выполнить для получения данных.
+
+        Поля документа возвращаются отдельными столбцами.
+
+        Returns:
+            sql-запрос.
+        """
+        document_columns = ', '.join(f"d.document -> '{field}' {field}" for field in MOVIE_DOCUMENT_FIELDS)
+        return self._get_sql(document_columns)
+
+    def get_document_sql(self) -> str:
+        """
+        Метод возвращает SQL, в котором PostgreSQL отдает документ для загрузки.
+
+        Документ уже собран триггерами, поэтому возвращается как есть.
+
+        Returns:
+            sql-запрос.
+        """
+        return self._get_sql('d.document::text document')
+
+    def _get_sql(self, document_columns: str) -> str:
+        """
+        Метод возвращает SQL для чтения документов.
+
+        Args:
+            document_columns: столбцы документа в выборке.
+
+        Returns:
+            sql-запрос.
+        """
+        logger.info(f'Генерируем запрос для {self._process_type}')
+        query = MOVIE_DOCUMENT_QUERY.format(
+            document_columns=document_columns,
+            modified_state_field=self._get_modified_state_field(),
+            where_condition=self._get_where_condition(),
+            limit=self._get_limit(),
+        )
+        logger.debug(f'Запрос к БД: \n {query}')
+
+        return query
+
+    def _get_where_condition(self) -> str:
+        """
+        Метод возвращает where условия для запроса.
+
+        Returns:
+            where для sql-запроса.
+        """
+        if self.is_batched:
+            return 'WHERE (d.modified, d.id) > (%(modified_state)s::timestamptz, %(modified_state_id)s::uuid)'
+
+        return 'WHERE d.modified > %(modified_state)s::timestamptz'
+
+    def _get_limit(self) -> str:
+        """
+        Метод возвращает limit для запроса.
+
+        Returns:
+            limit для sql-запроса.
+        """
+        if self.is_batched:
+            return 'LIMIT %(limit)s'
+
+        return ''
+
+    def _get_modified_state_field(self) -> str:
+        """
+        Метод возвращает поля состояния для запроса.
+
+        Returns:
+            поля состояния для sql-запроса.
+        """
+        if self.is_batched:
+            return 'd.modified modified_state, d.id modified_state_id'
+
+        return 'd.modified modified_state'
+
+
 class GenreCreatedLinkPostgreETLQuery(BaseETLQuery):
     """
     Класс для генерации запросов к PostgreSQL.
@@ -291,7 +999,7 @@ class GenreCreatedLinkPostgreETLQuery(BaseETLQuery):
         query = GENRE_CREATED_LINK_QUERY.format(
             where_condition=self._get_where_condition(),
         )
-        logger.info(f'Запрос к БД: \n {query}')
+        logger.debug(f'Запрос к БД: \n {query}')
 
         return query
 
@@ -302,14 +1010,7 @@ class GenreCreatedLinkPostgreETLQuery(BaseETLQuery):
         Returns:
             where для sql-запроса.
         """
-        modified_state = self._get_modified_state()
-
-        if modified_state is None:
-            return 'WHERE TRUE'
-
-        return "WHERE gfw.created > '{modified_state}'::timestamp".format(
-            modified_state=modified_state,
-        )
+        return 'WHERE gfw.created > %(modified_state)s::timestamptz'
 
 
 class PersonCreatedLinkPostgreETLQuery(BaseETLQuery):
@@ -330,7 +1031,7 @@ class PersonCreatedLinkPostgreETLQuery(BaseETLQuery):
         query = PERSON_CREATED_LINK_QUERY.format(
             where_condition=self._get_where_condition(),
         )
-        logger.info(f'Запрос к БД: \n {query}')
+        logger.debug(f'Запрос к БД: \n {query}')
 
         return query
 
@@ -341,14 +1042,7 @@ class PersonCreatedLinkPostgreETLQuery(BaseETLQuery):
         Returns:
             where для sql-запроса.
         """
-        modified_state = self._get_modified_state()
-
-        if modified_state is None:
-            return 'WHERE TRUE'
-
-        return "WHERE pfw.created > '{modified_state}'::timestamp".format(
-            modified_state=modified_state,
-        )
+        return 'WHERE pfw.created > %(modified_state)s::timestamptz'
 
 
 class GenreModifiedPostgreETLQuery(BaseETLQuery):
@@ -369,7 +1063,7 @@ class GenreModifiedPostgreETLQuery(BaseETLQuery):
         query = GENRE_MODIFIED_QUERY.format(
             where_condition=self._get_where_condition(),
         )
-        logger.info(f'Запрос к БД: \n {query}')
+        logger.debug(f'Запрос к БД: \n {query}')
 
         return query
 
@@ -380,14 +1074,7 @@ class GenreModifiedPostgreETLQuery(BaseETLQuery):
         Returns:
             where для sql-запроса.
         """
-        modified_state = self._get_modified_state()
-
-        if modified_state is None:
-            return 'WHERE TRUE'
-
-        return "WHERE g.modified > '{modified_state}'::timestamp".format(
-            modified_state=modified_state,
-        )
+        return 'WHERE g.modified > %(modified_state)s::timestamptz'
 
 
 class PersonModifiedPostgreETLQuery(BaseETLQuery):
@@ -408,7 +1095,7 @@ class PersonModifiedPostgreETLQuery(BaseETLQuery):
         query = PERSON_MODIFIED_QUERY.format(
             where_condition=self._get_where_condition(),
         )
-        logger.info(f'Запрос к БД: \n {query}')
+        logger.debug(f'Запрос к БД: \n {query}')
 
         return query
 
@@ -419,14 +1106,7 @@ class PersonModifiedPostgreETLQuery(BaseETLQuery):
         Returns:
             where для sql-запроса.
         """
-        modified_state = self._get_modified_state()
-
-        if modified_state is None:
-            return 'WHERE TRUE'
-
-        return "WHERE p.modified > '{modified_state}'::timestamp".format(
-            modified_state=modified_state,
-        )
+        return 'WHERE p.modified > %(modified_state)s::timestamptz'
 
 
 class ETLQueryFactory:
@@ -436,6 +1116,9 @@ class ETLQueryFactory:
         QueryType.PG_MOVIE_FILM_WORK: FilmworkMoviePostgreETLQuery,
         QueryType.PG_MOVIE_PERSON: PersonMoviePostgreETLQuery,
         QueryType.PG_MOVIE_GENRE: GenreMoviePostgreETLQuery,
+        QueryType.PG_MOVIE_MERGED: MergedMoviePostgreETLQuery,
+        QueryType.PG_MOVIE_OUTBOX: OutboxMoviePostgreETLQuery,
+        QueryType.PG_MOVIE_DOCUMENT: DocumentMoviePostgreETLQuery,
         QueryType.PG_GENRE_CREATED_LINK: GenreCreatedLinkPostgreETLQuery,
         QueryType.PG_PERSON_CREATED_LINK: PersonCreatedLinkPostgreETLQuery,
         QueryType.PG_GENRE_MODIFIED: GenreModifiedPostgreETLQuery,
@@ -0,0 +1,272 @@
+"""Модуль отвечает за полную переиндексацию Elasticsearch без простоя."""
+import json
+import re
+from datetime import datetime
+from typing import Callable, Iterable, List
+
+from psycopg2.extensions import connection as postgre_conn
+from elasticsearch import Elasticsearch
+from config.settings import (
+    ElasticsearchIndex, ETLProcessType, REINDEX_PROCESS_TYPES, REINDEX_CATCH_UP_PROCESS_TYPES,
+    REINDEX_FORCEMERGE_TIMEOUT_SECONDS, REINDEX_WORKERS, SHARDED_PROCESS_TYPES, MODIFIED_STATE, DATETIME_FORMAT,
+)
+from services.logs.logs_setup import get_logger
+from services.process.backfill import ParallelBackfill
+from services.process.exceptions import ReindexError
+from services.process.helpers import get_etl_params
+from services.process.processes import ETLProcess
+from services.storages.key_value_storages import MemoryStorage
+
+logger = get_logger()
+
+PostgreConnector = Callable[[], postgre_conn]
+
+BULK_LOAD_SETTINGS = {'refresh_interval': '-1', 'number_of_replicas': 0}
+
+DEFAULT_INDEX_SETTINGS = {'refresh_interval': '1s', 'number_of_replicas': 1}
+
+
+class ElasticsearchReindexer:
+    """
+    Класс перестраивает индекс Elasticsearch в новой версии и переключает на нее алиас.
+
+    Читатели работают с алиасом, имя которого совпадает с именем индекса из ElasticsearchIndex. Новая версия
+    индекса (например, movies_v2) загружается с отключенным refresh и без реплик, затем настройки индекса
+    восстанавливаются, сегменты сливаются, и алиас атомарно переключается на новую версию. Изменения,
+    сделанные в PostgreSQL во время загрузки, догружаются до и после переключения алиаса всеми процессами,
+    которые загружают индекс (см. REINDEX_CATCH_UP_PROCESS_TYPES).
+    """
+
+    def __init__(
+        self,
+        pg_connector: PostgreConnector,
+        es_client: Elasticsearch,
+        index: ElasticsearchIndex,
+        workers: int = REINDEX_WORKERS,
+    ):
+        """
+        Инициализирующий метод.
+
+        Args:
+            pg_connector: функция, открывающая новое соединение с PostgreSQL.
+            es_client: клиент Elasticsearch.
+            index: индекс, который нужно перестроить.
+            workers: количество процессов для основной загрузки. 1 - загрузка в текущем процессе.
+        """
+        self._pg_connector = pg_connector
+        self._workers = workers
+        self._es_client = es_client
+        self._index_info = index.value
+        self._process_types = REINDEX_PROCESS_TYPES[index]
+        self._catch_up_process_types = REINDEX_CATCH_UP_PROCESS_TYPES[index]
+        self._state_storage = MemoryStorage()
+
+        with open(self._index_info.file_path, 'r') as index_settings_file:
+            self._index_body = json.load(index_settings_file)
+
+    @property
+    def alias(self) -> str:
+        """
+        Свойство возвращает алиас, с которым работают читатели индекса.
+
+        Returns:
+            наименование алиаса.
+        """
+        return self._index_info.name
+
+    def run(self, delete_old: bool = False) -> str:
+        """
+        Метод выполняет полную переиндексацию.
+
+        Args:
+            delete_old: True - удалить индексы, на которые алиас указывал до переключения.
+
+        Returns:
+            наименование новой версии индекса.
+        """
+        new_index = self._get_next_index_name()
+        logger.info(f'Переиндексация {self.alias}: загружаем новую версию индекса {new_index}.')
+
+        self._create_index(new_index)
+        pg_conn = self._pg_connector()
+
+        try:
+            self._remember_start_states(pg_conn)
+            self._backfill(pg_conn, new_index)
+            # Догружаем изменения, сделанные в PostgreSQL во время основной загрузки.
+            self._load(pg_conn, new_index)
+            self._finish_bulk_load(new_index)
+            old_indexes = self._swap_alias(new_index)
+            # Изменения, которые основной ETL успел загрузить в старый индекс до переключения алиаса.
+            self._load(pg_conn, new_index)
+        finally:
+            pg_conn.close()
+
+        if delete_old:
+            self._delete_indexes(old_indexes)
+
+        logger.info(f'Переиндексация {self.alias} завершена. Алиас указывает на {new_index}.')
+        return new_index
+
+    def _get_next_index_name(self) -> str:
+        """
+        Метод вычисляет наименование следующей версии индекса.
+
+        Returns:
+            наименование индекса вида <алиас>_v<номер версии>.
+        """
+        version_pattern = re.compile(rf'^{re.escape(self.alias)}_v(\d+)$')
+        existing_indexes = self._es_client.options(ignore_status=404).indices.get(
+            index=f'{self.alias}_v*',
+            expand_wildcards='all',
+        )
+        versions = [
+            int(match.group(1))
+            for match in map(version_pattern.match, existing_indexes.keys())
+            if match is not None
+        ]
+
+        return f'{self.alias}_v{max(versions, default=0) + 1}'
+
+    def _create_index(self, index_name: str):
+        """
+        Метод создает индекс с настройками для быстрой массовой загрузки.
+
+        Args:
+            index_name: наименование индекса.
+        """
+        index_body = {**self._index_body, 'settings': {**self._index_body.get('settings', {}), **BULK_LOAD_SETTINGS}}
+        self._es_client.indices.create(index=index_name, body=index_body)
+
+    def _remember_start_states(self, pg_conn: postgre_conn):
+        """
+        Метод сохраняет время начала переиндексации как состояние процессов, которые только догружают изменения.
+
+        Основная загрузка сохраняет состояния своих процессов сама. Остальные процессы индекса после нее
+        загружают только изменения, сделанные после начала переиндексации, а не все данные заново.
+
+        Args:
+            pg_conn: соединение с PostgreSQL.
+        """
+        with pg_conn.cursor() as cursor:
+            cursor.execute('SELECT clock_timestamp()')
+            started_at: datetime = cursor.fetchone()[0]
+
+        self._state_storage.set_many({
+            MODIFIED_STATE[process_type]: datetime.strftime(started_at, DATETIME_FORMAT)
+            for process_type in self._catch_up_process_types
+            if process_type not in self._process_types
+        })
+
+    def _backfill(self, pg_conn: postgre_conn, index_name: str):
+        """
+        Метод выполняет основную загрузку всех данных в индекс.
+
+        Процессы из SHARDED_PROCESS_TYPES загружаются параллельно в workers процессах, если их больше одного.
+        Сводные состояния параллельной загрузки сохраняются в хранилище состояний переиндексации.
+
+        Args:
+            pg_conn: соединение с PostgreSQL.
+            index_name: наименование индекса.
+
+        Raises:
+            ReindexError: ETL-процесс завершился с ошибкой.
+        """
+        for process_type in self._process_types:
+            if self._workers > 1 and process_type in SHARDED_PROCESS_TYPES:
+                ParallelBackfill(process_type, index_name, self._workers).run(self._state_storage)
+                continue
+
+            self._load_process(pg_conn, index_name, process_type)
+
+    def _load(self, pg_conn: postgre_conn, index_name: str):
+        """
+        Метод догружает в индекс изменения из PostgreSQL всеми ETL-процессами индекса.
+
+        Состояния процессов хранятся в памяти, поэтому каждый вызов загружает только изменения, сделанные
+        после основной загрузки или предыдущего вызова.
+
+        Args:
+            pg_conn: соединение с PostgreSQL.
+            index_name: наименование индекса.
+
+        Raises:
+            ReindexError: ETL-процесс завершился с ошибкой.
+        """
+        for process_type in self._catch_up_process_types:
+            self._load_process(pg_conn, index_name, process_type)
+
+    def _load_process(self, pg_conn: postgre_conn, index_name: str, process_type: ETLProcessType):
+        """
+        Метод загружает данные одного ETL-процесса в индекс.
+
+        Args:
+            pg_conn: соединение с PostgreSQL.
+            index_name: наименование индекса.
+            process_type: тип ETL-процесса.
+
+        Raises:
+            ReindexError: ETL-процесс завершился с ошибкой.
+        """
+        etl_params = get_etl_params(process_type, pg_conn, self._state_storage, self._es_client, index_name)
+
+        with ETLProcess(etl_params) as process:
+            if not process.start():
+                raise ReindexError(self.alias, process_type)
+
+    def _finish_bulk_load(self, index_name: str):
+        """
+        Метод восстанавливает настройки индекса из файла схемы и сливает сегменты.
+
+        Args:
+            index_name: наименование индекса.
+        """
+        index_settings = self._index_body.get('settings', {})
+        restored_settings = {
+            setting_name: index_settings.get(setting_name, default_value)
+            for setting_name, default_value in DEFAULT_INDEX_SETTINGS.items()
+        }
+
+        self._es_client.indices.put_settings(index=index_name, settings=restored_settings)
+        self._es_client.indices.refresh(index=index_name)
+        self._es_client.options(request_timeout=REINDEX_FORCEMERGE_TIMEOUT_SECONDS).indices.forcemerge(
+            index=index_name,
+            max_num_segments=1,
+        )
+        self._es_client.cluster.health(index=index_name, wait_for_status='yellow')
+
+    def _swap_alias(self, index_name: str) -> List[str]:
+        """
+        Метод атомарно переключает алиас на новый индекс.
+
+        Если вместо алиаса существует обычный индекс с тем же именем, он удаляется в том же запросе.
+
+        Args:
+            index_name: наименование нового индекса.
+
+        Returns:
+            индексы, на которые алиас указывал до переключения.
+        """
+        actions = [{'add': {'index': index_name, 'alias': self.alias}}]
+        old_indexes = []
+
+        if self._es_client.indices.exists_alias(name=self.alias):
+            old_indexes = list(self._es_client.indices.get_alias(name=self.alias).keys())
+            actions.extend({'remove': {'index': old_index, 'alias': self.alias}} for old_index in old_indexes)
+        elif self._es_client.indices.exists(index=self.alias):
+            logger.warning(f'Индекс {self.alias} будет удален и заменен алиасом на {index_name}.')
+            actions.append({'remove_index': {'index': self.alias}})
+
+        self._es_client.indices.update_aliases(actions=actions)
+        return old_indexes
+
+    def _delete_indexes(self, indexes: Iterable[str]):
+        """
+        Метод удаляет старые версии индекса.
+
+        Args:
+            indexes: наименования индексов.
+        """
+        for index in indexes:
+            logger.info(f'Удаляем старую версию индекса {index}.')
+            self._es_client.options(ignore_status=404).indices.delete(index=index)
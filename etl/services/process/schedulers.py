@@ -0,0 +1,406 @@
+"""Модуль отвечает за планировщики, которые запускают ETL-процессы."""
+import asyncio
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, List, Optional
+
+from psycopg2.extensions import connection as postgre_conn
+from asyncpg import Pool
+from redis import Redis
+from elasticsearch import AsyncElasticsearch, Elasticsearch
+from config.settings import (
+    ETLProcessType, ElasticsearchIndex, SchedulerType, Shard, ES_CONNECTION, PROCESS_ES_INDEX, SHARDED_PROCESS_TYPES,
+)
+from services.logs.logs_setup import get_logger
+from services.metrics.memory import cycle_peak_rss_metric
+from services.process.async_processes import create_pg_pool, run_async_etl_process
+from services.process.helpers import PROCESS_EXTRACTORS, run_etl_process, get_redis_state_storage
+from services.process.sharding import ShardMembership
+from services.storages.key_value_decorators import BaseKeyValueDecorator
+
+logger = get_logger()
+
+PostgreConnector = Callable[[], postgre_conn]
+
+
+class BaseETLScheduler(ABC):
+    """
+    Базовый класс планировщика ETL-процессов.
+
+    Настоятельно рекомендуется работать с классом через контекстный менеджер with,
+    чтобы открытые планировщиком соединения с PostgreSQL были закрыты.
+    """
+
+    def __init__(
+        self,
+        pg_connector: PostgreConnector,
+        redis_client: Redis,
+        es_client: Elasticsearch,
+        membership: Optional[ShardMembership] = None,
+    ):
+        """
+        Инициализирующий метод.
+
+        Args:
+            pg_connector: функция, открывающая новое соединение с PostgreSQL.
+            redis_client: клиент Redis.
+            es_client: клиент Elasticsearch.
+            membership: членство в группе исполнителей ETL. Если не задано, процессы обрабатывают все фильмы.
+        """
+        self._pg_connector = pg_connector
+        self._redis_client = redis_client
+        self._es_client = es_client
+        self._membership = membership
+        self._shards: List[Shard] = []
+        self._pg_connections: Dict[str, postgre_conn] = {}
+
+    def __enter__(self):
+        """
+        Метод для контекстного менеджера.
+
+        Returns:
+            BaseETLScheduler
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """
+        Метод для контекстного менеджера. Закрывает соединения с PostgreSQL.
+
+        Args:
+            exc_type: стандартная сигнатура запуска контекстного менеджера.
+            exc_val: стандартная сигнатура запуска контекстного менеджера.
+            exc_tb: стандартная сигнатура запуска контекстного менеджера.
+        """
+        self.close()
+
+    @abstractmethod
+    def run_cycle(self, process_types: Iterable[ETLProcessType]):
+        """
+        Метод выполняет один цикл ETL-процессов.
+
+        Args:
+            process_types: типы процессов, которые нужно выполнить.
+        """
+
+    def close(self):
+        """Метод закрывает все соединения с PostgreSQL, открытые планировщиком."""
+        for pg_conn in self._pg_connections.values():
+            if not pg_conn.closed:
+                pg_conn.close()
+        self._pg_connections.clear()
+
+    def _get_pg_connection(self, worker_name: str) -> postgre_conn:
+        """
+        Метод возвращает соединение с PostgreSQL, закрепленное за исполнителем.
+
+        Если соединение еще не открыто или было закрыто, открывается новое.
+
+        Args:
+            worker_name: наименование исполнителя.
+
+        Returns:
+            соединение с PostgreSQL.
+        """
+        pg_conn = self._pg_connections.get(worker_name)
+
+        if pg_conn is None or pg_conn.closed:
+            pg_conn = self._pg_connector()
+            self._pg_connections[worker_name] = pg_conn
+
+        return pg_conn
+
+    def _start_cycle(self) -> BaseKeyValueDecorator:
+        """
+        Метод готовит один цикл ETL-процессов и возвращает хранилище состояний цикла.
+
+        Шарды исполнителя пересчитываются в начале каждого цикла. Состояния всех процессов цикла,
+        включая состояния шардов, загружаются из Redis одним запросом.
+
+        Returns:
+            хранилище состояний.
+        """
+        if self._membership is not None:
+            self._shards = self._membership.get_owned_shards()
+
+        return get_redis_state_storage(self._redis_client, self._shards)
+
+    def _get_process_shards(self, process_type: ETLProcessType) -> List[Optional[Shard]]:
+        """
+        Метод возвращает шарды, которые процесс должен обработать в текущем цикле.
+
+        Args:
+            process_type: тип процесса.
+
+        Returns:
+            список шардов. [None] - процесс обрабатывает все фильмы.
+        """
+        if self._membership is None or process_type not in SHARDED_PROCESS_TYPES:
+            return [None]
+
+        return self._shards
+
+    @staticmethod
+    def _group_by_index(
+        process_types: Iterable[ETLProcessType],
+    ) -> Dict[ElasticsearchIndex, List[ETLProcessType]]:
+        """
+        Метод группирует процессы по индексам Elasticsearch, в которые они загружают данные.
+
+        Порядок процессов внутри индекса сохраняется.
+
+        Args:
+            process_types: типы процессов.
+
+        Returns:
+            словарь, где ключ - индекс, значение - процессы индекса.
+        """
+        groups = {}
+
+        for process_type in process_types:
+            groups.setdefault(PROCESS_ES_INDEX[process_type], []).append(process_type)
+
+        return groups
+
+    def _run_processes(
+        self,
+        worker_name: str,
+        process_types: Iterable[ETLProcessType],
+        state_storage: BaseKeyValueDecorator,
+    ):
+        """
+        Метод последовательно выполняет ETL-процессы на соединении исполнителя.
+
+        Args:
+            worker_name: наименование исполнителя.
+            process_types: типы процессов.
+            state_storage: хранилище состояний цикла.
+        """
+        pg_conn = self._get_pg_connection(worker_name)
+
+        for process_type in process_types:
+            for shard in self._get_process_shards(process_type):
+                run_etl_process(process_type, pg_conn, self._redis_client, self._es_client, state_storage, shard)
+
+
+class SequentialETLScheduler(BaseETLScheduler):
+    """Планировщик выполняет все ETL-процессы друг за другом через одно соединение с PostgreSQL."""
+
+    worker_name = 'sequential'
+
+    def run_cycle(self, process_types: Iterable[ETLProcessType]):
+        """
+        Метод выполняет один цикл ETL-процессов.
+
+        Args:
+            process_types: типы процессов, которые нужно выполнить.
+        """
+        self._run_processes(self.worker_name, process_types, self._start_cycle())
+
+
+class ConcurrentETLScheduler(BaseETLScheduler):
+    """
+    Планировщик выполняет ETL-процессы разных индексов Elasticsearch одновременно.
+
+    Процессы одного индекса выполняются последовательно одним исполнителем пула, у каждого исполнителя
+    свое соединение с PostgreSQL. Поэтому обновление жанров и персон не ждет тяжелых процессов фильмов.
+    Пиковое потребление памяти замеряется за весь цикл, а не по отдельным процессам.
+    """
+
+    def __init__(
+        self,
+        pg_connector: PostgreConnector,
+        redis_client: Redis,
+        es_client: Elasticsearch,
+        membership: Optional[ShardMembership] = None,
+    ):
+        """
+        Инициализирующий метод.
+
+        Args:
+            pg_connector: функция, открывающая новое соединение с PostgreSQL.
+            redis_client: клиент Redis.
+            es_client: клиент Elasticsearch.
+            membership: членство в группе исполнителей ETL. Если не задано, процессы обрабатывают все фильмы.
+        """
+        super().__init__(pg_connector, redis_client, es_client, membership)
+        self._executor = ThreadPoolExecutor(max_workers=len(ElasticsearchIndex), thread_name_prefix='etl')
+
+    def run_cycle(self, process_types: Iterable[ETLProcessType]):
+        """
+        Метод выполняет один цикл ETL-процессов.
+
+        Args:
+            process_types: типы процессов, которые нужно выполнить.
+        """
+        state_storage = self._start_cycle()
+        with cycle_peak_rss_metric(type(self).__name__):
+            futures = {
+                self._executor.submit(self._run_processes, index.value.name, index_process_types, state_storage): index
+                for index, index_process_types in self._group_by_index(process_types).items()
+            }
+            wait(futures)
+
+        for future, index in futures.items():
+            if future.exception() is not None:
+                logger.error(
+                    f'ETL-процессы индекса {index.value.name} завершились с ошибкой.',
+                    exc_info=future.exception(),
+                )
+
+    def close(self):
+        """Метод останавливает пул исполнителей и закрывает соединения с PostgreSQL."""
+        self._executor.shutdown(wait=True)
+        super().close()
+
+
+class AsyncETLScheduler(BaseETLScheduler):
+    """
+    Планировщик выполняет ETL-процессы асинхронно в цикле событий asyncio.
+
+    Процессы разных индексов Elasticsearch выполняются одновременно, процессы одного индекса - последовательно.
+    Внутри процесса извлечение, валидация и загрузка пачек перекрываются во времени (см. AsyncETLProcess).
+    Соединения с PostgreSQL берутся из пула asyncpg, загрузка идет через асинхронный клиент Elasticsearch.
+
+    Процессы со своим извлекателем данных (outbox) выполняются синхронно в отдельном потоке.
+    Пиковое потребление памяти, как и у ConcurrentETLScheduler, замеряется за весь цикл.
+    """
+
+    def __init__(
+        self,
+        pg_connector: PostgreConnector,
+        redis_client: Redis,
+        es_client: Elasticsearch,
+        membership: Optional[ShardMembership] = None,
+    ):
+        """
+        Инициализирующий метод.
+
+        Args:
+            pg_connector: функция, открывающая новое соединение с PostgreSQL для синхронных процессов.
+            redis_client: клиент Redis.
+            es_client: клиент Elasticsearch для синхронных процессов.
+            membership: членство в группе исполнителей ETL. Если не задано, процессы обрабатывают все фильмы.
+        """
+        super().__init__(pg_connector, redis_client, es_client, membership)
+        self._loop = asyncio.new_event_loop()
+        self._pg_pool: Optional[Pool] = None
+        self._async_es_client: Optional[AsyncElasticsearch] = None
+
+    def run_cycle(self, process_types: Iterable[ETLProcessType]):
+        """
+        Метод выполняет один цикл ETL-процессов.
+
+        Args:
+            process_types: типы процессов, которые нужно выполнить.
+        """
+        state_storage = self._start_cycle()
+        with cycle_peak_rss_metric(type(self).__name__):
+            self._loop.run_until_complete(self._run_cycle(process_types, state_storage))
+
+    def close(self):
+        """Метод закрывает пул asyncpg, асинхронный клиент Elasticsearch, цикл событий и соединения с PostgreSQL."""
+        if self._pg_pool is not None:
+            self._loop.run_until_complete(self._pg_pool.close())
+            self._pg_pool = None
+
+        if self._async_es_client is not None:
+            self._loop.run_until_complete(self._async_es_client.close())
+            self._async_es_client = None
+
+        self._loop.close()
+        super().close()
+
+    async def _run_cycle(self, process_types: Iterable[ETLProcessType], state_storage: BaseKeyValueDecorator):
+        """
+        Метод одновременно выполняет ETL-процессы разных индексов.
+
+        Args:
+            process_types: типы процессов.
+            state_storage: хранилище состояний цикла.
+        """
+        if self._pg_pool is None:
+            self._pg_pool = await create_pg_pool()
+
+        if self._async_es_client is None:
+            self._async_es_client = AsyncElasticsearch(hosts=[ES_CONNECTION])
+
+        groups = self._group_by_index(process_types)
+        results = await asyncio.gather(
+            *(
+                self._run_async_processes(index.value.name, index_process_types, state_storage)
+                for index, index_process_types in groups.items()
+            ),
+            return_exceptions=True,
+        )
+
+        for index, result in zip(groups, results):
+            if isinstance(result, Exception):
+                logger.error(f'ETL-процессы индекса {index.value.name} завершились с ошибкой.', exc_info=result)
+
+    async def _run_async_processes(
+        self,
+        worker_name: str,
+        process_types: Iterable[ETLProcessType],
+        state_storage: BaseKeyValueDecorator,
+    ):
+        """
+        Метод последовательно выполняет ETL-процессы одного исполнителя.
+
+        Args:
+            worker_name: наименование исполнителя.
+            process_types: типы процессов.
+            state_storage: хранилище состояний цикла.
+        """
+        for process_type in process_types:
+            for shard in self._get_process_shards(process_type):
+                if process_type in PROCESS_EXTRACTORS:
+                    await asyncio.to_thread(
+                        run_etl_process,
+                        process_type,
+                        self._get_pg_connection(worker_name),
+                        self._redis_client,
+                        self._es_client,
+                        state_storage,
+                        shard,
+                    )
+                    continue
+
+                await run_async_etl_process(
+                    process_type,
+                    self._pg_pool,
+                    self._redis_client,
+                    self._async_es_client,
+                    state_storage,
+                    shard,
+                )
+
+
+class ETLSchedulerFactory:
+    """Фабрика классов для планировщиков ETL-процессов."""
+
+    schedulers = {
+        SchedulerType.SEQUENTIAL: SequentialETLScheduler,
+        SchedulerType.CONCURRENT: ConcurrentETLScheduler,
+        SchedulerType.ASYNC: AsyncETLScheduler,
+    }
+
+    @staticmethod
+    def scheduler_by_type(scheduler_type: SchedulerType, *args, **kwargs) -> BaseETLScheduler:
+        """
+        Метод возвращает инстанс планировщика по заданному типу.
+
+        Args:
+            scheduler_type: тип планировщика.
+            args: позиционные аргументы.
+            kwargs: именнованные аргументы.
+
+        Returns:
+            scheduler (BaseETLScheduler): планировщик.
+        """
+        try:
+            scheduler_class = ETLSchedulerFactory.schedulers[scheduler_type]
+            return scheduler_class(*args, **kwargs)
+        except KeyError as error:
+            logger.error(f'Для типа {scheduler_type} не существует реализации планировщика.', exc_info=True)
+            raise error
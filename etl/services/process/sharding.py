@@ -0,0 +1,144 @@
+"""Модуль отвечает за распределение шардов фильмов между исполнителями ETL."""
+import threading
+from contextlib import nullcontext
+from time import time
+from typing import ContextManager, List, Optional
+
+from redis import Redis
+from config.settings import (
+    Shard, ETL_SHARDING, ETL_SHARD_COUNT, ETL_WORKER_ID, ETL_WORKER_TTL_SECONDS, ETL_WORKERS_KEY,
+)
+from services.logs.logs_setup import get_logger
+
+logger = get_logger()
+
+
+class ShardMembership:
+    """
+    Класс отвечает за членство исполнителя в группе ETL и за выбор его шардов.
+
+    Исполнители отмечаются в отсортированном множестве Redis: фоновый поток обновляет время последнего
+    сигнала исполнителя каждые ttl_seconds / 3 секунд. Исполнители без сигнала дольше ttl_seconds считаются
+    выбывшими. Шард k принадлежит исполнителю с номером k % <количество исполнителей> в отсортированном
+    списке живых исполнителей, поэтому при появлении и уходе исполнителей шарды перераспределяются сами.
+    Настоятельно рекомендуется работать с классом через контекстный менеджер with.
+    """
+
+    def __init__(
+        self,
+        redis_client: Redis,
+        worker_id: str = ETL_WORKER_ID,
+        shard_count: int = ETL_SHARD_COUNT,
+        ttl_seconds: float = ETL_WORKER_TTL_SECONDS,
+    ):
+        """
+        Инициализирующий метод.
+
+        Args:
+            redis_client: клиент Redis.
+            worker_id: идентификатор исполнителя.
+            shard_count: количество шардов.
+            ttl_seconds: сколько секунд исполнитель считается живым после последнего сигнала.
+        """
+        self._redis = redis_client
+        self._worker_id = worker_id
+        self._shard_count = shard_count
+        self._ttl_seconds = ttl_seconds
+        self._heartbeat_stop = threading.Event()
+        self._heartbeat: Optional[threading.Thread] = None
+
+    def __enter__(self):
+        """
+        Метод для контекстного менеджера. Регистрирует исполнителя и запускает отправку сигналов.
+
+        Returns:
+            ShardMembership
+        """
+        self.join()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """
+        Метод для контекстного менеджера. Снимает исполнителя с регистрации.
+
+        Args:
+            exc_type: стандартная сигнатура запуска контекстного менеджера.
+            exc_val: стандартная сигнатура запуска контекстного менеджера.
+            exc_tb: стандартная сигнатура запуска контекстного менеджера.
+        """
+        self.leave()
+
+    def join(self):
+        """Метод регистрирует исполнителя в группе и запускает отправку сигналов."""
+        self._send_heartbeat()
+        self._heartbeat_stop.clear()
+        self._heartbeat = threading.Thread(target=self._run_heartbeat, name='etl_membership', daemon=True)
+        self._heartbeat.start()
+        logger.info(f'Исполнитель {self._worker_id} присоединился к группе ETL.')
+
+    def leave(self):
+        """Метод останавливает отправку сигналов и снимает исполнителя с регистрации."""
+        self._heartbeat_stop.set()
+
+        if self._heartbeat is not None:
+            self._heartbeat.join()
+            self._heartbeat = None
+
+        self._redis.zrem(ETL_WORKERS_KEY, self._worker_id)
+        logger.info(f'Исполнитель {self._worker_id} покинул группу ETL.')
+
+    def get_owned_shards(self) -> List[Shard]:
+        """
+        Метод возвращает шарды, которые сейчас принадлежат исполнителю.
+
+        Returns:
+            список шардов.
+        """
+        self._redis.zremrangebyscore(ETL_WORKERS_KEY, '-inf', time() - self._ttl_seconds)
+        workers = sorted(worker.decode('utf-8') for worker in self._redis.zrange(ETL_WORKERS_KEY, 0, -1))
+
+        if self._worker_id not in workers:
+            self._send_heartbeat()
+            workers = sorted([*workers, self._worker_id])
+
+        worker_index = workers.index(self._worker_id)
+        shards = [
+            Shard(shard_index, self._shard_count)
+            for shard_index in range(self._shard_count)
+            if shard_index % len(workers) == worker_index
+        ]
+        logger.info(
+            f'Исполнитель {self._worker_id} ({worker_index + 1} из {len(workers)}) '
+            f'обрабатывает шарды {[shard.index for shard in shards]}.',
+        )
+        return shards
+
+    def _send_heartbeat(self):
+        """Метод отмечает в Redis, что исполнитель жив."""
+        self._redis.zadd(ETL_WORKERS_KEY, {self._worker_id: time()})
+
+    def _run_heartbeat(self):
+        """Метод отправляет сигналы, пока исполнитель не покинет группу."""
+        while not self._heartbeat_stop.wait(self._ttl_seconds / 3):
+            try:
+                self._send_heartbeat()
+            except Exception:
+                logger.warning(f'Не удалось отправить сигнал исполнителя {self._worker_id}.', exc_info=True)
+
+
+def get_shard_membership(redis_client: Redis) -> ContextManager[Optional[ShardMembership]]:
+    """
+    Функция возвращает контекстный менеджер членства в группе ETL.
+
+    Если шардирование выключено, менеджер возвращает None.
+
+    Args:
+        redis_client: клиент Redis.
+
+    Returns:
+        контекстный менеджер членства.
+    """
+    if ETL_SHARDING:
+        return ShardMembership(redis_client)
+
+    return nullcontext()
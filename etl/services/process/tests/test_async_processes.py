@@ -0,0 +1,155 @@
+"""Модуль отвечает за тесты асинхронного ETL-процесса."""
+
+import asyncio
+import unittest
+from typing import Any, AsyncGenerator, Dict, List, Tuple
+
+from config.settings import ETLProcessType
+from services.storages.key_value_storages import MemoryStorage
+
+from ..async_processes import AsyncETLProcess, AsyncETLProcessParameters
+from ..extractors.adapters import PostgreToElasticsearchAdapter
+from ..extractors.extractors import BaseExtractor
+
+STATE_NAME = 'modified_state'
+
+
+class ListExtractor(BaseExtractor):
+    """Класс асинхронно отдает заранее заданные пачки строк."""
+
+    def __init__(self, batches: List[List[Dict[str, Any]]]):
+        """
+        Инициализирующий метод.
+
+        Args:
+            batches: пачки строк.
+        """
+        super().__init__()
+        self._batches = batches
+
+    @property
+    def state_columns(self) -> Tuple[str, ...]:
+        """
+        Свойство возвращает служебные поля выборки, в которых передаются значения состояний.
+
+        Returns:
+            наименования полей.
+        """
+        return (STATE_NAME,)
+
+    async def extract(self) -> AsyncGenerator[List[Dict[str, Any]], None]:
+        """
+        Метод отдает пачки строк.
+
+        Yields:
+            пачки строк.
+        """
+        for rows in self._batches:
+            self.last_states = {STATE_NAME: rows[-1][STATE_NAME]}
+            self.extracted_count += len(rows)
+            yield rows
+
+
+class ListLoader:
+    """Класс сохраняет загружаемые bulk-действия в список."""
+
+    def __init__(self, is_failed: bool = False):
+        """
+        Инициализирующий метод.
+
+        Args:
+            is_failed: True - загрузка завершается ошибкой.
+        """
+        self.actions: List[dict] = []
+        self._is_failed = is_failed
+
+    async def load(self, data_for_load) -> bool:
+        """
+        Метод сохраняет bulk-действия.
+
+        Args:
+            data_for_load: bulk-действия для загрузки.
+
+        Returns:
+            True - загрузка прошла успешно.
+
+        Raises:
+            RuntimeError: загрузка завершается ошибкой.
+        """
+        async for action in data_for_load:
+            if self._is_failed:
+                raise RuntimeError('Elasticsearch недоступен.')
+            self.actions.append(action)
+
+        return True
+
+
+class PassValidator:
+    """Класс валидатора, который считает валидными все данные."""
+
+    def get_valid_data(self, data_for_validate):
+        """
+        Метод возвращает данные без изменений.
+
+        Args:
+            data_for_validate: данные для валидации.
+
+        Returns:
+            данные для загрузки.
+        """
+        return data_for_validate
+
+
+class Testing(unittest.TestCase):
+    """Класс для тестирования асинхронного ETL-процесса."""
+
+    def setUp(self):
+        """Метод создает три пачки строк и хранилище состояний в памяти."""
+        self.batches = [
+            [{'id': f'{batch}-{row}', STATE_NAME: f'2023-01-0{batch + 1}'} for row in range(3)]
+            for batch in range(3)
+        ]
+        self.state_storage = MemoryStorage()
+
+    def run_process(self, loader: ListLoader) -> bool:
+        """
+        Метод выполняет асинхронный ETL-процесс.
+
+        Args:
+            loader: загрузчик.
+
+        Returns:
+            True - процесс завершен успешно, иначе - False.
+        """
+        extractor = ListExtractor(self.batches)
+        process = AsyncETLProcess(AsyncETLProcessParameters(
+            process_type=ETLProcessType.MOVIE_FILM_WORK,
+            state_storage=self.state_storage,
+            extractor=extractor,
+            adapter=PostgreToElasticsearchAdapter(extractor),
+            validator=PassValidator(),
+            loader=loader,
+            queue_size=1,
+        ))
+        return asyncio.run(process.start())
+
+    def test_all_batches_are_loaded(self):
+        """Метод проверяет, что все пачки загружены по порядку, а состояние сохранено после загрузки."""
+        loader = ListLoader()
+
+        self.assertTrue(self.run_process(loader))
+        self.assertEqual(
+            [action['_id'] for action in loader.actions],
+            [row['id'] for rows in self.batches for row in rows],
+        )
+        self.assertNotIn(STATE_NAME, loader.actions[0])
+        self.assertEqual(self.state_storage.get_value(STATE_NAME), '2023-01-03')
+
+    def test_failed_load_keeps_state(self):
+        """Метод проверяет, что при ошибке загрузки процесс завершается неуспешно и состояние не меняется."""
+        self.assertFalse(self.run_process(ListLoader(is_failed=True)))
+        self.assertIsNone(self.state_storage.get_value(STATE_NAME))
+
+
+if __name__ == '__main__':
+    unittest.main()
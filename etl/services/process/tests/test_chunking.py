@@ -0,0 +1,59 @@
+"""Модуль отвечает за тесты chunking."""
+
+import unittest
+
+from config.settings import EsBulkSettings
+
+from ..loaders.chunking import AdaptiveChunkController, MAX_CHUNK_BYTES
+
+
+class Testing(unittest.TestCase):
+    """Класс для тестирования подбора размера bulk-пачек."""
+
+    def setUp(self):
+        """Метод создает контроллер с целевой задержкой 500 мс и пачкой в 1000 документов."""
+        self.controller = AdaptiveChunkController(
+            EsBulkSettings(chunk_size=1000, max_chunk_bytes=10 * 1024 * 1024, target_latency_ms=500),
+        )
+
+    def test_latency_near_target(self):
+        """Метод проверяет, что задержка около целевой не меняет размер пачки."""
+        self.controller.record(550)
+        self.assertEqual(self.controller.chunk_size, 1000)
+        self.assertEqual(self.controller.max_chunk_bytes, 10 * 1024 * 1024)
+
+    def test_slow_request_shrinks_chunk(self):
+        """Метод проверяет, что медленный запрос уменьшает пачку пропорционально задержке, но не больше чем вдвое."""
+        self.controller.record(800)
+        self.assertEqual(self.controller.chunk_size, 625)
+
+        self.controller.record(5000)
+        self.assertEqual(self.controller.chunk_size, 312)
+
+    def test_fast_request_grows_chunk(self):
+        """Метод проверяет, что быстрый запрос увеличивает пачку не больше чем на четверть."""
+        self.controller.record(100)
+        self.assertEqual(self.controller.chunk_size, 1250)
+        self.assertEqual(self.controller.max_chunk_bytes, round(10 * 1024 * 1024 * 1.25))
+
+    def test_rejections_halve_chunk(self):
+        """Метод проверяет, что отклоненные документы уменьшают пачку вдвое даже при быстром запросе."""
+        self.controller.record(100, rejected_count=3)
+        self.assertEqual(self.controller.chunk_size, 500)
+
+    def test_limits(self):
+        """Метод проверяет, что размер пачки не выходит за пределы."""
+        for _ in range(100):
+            self.controller.record(1)
+
+        self.assertEqual(self.controller.chunk_size, 10000)
+        self.assertEqual(self.controller.max_chunk_bytes, MAX_CHUNK_BYTES)
+
+        for _ in range(100):
+            self.controller.record(100, rejected_count=1)
+
+        self.assertEqual(self.controller.chunk_size, 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
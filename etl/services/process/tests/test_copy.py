@@ -0,0 +1,206 @@
+"""Модуль отвечает за тесты разбора данных COPY."""
+
+import json
+import unittest
+from typing import Any, Dict, List, Optional
+
+from config.settings import ETLProcessType
+from services.storages.key_value_storages import MemoryStorage
+
+from ..extractors.extractors import CopyPostgreExtractor, CopyStream
+from ..queries.queries import FilmworkMoviePostgreETLQuery
+
+STATE = '2023-01-01 12:00:00.000000+0000'
+
+DOCUMENT = json.dumps(
+    {'id': '1', 'title': 'Звёздные войны\n«Эпизод IV»', 'description': 'tab\t"quote" \\ \x01\x02'},
+    ensure_ascii=False,
+)
+
+
+class FakeCursor:
+    """Класс курсора, команда COPY которого отдает заранее заданные куски данных."""
+
+    def __init__(self, chunks: List[bytes], error: Optional[Exception]):
+        """
+        Инициализирующий метод.
+
+        Args:
+            chunks: куски данных COPY.
+            error: ошибка, которой COPY завершается после всех кусков.
+        """
+        self._chunks = chunks
+        self._error = error
+
+    def __enter__(self) -> 'FakeCursor':
+        """
+        Метод открывает курсор.
+
+        Returns:
+            курсор.
+        """
+        return self
+
+    def __exit__(self, *args):
+        """
+        Метод закрывает курсор.
+
+        Args:
+            args: сведения об исключении.
+        """
+
+    def mogrify(self, sql: str, params: Dict[str, Any]) -> bytes:
+        """
+        Метод возвращает запрос без подстановки параметров.
+
+        Args:
+            sql: sql-запрос.
+            params: параметры запроса.
+
+        Returns:
+            sql-запрос.
+        """
+        return sql.encode()
+
+    def copy_expert(self, sql: str, stream: CopyStream, size: int):
+        """
+        Метод пишет куски данных COPY в буфер.
+
+        Args:
+            sql: команда COPY.
+            stream: буфер данных COPY.
+            size: размер куска.
+
+        Raises:
+            Exception: заданная ошибка COPY.
+        """
+        for chunk in self._chunks:
+            stream.write(chunk)
+
+        if self._error is not None:
+            raise self._error
+
+
+class FakeConnection:
+    """Класс соединения с PostgreSQL, курсоры которого отдают заранее заданные данные COPY."""
+
+    def __init__(self, chunks: List[bytes], error: Optional[Exception] = None):
+        """
+        Инициализирующий метод.
+
+        Args:
+            chunks: куски данных COPY.
+            error: ошибка, которой COPY завершается после всех кусков.
+        """
+        self._chunks = chunks
+        self._error = error
+        self.is_rolled_back = False
+
+    def cursor(self) -> FakeCursor:
+        """
+        Метод возвращает курсор.
+
+        Returns:
+            курсор.
+        """
+        return FakeCursor(self._chunks, self._error)
+
+    def cancel(self):
+        """Метод отменяет выполняющуюся команду."""
+
+    def rollback(self):
+        """Метод откатывает транзакцию."""
+        self.is_rolled_back = True
+
+
+def split_bytes(data: bytes, size: int) -> List[bytes]:
+    """
+    Функция делит данные на куски заданного размера.
+
+    Args:
+        data: данные.
+        size: размер куска.
+
+    Returns:
+        куски данных.
+    """
+    return [data[start:start + size] for start in range(0, len(data), size)]
+
+
+class Testing(unittest.TestCase):
+    """Класс для тестирования разбора данных COPY."""
+
+    def setUp(self):
+        """Метод формирует данные COPY: документ, удаленный фильм и строку без состояния."""
+        rows = (f'1\x02{DOCUMENT}\x02{STATE}', f'2\x02\x02{STATE}', '3\x02{"id": "3"}\x02')
+        self.data = ''.join(f'{row}\n' for row in rows).encode()
+
+    def extract(self, connection: FakeConnection, json_documents: bool = False) -> List[Dict[str, Any]]:
+        """
+        Метод извлекает строки COPY.
+
+        Args:
+            connection: соединение с PostgreSQL.
+            json_documents: True - документ передается дальше JSON-текстом.
+
+        Returns:
+            строки COPY.
+        """
+        query = FilmworkMoviePostgreETLQuery(ETLProcessType.MOVIE_FILM_WORK, MemoryStorage())
+        self.extractor = CopyPostgreExtractor(
+            connection, query, buffer_size=100, json_documents=json_documents, copy_buffer_chunks=2,
+        )
+        return list(self.extractor.extract())
+
+    def test_rows_split_across_chunks(self):
+        """Метод проверяет, что строки и многобайтные символы, разрезанные между кусками, собираются целиком."""
+        for chunk_size in (1, 7, len(self.data)):
+            with self.subTest(chunk_size=chunk_size):
+                rows = self.extract(FakeConnection(split_bytes(self.data, chunk_size)))
+
+                self.assertEqual(rows, [
+                    {**json.loads(DOCUMENT), 'modified_state': STATE},
+                    {'modified_state': STATE, 'id': '2', '_op_type': 'delete'},
+                    {'id': '3', 'modified_state': None},
+                ])
+                self.assertEqual(self.extractor.extracted_count, 3)
+
+    def test_escaped_document(self):
+        """Метод проверяет, что экранированные символы JSON-документа передаются без изменений."""
+        rows = self.extract(FakeConnection(split_bytes(self.data, 5)), json_documents=True)
+
+        self.assertEqual(rows[0], {'modified_state': STATE, 'id': '1', 'document': DOCUMENT})
+        self.assertEqual(json.loads(rows[0]['document'])['description'], 'tab\t"quote" \\ \x01\x02')
+
+    def test_null_values(self):
+        """Метод проверяет, что пустой документ - удаление фильма, а пустое состояние - NULL."""
+        rows = self.extract(FakeConnection([self.data]))
+
+        self.assertEqual(rows[1]['_op_type'], 'delete')
+        self.assertIsNone(rows[2]['modified_state'])
+        self.assertEqual(self.extractor.last_states, {'modified_film_work': None})
+
+    def test_last_line_without_newline(self):
+        """Метод проверяет, что последняя строка без перевода строки не теряется."""
+        stream = CopyStream(max_chunks=4)
+        stream.write(b'1\x02{}\n2\x02')
+        stream.write(b'{}')
+        stream.finish()
+
+        self.assertEqual(list(stream.lines()), [b'1\x02{}', b'2\x02{}'])
+
+    def test_copy_error(self):
+        """Метод проверяет, что ошибка COPY передается читателю после полученных строк."""
+        error = RuntimeError('COPY прервана')
+        connection = FakeConnection(split_bytes(self.data, 7), error)
+
+        with self.assertRaises(RuntimeError) as context:
+            self.extract(connection)
+
+        self.assertIs(context.exception, error)
+        self.assertEqual(self.extractor.extracted_count, 3)
+        self.assertTrue(connection.is_rolled_back)
+
+
+if __name__ == '__main__':
+    unittest.main()
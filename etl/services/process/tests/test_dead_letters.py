@@ -0,0 +1,89 @@
+"""Модуль отвечает за тесты загрузки с сохранением незагруженных документов."""
+
+import unittest
+from typing import Any, Dict, List
+from unittest import mock
+
+from elastic_transport import JsonSerializer
+
+from services.storages.dead_letters import BaseDeadLetterStorage
+
+from ..loaders.loaders import DeadLetterElasticsearchLoader
+
+
+class ListDeadLetterStorage(BaseDeadLetterStorage):
+    """Класс хранит незагруженные документы в списке."""
+
+    def __init__(self):
+        """Инициализирующий метод."""
+        self.records: List[Dict[str, Any]] = []
+
+    def put_many(self, records: List[Dict[str, Any]]):
+        """
+        Метод сохраняет записи о незагруженных документах.
+
+        Args:
+            records: записи о незагруженных документах.
+        """
+        self.records.extend(records)
+
+
+class PassValidator:
+    """Класс валидатора, который считает валидными все данные."""
+
+    def get_valid_data(self, data_for_validate):
+        """
+        Метод возвращает данные без изменений.
+
+        Args:
+            data_for_validate: данные для валидации.
+
+        Returns:
+            данные для загрузки.
+        """
+        return data_for_validate
+
+
+class Testing(unittest.TestCase):
+    """Класс для тестирования загрузчика dead_letter."""
+
+    def setUp(self):
+        """Метод создает клиент Elasticsearch, который отклоняет документ bad."""
+        self.client = mock.MagicMock()
+        self.client.options.return_value = self.client
+        self.client.transport.serializers.get_serializer.return_value = JsonSerializer()
+        self.client.bulk.return_value = mock.MagicMock(body={
+            'took': 1,
+            'errors': True,
+            'items': [
+                {'index': {'_id': 'good', 'status': 201}},
+                {'index': {'_id': 'bad', 'status': 400, 'error': {'type': 'mapper_parsing_exception'}}},
+                {'delete': {'_id': 'missing', 'status': 404}},
+            ],
+        })
+        self.dead_letters = ListDeadLetterStorage()
+        self.loader = DeadLetterElasticsearchLoader(
+            self.client,
+            'movies',
+            PassValidator(),
+            dead_letters=self.dead_letters,
+        )
+
+    def test_failed_document_goes_to_dead_letters(self):
+        """Метод проверяет, что отклоненный документ сохраняется, а загрузка считается успешной."""
+        is_loaded = self.loader.load([
+            {'_id': 'good', 'title': 'Good'},
+            {'_id': 'bad', 'title': 'Bad'},
+            {'_id': 'missing', '_op_type': 'delete'},
+        ])
+
+        self.assertTrue(is_loaded)
+        self.assertEqual(len(self.dead_letters.records), 1)
+        dead_letter = self.dead_letters.records[0]
+        self.assertEqual(dead_letter['id'], 'bad')
+        self.assertEqual(dead_letter['status'], 400)
+        self.assertEqual(dead_letter['action'], {'_id': 'bad', 'title': 'Bad'})
+
+
+if __name__ == '__main__':
+    unittest.main()
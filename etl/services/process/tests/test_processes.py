@@ -0,0 +1,88 @@
+"""Модуль отвечает за тесты блокировки ETL-процесса и его состояний."""
+
+import unittest
+
+from config.settings import ETLProcessType
+from services.metrics.memory import CYCLE_PEAK_RSS_KB, PEAK_RSS_KB, cycle_peak_rss_metric, peak_rss_metric
+from services.process.processes import ETLProcess, ETLProcessParameters
+from services.storages.key_value_decorators import PreloadedKeyValueDecorator
+from services.storages.key_value_storages import MemoryStorage
+from services.storages.locks import LocalLock
+
+STATE_NAME = 'modified_film_work'
+
+LOCK_NAME = 'test_etl_lock:movies'
+
+
+def get_process(state_storage: PreloadedKeyValueDecorator) -> ETLProcess:
+    """
+    Функция возвращает ETL-процесс фильмов с общей блокировкой.
+
+    Извлекатель и загрузчик не нужны: проверяется только работа с блокировкой и состояниями.
+
+    Args:
+        state_storage: хранилище состояний.
+
+    Returns:
+        ETL-процесс.
+    """
+    return ETLProcess(ETLProcessParameters(
+        process_type=ETLProcessType.MOVIE_FILM_WORK,
+        state_storage=state_storage,
+        extractor=None,
+        loader=None,
+        lock=LocalLock(LOCK_NAME),
+        state_names=(STATE_NAME,),
+    ))
+
+
+class Testing(unittest.TestCase):
+    """Класс для тестирования блокировки ETL-процесса и его состояний."""
+
+    def test_lock_refreshes_preloaded_states(self):
+        """Метод проверяет, что процесс видит состояние, сохраненное под блокировкой после загрузки хранилища."""
+        storage = MemoryStorage()
+        storage.set_value(STATE_NAME, '2023-01-01 00:00:00.000000+0000')
+        first_replica_storage = PreloadedKeyValueDecorator(storage, [STATE_NAME])
+        second_replica_storage = PreloadedKeyValueDecorator(storage, [STATE_NAME])
+
+        with get_process(first_replica_storage):
+            first_replica_storage.set_many({STATE_NAME: '2023-01-02 00:00:00.000000+0000'})
+
+        self.assertEqual(second_replica_storage.get_value(STATE_NAME), '2023-01-01 00:00:00.000000+0000')
+
+        with get_process(second_replica_storage):
+            self.assertEqual(second_replica_storage.get_value(STATE_NAME), '2023-01-02 00:00:00.000000+0000')
+
+    def test_shared_storage_keeps_own_writes(self):
+        """Метод проверяет, что процессы с общим хранилищем видят состояние, сохраненное предыдущим процессом."""
+        state_storage = PreloadedKeyValueDecorator(MemoryStorage(), [STATE_NAME])
+
+        with get_process(state_storage):
+            state_storage.set_many({STATE_NAME: '2023-01-02 00:00:00.000000+0000'})
+
+        with get_process(state_storage):
+            self.assertEqual(state_storage.get_value(STATE_NAME), '2023-01-02 00:00:00.000000+0000')
+
+    def test_peak_rss_of_overlapping_processes_not_recorded(self):
+        """Метод проверяет, что пик памяти пишется по типу процесса, только если процесс выполнялся один."""
+        PEAK_RSS_KB.clear()
+        CYCLE_PEAK_RSS_KB.clear()
+
+        with peak_rss_metric(ETLProcessType.MOVIE_FILM_WORK):
+            with peak_rss_metric(ETLProcessType.GENRE_MODIFIED):
+                pass
+
+        with cycle_peak_rss_metric('scheduler'):
+            with peak_rss_metric(ETLProcessType.PERSON_MODIFIED):
+                pass
+
+        with peak_rss_metric(ETLProcessType.MOVIE_GENRE):
+            pass
+
+        self.assertEqual(list(PEAK_RSS_KB), [ETLProcessType.MOVIE_GENRE])
+        self.assertEqual(list(CYCLE_PEAK_RSS_KB), ['scheduler'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+"""Модуль отвечает за тесты запросов ETL-процесса."""
+
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from config.settings import ETLProcessType, Shard
+from services.process.processes import ETLProcess
+from services.storages.key_value_storages import MemoryStorage
+
+from ..queries.queries import (
+    FilmworkMoviePostgreETLQuery, GenreMoviePostgreETLQuery, OutboxMoviePostgreETLQuery, PersonMoviePostgreETLQuery,
+)
+
+
+class Testing(unittest.TestCase):
+    """Класс для тестирования запросов ETL-процесса."""
+
+    def test_outbox_row_has_no_state_fields(self):
+        """Метод проверяет, что строки и документы outbox не содержат полей состояния."""
+        query = OutboxMoviePostgreETLQuery(ETLProcessType.MOVIE_OUTBOX, MemoryStorage())
+
+        self.assertEqual(query.state_fields, {})
+        self.assertNotIn('modified_state', query.get_sql())
+        self.assertNotIn('modified_state', query.get_document_sql())
+        self.assertIn('as directors\n', query.get_sql())
+
+    def test_movie_row_has_state_fields(self):
+        """Метод проверяет, что строки фильмов по-прежнему содержат поля состояния."""
+        query = FilmworkMoviePostgreETLQuery(ETLProcessType.MOVIE_FILM_WORK, MemoryStorage(), batch_size=100)
+
+        self.assertIn('as directors\n        , fw.modified modified_state, fw.id modified_state_id', query.get_sql())
+
+    def test_sharded_batch_selects_shard_links(self):
+        """Метод проверяет, что пачка жанров и персон выбирается только среди связей с фильмами шарда."""
+        shard = Shard(index=1, count=4)
+        shard_condition = '(hashtext({column}::text) & 2147483647) %% %(shard_count)s = %(shard_index)s'
+
+        for query_class, link_alias in ((GenreMoviePostgreETLQuery, 'gfw'), (PersonMoviePostgreETLQuery, 'pfw')):
+            with self.subTest(query_class=query_class.__name__):
+                query = query_class(ETLProcessType.MOVIE_GENRE, MemoryStorage(), batch_size=100, shard=shard)
+                sql = query.get_sql()
+                link_condition = shard_condition.format(column=f'{link_alias}.film_work_id')
+
+                self.assertIn(f'.id AND {link_condition})', sql)
+                self.assertIn(shard_condition.format(column='fw.id'), sql)
+                self.assertEqual(query.get_params()['shard_index'], 1)
+
+    def test_state_keeps_timezone(self):
+        """Метод проверяет, что одно и то же время из psycopg2 и asyncpg сохраняется как один момент времени."""
+        local_time = datetime(2023, 1, 1, 15, 0, 0, 123456, tzinfo=timezone(timedelta(hours=3)))
+        states = ETLProcess._format_states({'local': local_time, 'utc': local_time.astimezone(timezone.utc)})
+
+        self.assertEqual(datetime.fromisoformat(states['local']), datetime.fromisoformat(states['utc']))
+        self.assertEqual(states['utc'], '2023-01-01 12:00:00.123456+0000')
+
+    def test_state_compared_as_timestamptz(self):
+        """Метод проверяет, что сохраненное время сравнивается с полями timestamptz без приведения к timestamp."""
+        query = FilmworkMoviePostgreETLQuery(ETLProcessType.MOVIE_FILM_WORK, MemoryStorage(), batch_size=100)
+
+        self.assertIn('%(modified_state)s::timestamptz', query.get_sql())
+        self.assertNotIn('::timestamp,', query.get_sql())
+
+
+if __name__ == '__main__':
+    unittest.main()
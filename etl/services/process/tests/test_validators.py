@@ -2,7 +2,8 @@
 
 import unittest
 
-from ..validators.validators import ElasticsearchValidator
+from ..validators.pydantic_models import Movie
+from ..validators.validators import ElasticsearchValidator, BatchElasticsearchValidator
 
 
 class Testing(unittest.TestCase):
@@ -110,5 +111,52 @@ class Testing(unittest.TestCase):
         self.assertEqual([], validated_data)
 
 
+class TestBatchValidator(unittest.TestCase):
+    """Класс для тестирования пакетного валидатора."""
+
+    valid_row = {
+        'id': 'ffaec4b6-477d-4247-add0-dbe2ad91b3dd',
+        'imdb_rating': 4.0,
+        'genres': [{'id': '1cacff68-643e-4ddd-8f57-84b62538081a', 'name': 'Family'}],
+        'title': 'Star Academy',
+        'description': '',
+        'persons': ['5a78f3a6-5471-42c2-a5ef-8f45ee9ced63'],
+        'directors_names': [],
+        'actors_names': ['Nikos Aliagas'],
+        'writers_names': None,
+        'actors': [{'id': '5a78f3a6-5471-42c2-a5ef-8f45ee9ced63', 'name': 'Nikos Aliagas'}],
+        'writers': [],
+        'directors': [],
+        '_id': 'ffaec4b6-477d-4247-add0-dbe2ad91b3dd',
+    }
+
+    def test_same_result_as_row_validator(self):
+        """Метод проверяет, что пакетный валидатор отбирает те же строки в том же порядке."""
+        data_for_validate = [
+            self.valid_row,
+            {**self.valid_row, 'id': None},
+            {**self.valid_row, 'title': 12313},
+            {**self.valid_row, 'actors': 142},
+            {**self.valid_row, 'genres': [{'id': '1cacff68-643e-4ddd-8f57-84b62538081a'}]},
+            {'_op_type': 'delete', 'id': 'ffaec4b6-477d-4247-add0-dbe2ad91b3dd'},
+            {'id': 'ffaec4b6-477d-4247-add0-dbe2ad91b3df'},
+        ]
+        row_validator = ElasticsearchValidator(Movie)
+        batch_validator = BatchElasticsearchValidator(Movie, batch_size=3)
+
+        self.assertEqual(
+            list(row_validator.get_valid_data(data_for_validate)),
+            list(batch_validator.get_valid_data(data_for_validate)),
+        )
+
+    def test_invalid_rows_are_checked_by_model(self):
+        """Метод проверяет, что строка, не прошедшая быструю проверку, проверяется моделью."""
+        data_for_validate = [self.valid_row, {**self.valid_row, 'imdb_rating': '4.5'}, {**self.valid_row, 'id': None}]
+        validator = BatchElasticsearchValidator(Movie)
+
+        validated_data = list(validator.get_valid_data(data_for_validate))
+        self.assertEqual(data_for_validate[:2], validated_data)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -78,6 +78,9 @@ def get_model_for_process_type(process_type: ETLProcessType) -> BaseModel:
         ETLProcessType.MOVIE_FILM_WORK: Movie,
         ETLProcessType.MOVIE_PERSON: Movie,
         ETLProcessType.MOVIE_GENRE: Movie,
+        ETLProcessType.MOVIE_MERGED: Movie,
+        ETLProcessType.MOVIE_OUTBOX: Movie,
+        ETLProcessType.MOVIE_DOCUMENT: Movie,
         ETLProcessType.GENRE_CREATED_LINK: Genre,
         ETLProcessType.PERSON_CREATED_LINK: Person,
         ETLProcessType.GENRE_MODIFIED: Genre,
@@ -1,12 +1,169 @@
 """Модуль отвечает за валидаторы данных, которые мы хотим загрузить."""
 from abc import ABC, abstractmethod
-from typing import Generator, Iterable
+from functools import partial
+from itertools import islice
+from typing import Any, Callable, Generator, Iterable, List, Optional, Set, Tuple, Type
 
-from pydantic import ValidationError, BaseModel
+from pydantic import ValidationError, BaseModel, Extra
+from pydantic.fields import ModelField, SHAPE_LIST, SHAPE_SINGLETON
+from config.settings import ValidatorType, ES_VALIDATOR_BATCH_SIZE
 from services.logs.logs_setup import get_logger
 
 logger = get_logger()
 
+ValueChecker = Callable[[Any], bool]
+RowSchema = Tuple[Tuple[str, ValueChecker], ...]
+
+SCALAR_CHECKERS = {
+    str: lambda value: type(value) is str,
+    int: lambda value: type(value) is int,
+    float: lambda value: type(value) in (float, int),
+    bool: lambda value: type(value) is bool,
+}
+
+
+def is_passthrough_action(row: dict) -> bool:
+    """
+    Функция определяет bulk-действия, которые загружаются без валидации.
+
+    Это операции удаления документов и документы, которые PostgreSQL собрал в JSON-текст сам:
+    их структура задается SQL-запросом.
+
+    Args:
+        row: строка для загрузки.
+
+    Returns:
+        True - строку не нужно валидировать.
+    """
+    return row.get('_op_type') == 'delete' or isinstance(row.get('_source'), str)
+
+
+def compile_row_schema(model: Type[BaseModel]) -> Optional[RowSchema]:
+    """
+    Функция компилирует модель pydantic в набор быстрых проверок полей.
+
+    Проверки строже pydantic: они принимают только значения, которые pydantic принял бы без приведения типов.
+    Модели с валидаторами, запретом лишних полей и неизвестными типами полей не компилируются.
+
+    Args:
+        model: модель pydantic.
+
+    Returns:
+        пары (наименование поля в данных, проверка значения) или None, если модель не удалось скомпилировать.
+    """
+    if model.__config__.extra == Extra.forbid or model.__pre_root_validators__ or model.__post_root_validators__:
+        return None
+
+    schema = []
+
+    for field in model.__fields__.values():
+        checker = _compile_field(field)
+
+        if checker is None:
+            return None
+
+        schema.append((field.alias, checker))
+
+    return tuple(schema)
+
+
+def _compile_field(field: ModelField) -> Optional[ValueChecker]:
+    """
+    Функция компилирует поле модели pydantic в проверку значения.
+
+    Args:
+        field: поле модели.
+
+    Returns:
+        проверка значения или None, если поле не удалось скомпилировать.
+    """
+    if field.class_validators or field.pre_validators or field.post_validators:
+        return None
+
+    item_checker = _compile_type(field.type_)
+
+    if item_checker is None:
+        return None
+
+    if field.shape == SHAPE_SINGLETON:
+        value_checker = item_checker
+    elif field.shape == SHAPE_LIST:
+        value_checker = partial(_check_list, item_checker)
+    else:
+        return None
+
+    return partial(_check_nullable, value_checker, field.allow_none)
+
+
+def _compile_type(type_: Any) -> Optional[ValueChecker]:
+    """
+    Функция компилирует тип значения поля в проверку значения.
+
+    Args:
+        type_: тип значения.
+
+    Returns:
+        проверка значения или None, если тип не поддерживается.
+    """
+    if type_ in SCALAR_CHECKERS:
+        return SCALAR_CHECKERS[type_]
+
+    if isinstance(type_, type) and issubclass(type_, BaseModel):
+        nested_schema = compile_row_schema(type_)
+
+        if nested_schema is None:
+            return None
+
+        return partial(_check_model, nested_schema)
+
+    return None
+
+
+def _check_nullable(value_checker: ValueChecker, allow_none: bool, value: Any) -> bool:
+    """
+    Функция проверяет значение поля, которое может быть пустым.
+
+    Args:
+        value_checker: проверка непустого значения.
+        allow_none: True - пустое значение допустимо.
+        value: значение.
+
+    Returns:
+        True - значение прошло проверку.
+    """
+    if value is None:
+        return allow_none
+
+    return value_checker(value)
+
+
+def _check_list(item_checker: ValueChecker, value: Any) -> bool:
+    """
+    Функция проверяет, что значение - список из допустимых элементов.
+
+    Args:
+        item_checker: проверка элемента списка.
+        value: значение.
+
+    Returns:
+        True - значение прошло проверку.
+    """
+    return type(value) is list and all(map(item_checker, value))
+
+
+def _check_model(schema: RowSchema, value: Any) -> bool:
+    """
+    Функция проверяет, что значение - словарь, соответствующий вложенной модели.
+
+    Args:
+        schema: скомпилированная схема вложенной модели.
+        value: значение.
+
+    Returns:
+        True - значение прошло проверку.
+    """
+    return isinstance(value, dict) and all(check(value.get(name)) for name, check in schema)
+
 
 class BaseValidator(ABC):
     """Класс отвечает за валидацию данных, которые получает."""
@@ -52,15 +209,127 @@ class ElasticsearchValidator(BaseValidator):
         """
         Метод проверяет конкретную строку на валидность.
 
+        Операции удаления и готовые JSON-документы не валидируются.
+
         Args:
             row: строка для проверки.
 
         Returns:
             True - строка валидна, False - строка не валидна.
         """
+        if is_passthrough_action(row):
+            return True
+
         try:
             self.model(**row)
             return True
         except ValidationError:
             logger.warning(f'Запись невалидна: {row}')
             return False
+
+
+class BatchElasticsearchValidator(ElasticsearchValidator):
+    """
+    Класс отвечает за пакетную валидацию данных для выгрузки в Elasticsearch.
+
+    Данные проверяются пачками по столбцам скомпилированной схемой модели, без создания объектов pydantic.
+    Через pydantic построчно проверяются только строки, не прошедшие быструю проверку, поэтому результат
+    валидации совпадает с ElasticsearchValidator.
+    """
+
+    def __init__(self, model: BaseModel, batch_size: int = ES_VALIDATOR_BATCH_SIZE):
+        """
+        Инициализирующий метод.
+
+        Args:
+            model: модель, по которой валидируют данные.
+            batch_size: размер пачки для проверки.
+        """
+        super().__init__(model)
+        self._batch_size = batch_size
+        self._schema = compile_row_schema(model)
+
+        if self._schema is None:
+            logger.warning(f'Модель {model.__name__} не удалось скомпилировать. Данные проверяются построчно.')
+
+    def get_valid_data(self, data_for_validate: Iterable[dict]) -> Generator:
+        """
+        Метод предоставляет валидные данные для загрузки из предоставленног списка.
+
+        Args:
+            data_for_validate: итерируемый объект для валидации.
+
+        Yields:
+            генератор валидных данных.
+        """
+        logger.info('Отбираем только валидные данные пачками.')
+        rows = iter(data_for_validate)
+
+        while batch := list(islice(rows, self._batch_size)):
+            yield from self._get_valid_batch(batch)
+
+    def _get_valid_batch(self, batch: List[dict]) -> Generator:
+        """
+        Метод отбирает валидные строки пачки с сохранением порядка.
+
+        Args:
+            batch: пачка строк.
+
+        Yields:
+            генератор валидных строк.
+        """
+        suspicious_rows = self._find_suspicious_rows(batch)
+
+        for index, row in enumerate(batch):
+            if index not in suspicious_rows or self._validate_row(row):
+                yield row
+
+    def _find_suspicious_rows(self, batch: List[dict]) -> Set[int]:
+        """
+        Метод находит строки пачки, которые не прошли быструю проверку.
+
+        Args:
+            batch: пачка строк.
+
+        Returns:
+            индексы строк, которые нужно проверить через pydantic.
+        """
+        if self._schema is None:
+            return set(range(len(batch)))
+
+        suspicious_rows = {index for index, row in enumerate(batch) if is_passthrough_action(row)}
+
+        for name, check in self._schema:
+            column = [row.get(name) for row in batch]
+            suspicious_rows.update(index for index, value in enumerate(column) if not check(value))
+
+        return suspicious_rows
+
+
+class ElasticsearchValidatorFactory:
+    """Фабрика классов для валидаторов данных, загружаемых в Elasticsearch."""
+
+    validators = {
+        ValidatorType.ROW: ElasticsearchValidator,
+        ValidatorType.BATCH: BatchElasticsearchValidator,
+    }
+
+    @staticmethod
+    def validator_by_type(validator_type: ValidatorType, *args, **kwargs) -> ElasticsearchValidator:
+        """
+        Метод возвращает инстанс валидатора по заданному типу.
+
+        Args:
+            validator_type: тип валидатора.
+            args: позиционные аргументы.
+            kwargs: именнованные аргументы.
+
+        Returns:
+            validator (ElasticsearchValidator): валидатор.
+        """
+        try:
+            validator_class = ElasticsearchValidatorFactory.validators[validator_type]
+            return validator_class(*args, **kwargs)
+        except KeyError as error:
+            logger.error(f'Для типа {validator_type} не существует реализации валидатора.', exc_info=True)
+            raise error
@@ -0,0 +1,163 @@
+"""Модуль отвечает за хранилища документов, которые не удалось загрузить в целевую систему (dead letters)."""
+import json
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+
+from redis import Redis
+
+from config.settings import (
+    DeadLetterStorageType, ES_DEAD_LETTER_STORAGE_TYPE, ES_DEAD_LETTER_KEY, ES_DEAD_LETTER_MAX_LENGTH,
+    ES_DEAD_LETTER_FILE,
+)
+
+from ..decorators.resiliency import backoff
+from ..logs.logs_setup import get_logger
+
+logger = get_logger()
+
+
+def serialize_dead_letter(record: Dict[str, Any]) -> str:
+    """
+    Функция сериализует запись о незагруженном документе в JSON-строку.
+
+    Значения, которые не сериализуются в JSON (uuid, даты), приводятся к строке.
+
+    Args:
+        record: запись о незагруженном документе.
+
+    Returns:
+        JSON-строка.
+    """
+    return json.dumps(record, ensure_ascii=False, default=str)
+
+
+class BaseDeadLetterStorage(ABC):
+    """Базовый класс хранилища документов, которые не удалось загрузить в целевую систему."""
+
+    @abstractmethod
+    def put_many(self, records: List[Dict[str, Any]]):
+        """
+        Метод сохраняет записи о незагруженных документах.
+
+        Args:
+            records: записи о незагруженных документах.
+        """
+
+
+class RedisDeadLetterStorage(BaseDeadLetterStorage):
+    """
+    Класс хранит незагруженные документы в списке Redis.
+
+    Список ограничен max_length записями: при переполнении удаляются самые старые записи.
+    """
+
+    def __init__(self, redis_client: Redis, key: str, max_length: int):
+        """
+        Инициализирующий метод.
+
+        Args:
+            redis_client: клиент Redis.
+            key: ключ списка.
+            max_length: максимальное количество записей в списке.
+        """
+        self._redis = redis_client
+        self._key = key
+        self._max_length = max_length
+
+    @backoff()
+    def put_many(self, records: List[Dict[str, Any]]):
+        """
+        Метод добавляет записи в конец списка одной транзакцией MULTI/EXEC.
+
+        Args:
+            records: записи о незагруженных документах.
+        """
+        if not records:
+            return
+
+        with self._redis.pipeline() as pipeline:
+            pipeline.rpush(self._key, *map(serialize_dead_letter, records))
+            pipeline.ltrim(self._key, -self._max_length, -1)
+            pipeline.execute()
+
+
+class FileDeadLetterStorage(BaseDeadLetterStorage):
+    """Класс хранит незагруженные документы в локальном файле, по одной JSON-строке на документ."""
+
+    _file_lock = threading.Lock()
+
+    def __init__(self, file_path: str):
+        """
+        Инициализирующий метод.
+
+        Args:
+            file_path: путь к файлу.
+        """
+        self._file_path = file_path
+
+    def put_many(self, records: List[Dict[str, Any]]):
+        """
+        Метод дописывает записи в конец файла.
+
+        Args:
+            records: записи о незагруженных документах.
+        """
+        if not records:
+            return
+
+        with self._file_lock:
+            with open(self._file_path, 'a', encoding='utf-8') as dead_letter_file:
+                dead_letter_file.writelines(f'{serialize_dead_letter(record)}\n' for record in records)
+
+
+class DeadLetterStorageFactory:
+    """Фабрика классов для хранилищ незагруженных документов."""
+
+    storages = {
+        DeadLetterStorageType.REDIS: RedisDeadLetterStorage,
+        DeadLetterStorageType.FILE: FileDeadLetterStorage,
+    }
+
+    @staticmethod
+    def storage_by_type(storage_type: DeadLetterStorageType, *args, **kwargs) -> BaseDeadLetterStorage:
+        """
+        Метод возвращает инстанс хранилища по заданному типу.
+
+        Args:
+            storage_type: тип хранилища.
+            args: позиционные аргументы.
+            kwargs: именнованные аргументы.
+
+        Returns:
+            storage (BaseDeadLetterStorage): хранилище.
+        """
+        try:
+            storage_class = DeadLetterStorageFactory.storages[storage_type]
+            return storage_class(*args, **kwargs)
+        except KeyError as error:
+            logger.error(f'Для хранилища типа {storage_type.value} не существует реализации.', exc_info=True)
+            raise error
+
+
+def get_dead_letter_storage(redis_client: Optional[Redis] = None) -> BaseDeadLetterStorage:
+    """
+    Функция возвращает хранилище незагруженных документов из настроек.
+
+    Процессы без клиента Redis (например, переиндексация) всегда пишут в файл.
+
+    Args:
+        redis_client: клиент Redis.
+
+    Returns:
+        хранилище незагруженных документов.
+    """
+    if ES_DEAD_LETTER_STORAGE_TYPE == DeadLetterStorageType.REDIS and redis_client is not None:
+        return DeadLetterStorageFactory.storage_by_type(
+            DeadLetterStorageType.REDIS,
+            redis_client,
+            ES_DEAD_LETTER_KEY,
+            ES_DEAD_LETTER_MAX_LENGTH,
+        )
+
+    return DeadLetterStorageFactory.storage_by_type(DeadLetterStorageType.FILE, ES_DEAD_LETTER_FILE)
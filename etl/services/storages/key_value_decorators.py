@@ -1,8 +1,9 @@
 """Модуль отвечает за декораторы к Key-Value хранилищам."""
 from abc import ABC
-from typing import Any, Optional
+from typing import Any, Dict, Iterable, Optional
 
 from .key_value_storages import KeyValueStorage
+from .locks import BaseLock, LockLostError
 from ..decorators.resiliency import backoff
 
 
@@ -49,6 +50,50 @@ class BaseKeyValueDecorator(ABC):
         """
         self._storage.delete_keys(*keys)
 
+    def get_many(self, *keys: Any) -> Dict[Any, Optional[Any]]:
+        """
+        Метод извлекает значения нескольких ключей из хранилища.
+
+        Args:
+            keys (Any): ключи для поиска значений.
+
+        Returns:
+            словарь, где ключ - ключ хранилища, значение - значение ключа или None.
+        """
+        return self._storage.get_many(*keys)
+
+    def set_many(self, key_values: Dict[Any, Any]):
+        """
+        Метод устанавливает значения нескольких ключей.
+
+        Args:
+            key_values (Dict[Any, Any]): словарь, где ключ - ключ хранилища, значение - новое значение ключа.
+        """
+        self._storage.set_many(key_values)
+
+    def refresh(self, *keys: Any):
+        """
+        Метод перечитывает значения ключей из хранилища, если они были запомнены заранее.
+
+        Args:
+            keys (Any): ключи, значения которых нужно перечитать.
+        """
+        self._storage.refresh(*keys)
+
+    def set_many_fenced(self, key_values: Dict[Any, Any], lock_name: Any, token: int) -> bool:
+        """
+        Метод устанавливает значения нескольких ключей, только если блокировка принадлежит владельцу токена.
+
+        Args:
+            key_values (Dict[Any, Any]): словарь, где ключ - ключ хранилища, значение - новое значение ключа.
+            lock_name (Any): ключ блокировки.
+            token (int): fencing-токен владельца блокировки.
+
+        Returns:
+            True - значения записаны, False - блокировка принадлежит другому владельцу.
+        """
+        return self._storage.set_many_fenced(key_values, lock_name, token)
+
 
 class BackoffKeyValueDecorator(BaseKeyValueDecorator):
     """Декоратор для хранилища, обеспечивающий отказоустойчивую работу с хранилищем."""
@@ -86,3 +131,221 @@ class BackoffKeyValueDecorator(BaseKeyValueDecorator):
             keys (Any): ключ для удаления.
         """
         super().delete_keys(*keys)
+
+    @backoff()
+    def get_many(self, *keys: Any) -> Dict[Any, Optional[Any]]:
+        """
+        Метод извлекает значения нескольких ключей из хранилища.
+
+        Args:
+            keys (Any): ключи для поиска значений.
+
+        Returns:
+            словарь, где ключ - ключ хранилища, значение - значение ключа или None.
+        """
+        return super().get_many(*keys)
+
+    @backoff()
+    def set_many(self, key_values: Dict[Any, Any]):
+        """
+        Метод устанавливает значения нескольких ключей.
+
+        Args:
+            key_values (Dict[Any, Any]): словарь, где ключ - ключ хранилища, значение - новое значение ключа.
+        """
+        super().set_many(key_values)
+
+    @backoff()
+    def set_many_fenced(self, key_values: Dict[Any, Any], lock_name: Any, token: int) -> bool:
+        """
+        Метод устанавливает значения нескольких ключей, только если блокировка принадлежит владельцу токена.
+
+        Args:
+            key_values (Dict[Any, Any]): словарь, где ключ - ключ хранилища, значение - новое значение ключа.
+            lock_name (Any): ключ блокировки.
+            token (int): fencing-токен владельца блокировки.
+
+        Returns:
+            True - значения записаны, False - блокировка принадлежит другому владельцу.
+        """
+        return super().set_many_fenced(key_values, lock_name, token)
+
+
+class PreloadedKeyValueDecorator(BaseKeyValueDecorator):
+    """
+    Декоратор для хранилища, который заранее загружает значения заданных ключей одним запросом.
+
+    Значения загруженных ключей читаются из памяти, запись идет сразу в хранилище и обновляет значения в памяти.
+    Остальные ключи, например блокировки, всегда читаются из хранилища.
+
+    Значения в памяти актуальны, только пока загруженные ключи не записывает никто другой. Поэтому ETL-процесс
+    после взятия своей блокировки перечитывает свои ключи методом refresh: пока блокировку держала другая
+    реплика, она могла сохранить более новые значения.
+    """
+
+    def __init__(self, storage: KeyValueStorage, preload_keys: Iterable[Any]):
+        """
+        Инициализирующий метод.
+
+        Args:
+            storage: декорируемое хранилище.
+            preload_keys: ключи, значения которых нужно загрузить заранее.
+        """
+        super().__init__(storage)
+        self._values = self._storage.get_many(*preload_keys)
+
+    def get_value(self, key: Any) -> Optional[Any]:
+        """
+        Метод извлекает значение для указанного ключа из памяти или из хранилища.
+
+        Args:
+            key (Any): ключ для поиска значения.
+
+        Returns:
+            value (Any): значение для указанного ключа
+        """
+        if key in self._values:
+            return self._values[key]
+
+        return super().get_value(key)
+
+    def set_value(self, key: Any, key_value: Any):
+        """
+        Метод устанавливает значение для указанного ключа.
+
+        Args:
+            key (Any): ключ для поиска значения.
+            key_value (Any): значение для указанного ключа
+        """
+        super().set_value(key, key_value)
+        self._remember(key, key_value)
+
+    def delete_keys(self, *keys: Any):
+        """
+        Метод удаляет ключ из хранилища.
+
+        Args:
+            keys (Any): ключ для удаления.
+        """
+        super().delete_keys(*keys)
+
+        for key in keys:
+            if key in self._values:
+                self._values[key] = None
+
+    def get_many(self, *keys: Any) -> Dict[Any, Optional[Any]]:
+        """
+        Метод извлекает значения нескольких ключей из памяти и из хранилища.
+
+        Args:
+            keys (Any): ключи для поиска значений.
+
+        Returns:
+            словарь, где ключ - ключ хранилища, значение - значение ключа или None.
+        """
+        missing_keys = [key for key in keys if key not in self._values]
+        key_values = super().get_many(*missing_keys) if missing_keys else {}
+        return {key: self._values[key] if key in self._values else key_values[key] for key in keys}
+
+    def set_many(self, key_values: Dict[Any, Any]):
+        """
+        Метод устанавливает значения нескольких ключей.
+
+        Args:
+            key_values (Dict[Any, Any]): словарь, где ключ - ключ хранилища, значение - новое значение ключа.
+        """
+        super().set_many(key_values)
+
+        for key, key_value in key_values.items():
+            self._remember(key, key_value)
+
+    def refresh(self, *keys: Any):
+        """
+        Метод перечитывает значения загруженных ключей из хранилища одним запросом.
+
+        Args:
+            keys (Any): ключи, значения которых нужно перечитать.
+        """
+        super().refresh(*keys)
+        preloaded_keys = [key for key in keys if key in self._values]
+
+        if preloaded_keys:
+            self._values.update(self._storage.get_many(*preloaded_keys))
+
+    def set_many_fenced(self, key_values: Dict[Any, Any], lock_name: Any, token: int) -> bool:
+        """
+        Метод устанавливает значения нескольких ключей, только если блокировка принадлежит владельцу токена.
+
+        Args:
+            key_values (Dict[Any, Any]): словарь, где ключ - ключ хранилища, значение - новое значение ключа.
+            lock_name (Any): ключ блокировки.
+            token (int): fencing-токен владельца блокировки.
+
+        Returns:
+            True - значения записаны, False - блокировка принадлежит другому владельцу.
+        """
+        is_written = super().set_many_fenced(key_values, lock_name, token)
+
+        if is_written:
+            for key, key_value in key_values.items():
+                self._remember(key, key_value)
+
+        return is_written
+
+    def _remember(self, key: Any, key_value: Any):
+        """
+        Метод обновляет значение загруженного ключа в памяти.
+
+        Значение приводится к строке, так же как его вернет хранилище.
+
+        Args:
+            key (Any): ключ.
+            key_value (Any): новое значение ключа.
+        """
+        if key in self._values:
+            self._values[key] = str(key_value)
+
+
+class FencedKeyValueDecorator(BaseKeyValueDecorator):
+    """
+    Декоратор для хранилища, который записывает значения только под блокировкой.
+
+    Каждая запись проверяет fencing-токен блокировки. Если блокировку потеряли и ее взял другой владелец,
+    запись отклоняется, поэтому отставший процесс не перезапишет состояние нового владельца.
+    """
+
+    def __init__(self, storage: KeyValueStorage, lock: BaseLock):
+        """
+        Инициализирующий метод.
+
+        Args:
+            storage: декорируемое хранилище.
+            lock: блокировка, под которой идет запись.
+        """
+        super().__init__(storage)
+        self._lock = lock
+
+    def set_value(self, key: Any, key_value: Any):
+        """
+        Метод устанавливает значение для указанного ключа.
+
+        Args:
+            key (Any): ключ для поиска значения.
+            key_value (Any): значение для указанного ключа
+        """
+        self.set_many({key: key_value})
+
+    def set_many(self, key_values: Dict[Any, Any]):
+        """
+        Метод устанавливает значения нескольких ключей.
+
+        Args:
+            key_values (Dict[Any, Any]): словарь, где ключ - ключ хранилища, значение - новое значение ключа.
+
+        Raises:
+            LockLostError: блокировка потеряна, значения не записаны.
+        """
+        token = self._lock.token
+
+        if token is None or not self._storage.set_many_fenced(key_values, self._lock.name, token):
+            raise LockLostError(self._lock.name)
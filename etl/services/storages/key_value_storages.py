@@ -1,9 +1,10 @@
 """Модуль отвечает за описание хранилищ типа Key-Value."""
 from abc import ABC, abstractmethod
 from enum import Enum
-from typing import Any, Optional
+from typing import Any, Dict, Optional
 
 from redis import Redis
+from .locks import FENCED_SET_SCRIPT
 from .storage_typing import RedisKey, RedisValue
 
 from ..logs.logs_setup import get_logger
@@ -15,6 +16,7 @@ class StorageType(str, Enum):
     """Клас описывает доступные типы Key-Value хранилищ."""
 
     REDIS = 'redis'
+    MEMORY = 'memory'
 
 
 class KeyValueStorage(ABC):
@@ -51,6 +53,65 @@ class KeyValueStorage(ABC):
             keys (Any): ключ для удаления.
         """
 
+    def get_many(self, *keys: Any) -> Dict[Any, Optional[Any]]:
+        """
+        Метод извлекает значения нескольких ключей из хранилища.
+
+        По умолчанию значения извлекаются по одному. Хранилища, которые умеют делать это за одно обращение,
+        переопределяют метод.
+
+        Args:
+            keys (Any): ключи для поиска значений.
+
+        Returns:
+            словарь, где ключ - ключ хранилища, значение - значение ключа или None.
+        """
+        return {key: self.get_value(key) for key in keys}
+
+    def set_many(self, key_values: Dict[Any, Any]):
+        """
+        Метод устанавливает значения нескольких ключей.
+
+        По умолчанию значения устанавливаются по одному. Хранилища, которые умеют делать это атомарно
+        за одно обращение, переопределяют метод.
+
+        Args:
+            key_values (Dict[Any, Any]): словарь, где ключ - ключ хранилища, значение - новое значение ключа.
+        """
+        for key, key_value in key_values.items():
+            self.set_value(key, key_value)
+
+    def refresh(self, *keys: Any):
+        """
+        Метод перечитывает значения ключей из хранилища, если они были запомнены заранее.
+
+        Хранилище без кеша всегда читает актуальные значения, поэтому по умолчанию метод ничего не делает.
+
+        Args:
+            keys (Any): ключи, значения которых нужно перечитать.
+        """
+
+    def set_many_fenced(self, key_values: Dict[Any, Any], lock_name: Any, token: int) -> bool:
+        """
+        Метод устанавливает значения нескольких ключей, только если блокировка принадлежит владельцу токена.
+
+        По умолчанию проверка и запись не атомарны. Хранилища, которые умеют делать это атомарно,
+        переопределяют метод.
+
+        Args:
+            key_values (Dict[Any, Any]): словарь, где ключ - ключ хранилища, значение - новое значение ключа.
+            lock_name (Any): ключ блокировки.
+            token (int): fencing-токен владельца блокировки.
+
+        Returns:
+            True - значения записаны, False - блокировка принадлежит другому владельцу.
+        """
+        if self.get_value(lock_name) != str(token):
+            return False
+
+        self.set_many(key_values)
+        return True
+
 
 class RedisStorage(KeyValueStorage):
     """Класс для работы с хранилищем Redis."""
@@ -63,6 +124,7 @@ class RedisStorage(KeyValueStorage):
             redis_adapter (Redis): адаптер, который позволяет работать с реализацией хранилища.
         """
         self.redis_adater = redis_adapter
+        self._fenced_set_script = redis_adapter.register_script(FENCED_SET_SCRIPT)
 
     def get_value(self, key: RedisKey) -> Optional[RedisValue]:
         """
@@ -96,6 +158,56 @@ class RedisStorage(KeyValueStorage):
         """
         self.redis_adater.delete(*keys)
 
+    def get_many(self, *keys: RedisKey) -> Dict[RedisKey, Optional[RedisValue]]:
+        """
+        Метод извлекает значения нескольких ключей из хранилища одной командой MGET.
+
+        Args:
+            keys (RedisKey): ключи для поиска значений.
+
+        Returns:
+            словарь, где ключ - ключ хранилища, значение - значение ключа или None.
+        """
+        if not keys:
+            return {}
+
+        key_values = self.redis_adater.mget(keys)
+        return {key: self.decode_value(key_value) for key, key_value in zip(keys, key_values)}
+
+    def set_many(self, key_values: Dict[RedisKey, RedisValue]):
+        """
+        Метод атомарно устанавливает значения нескольких ключей в одной транзакции MULTI/EXEC.
+
+        Args:
+            key_values (Dict[RedisKey, RedisValue]): словарь, где ключ - ключ хранилища, значение - новое значение.
+        """
+        if not key_values:
+            return
+
+        with self.redis_adater.pipeline(transaction=True) as pipeline:
+            for key, key_value in key_values.items():
+                pipeline.set(key, key_value)
+            pipeline.execute()
+
+    def set_many_fenced(self, key_values: Dict[RedisKey, RedisValue], lock_name: RedisKey, token: int) -> bool:
+        """
+        Метод атомарно устанавливает значения нескольких ключей, если блокировка принадлежит владельцу токена.
+
+        Проверка токена и запись выполняются одним Lua-скриптом.
+
+        Args:
+            key_values (Dict[RedisKey, RedisValue]): словарь, где ключ - ключ хранилища, значение - новое значение.
+            lock_name (RedisKey): ключ блокировки.
+            token (int): fencing-токен владельца блокировки.
+
+        Returns:
+            True - значения записаны, False - блокировка принадлежит другому владельцу.
+        """
+        return bool(self._fenced_set_script(
+            keys=[lock_name, *key_values.keys()],
+            args=[token, *key_values.values()],
+        ))
+
     @staticmethod
     def decode_value(value_for_decode: bytes) -> Optional[RedisValue]:
         """
@@ -116,11 +228,56 @@ class RedisStorage(KeyValueStorage):
             return None
 
 
+class MemoryStorage(KeyValueStorage):
+    """
+    Класс для хранения состояний в памяти процесса.
+
+    Состояния не переживают перезапуск. Подходит для разовых процессов, которые всегда начинают с нуля.
+    """
+
+    def __init__(self):
+        """Инициализирующий метод."""
+        self._values = {}
+
+    def get_value(self, key: Any) -> Optional[Any]:
+        """
+        Метод извлекает значение для указанного ключа из хранилища.
+
+        Args:
+            key (Any): ключ для поиска значения.
+
+        Returns:
+            value (Any): значение для указанного ключа
+        """
+        return self._values.get(key)
+
+    def set_value(self, key: Any, key_value: Any):
+        """
+        Метод устанавливает значение для указанного ключа.
+
+        Args:
+            key (Any): ключ для поиска значения.
+            key_value (Any): значение для указанного ключа
+        """
+        self._values[key] = str(key_value)
+
+    def delete_keys(self, *keys: Any):
+        """
+        Метод удаляет ключ из хранилища.
+
+        Args:
+            keys (Any): ключ для удаления.
+        """
+        for key in keys:
+            self._values.pop(key, None)
+
+
 class KeyValueStorageFactory:
     """Фабрика классов для Key-Value хранилищ."""
 
     storages = {
         StorageType.REDIS: RedisStorage,
+        StorageType.MEMORY: MemoryStorage,
     }
 
     @staticmethod
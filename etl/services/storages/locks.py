@@ -0,0 +1,264 @@
+"""Модуль отвечает за блокировки, которые не дают нескольким ETL-процессам работать с одними данными."""
+import threading
+from abc import ABC, abstractmethod
+from itertools import count
+from time import monotonic, sleep
+from typing import Dict, Optional
+
+from redis import Redis
+
+from ..decorators.resiliency import backoff
+from ..logs.logs_setup import get_logger
+
+logger = get_logger()
+
+RENEW_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+FENCED_SET_SCRIPT = """
+if redis.call('GET', KEYS[1]) ~= ARGV[1] then
+    return 0
+end
+for index = 2, #KEYS do
+    redis.call('SET', KEYS[index], ARGV[index])
+end
+return 1
+"""
+
+RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class LockLostError(Exception):
+    """Класс-исключение. Райзится тогда, когда владелец потерял блокировку и не может записывать данные."""
+
+    def __init__(self, lock_name: str):
+        """
+        Инициализирующий метод.
+
+        Args:
+            lock_name: наименование блокировки.
+        """
+        self.lock_name = lock_name
+        self.message = f'Блокировка {lock_name} потеряна. Запись отклонена.'
+        super().__init__(self.message)
+
+
+class BaseLock(ABC):
+    """
+    Базовый класс блокировки.
+
+    Каждое успешное взятие блокировки выдает fencing-токен, который больше всех выданных ранее.
+    Запись, защищенная токеном, отклоняется, если блокировку успели взять заново с новым токеном.
+    """
+
+    def __init__(self, name: str):
+        """
+        Инициализирующий метод.
+
+        Args:
+            name: наименование блокировки.
+        """
+        self.name = name
+        self.token: Optional[int] = None
+
+    @property
+    def is_held(self) -> bool:
+        """
+        Свойство показывает, удерживается ли блокировка.
+
+        Returns:
+            True - блокировка взята и не потеряна.
+        """
+        return self.token is not None
+
+    @abstractmethod
+    def acquire(self, wait_seconds: float = 0) -> bool:
+        """
+        Метод берет блокировку.
+
+        Args:
+            wait_seconds: сколько ждать освобождения блокировки, если она занята.
+
+        Returns:
+            True - блокировка взята, False - блокировка занята другим владельцем.
+        """
+
+    @abstractmethod
+    def release(self):
+        """Метод освобождает блокировку, если она еще принадлежит владельцу."""
+
+
+class LocalLock(BaseLock):
+    """Класс блокировки в рамках одного процесса Python. Подходит для разовых процессов без реплик."""
+
+    _locks: Dict[str, threading.Lock] = {}
+    _locks_guard = threading.Lock()
+    _tokens = count(1)
+
+    def __init__(self, name: str):
+        """
+        Инициализирующий метод.
+
+        Args:
+            name: наименование блокировки.
+        """
+        super().__init__(name)
+
+        with self._locks_guard:
+            self._lock = self._locks.setdefault(name, threading.Lock())
+
+    def acquire(self, wait_seconds: float = 0) -> bool:
+        """
+        Метод берет блокировку.
+
+        Args:
+            wait_seconds: сколько ждать освобождения блокировки, если она занята.
+
+        Returns:
+            True - блокировка взята, False - блокировка занята другим владельцем.
+        """
+        if not self._lock.acquire(timeout=wait_seconds if wait_seconds > 0 else -1, blocking=wait_seconds > 0):
+            return False
+
+        self.token = next(self._tokens)
+        return True
+
+    def release(self):
+        """Метод освобождает блокировку, если она еще принадлежит владельцу."""
+        if self.token is None:
+            return
+
+        self.token = None
+        self._lock.release()
+
+
+class RedisLock(BaseLock):
+    """
+    Класс распределенной блокировки в Redis.
+
+    Блокировка берется атомарно командой SET NX PX и живет ttl_ms миллисекунд, поэтому упавший владелец
+    не держит ее вечно. Пока блокировка взята, фоновый поток продлевает ее каждые ttl_ms / 3 миллисекунд.
+    Значение ключа блокировки - fencing-токен из счетчика <name>:fencing_token.
+    """
+
+    def __init__(self, redis_client: Redis, name: str, ttl_ms: int):
+        """
+        Инициализирующий метод.
+
+        Args:
+            redis_client: клиент Redis.
+            name: наименование блокировки.
+            ttl_ms: время жизни блокировки без продления в миллисекундах.
+        """
+        super().__init__(name)
+        self._redis = redis_client
+        self._ttl_ms = ttl_ms
+        self._renew_script = redis_client.register_script(RENEW_SCRIPT)
+        self._release_script = redis_client.register_script(RELEASE_SCRIPT)
+        self._heartbeat_stop = threading.Event()
+        self._heartbeat: Optional[threading.Thread] = None
+
+    def acquire(self, wait_seconds: float = 0) -> bool:
+        """
+        Метод берет блокировку.
+
+        Args:
+            wait_seconds: сколько ждать освобождения блокировки, если она занята.
+
+        Returns:
+            True - блокировка взята, False - блокировка занята другим владельцем.
+        """
+        deadline = monotonic() + wait_seconds
+
+        while not self._try_acquire():
+            if monotonic() >= deadline:
+                return False
+            sleep(min(self._ttl_ms / 1000 / 10, max(deadline - monotonic(), 0)))
+
+        self._start_heartbeat()
+        logger.info(f'Блокировка {self.name} взята с токеном {self.token}.')
+        return True
+
+    def release(self):
+        """Метод освобождает блокировку, если она еще принадлежит владельцу."""
+        self._stop_heartbeat()
+
+        if self.token is None:
+            return
+
+        token, self.token = self.token, None
+        self._release(token)
+        logger.info(f'Блокировка {self.name} с токеном {token} освобождена.')
+
+    @backoff()
+    def _try_acquire(self) -> bool:
+        """
+        Метод делает одну попытку взять блокировку.
+
+        Returns:
+            True - блокировка взята.
+        """
+        token = self._redis.incr(f'{self.name}:fencing_token')
+
+        if not self._redis.set(self.name, token, nx=True, px=self._ttl_ms):
+            return False
+
+        self.token = token
+        return True
+
+    @backoff()
+    def _release(self, token: int):
+        """
+        Метод удаляет ключ блокировки, если в нем все еще токен владельца.
+
+        Args:
+            token: fencing-токен владельца.
+        """
+        self._release_script(keys=[self.name], args=[token])
+
+    def _renew(self) -> bool:
+        """
+        Метод продлевает блокировку, если в ключе все еще токен владельца.
+
+        Returns:
+            True - блокировка продлена.
+        """
+        token = self.token
+        return token is not None and bool(self._renew_script(keys=[self.name], args=[token, self._ttl_ms]))
+
+    def _start_heartbeat(self):
+        """Метод запускает фоновое продление блокировки."""
+        self._heartbeat_stop.clear()
+        self._heartbeat = threading.Thread(target=self._run_heartbeat, name=f'{self.name}_heartbeat', daemon=True)
+        self._heartbeat.start()
+
+    def _stop_heartbeat(self):
+        """Метод останавливает фоновое продление блокировки."""
+        self._heartbeat_stop.set()
+
+        if self._heartbeat is not None:
+            self._heartbeat.join()
+            self._heartbeat = None
+
+    def _run_heartbeat(self):
+        """Метод продлевает блокировку, пока владелец ее не освободит или не потеряет."""
+        while not self._heartbeat_stop.wait(self._ttl_ms / 1000 / 3):
+            try:
+                is_renewed = self._renew()
+            except Exception:
+                logger.warning(f'Не удалось продлить блокировку {self.name}.', exc_info=True)
+                continue
+
+            if not is_renewed:
+                logger.error(f'Блокировка {self.name} с токеном {self.token} потеряна.')
+                self.token = None
+                return
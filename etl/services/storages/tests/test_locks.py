@@ -0,0 +1,56 @@
+"""Модуль отвечает за тесты блокировок в Redis."""
+
+import unittest
+
+from redis import Redis
+
+from ..key_value_decorators import FencedKeyValueDecorator
+from ..key_value_storages import RedisStorage
+from ..locks import RedisLock, LockLostError
+
+
+class Testing(unittest.TestCase):
+    """Класс для тестирования блокировок в Редис."""
+
+    lock_name = 'test_etl_lock'
+
+    def setUp(self):
+        """Метод создает клиент Redis и удаляет блокировку, оставшуюся от прошлых тестов."""
+        self.redis_adapter = Redis(port=6379)
+        self.redis_adapter.delete(self.lock_name)
+
+    def test_lock_is_exclusive(self):
+        """Метод проверяет, что блокировку нельзя взять, пока ее держит другой владелец."""
+        first_lock = RedisLock(self.redis_adapter, self.lock_name, ttl_ms=10000)
+        second_lock = RedisLock(self.redis_adapter, self.lock_name, ttl_ms=10000)
+
+        self.assertTrue(first_lock.acquire())
+        self.assertFalse(second_lock.acquire())
+
+        first_lock.release()
+        self.assertTrue(second_lock.acquire())
+        second_lock.release()
+
+    def test_stale_owner_write_is_rejected(self):
+        """Метод проверяет, что владелец, потерявший блокировку, не может записать состояние."""
+        stale_lock = RedisLock(self.redis_adapter, self.lock_name, ttl_ms=10000)
+        stale_lock.acquire()
+        stale_storage = FencedKeyValueDecorator(RedisStorage(self.redis_adapter), stale_lock)
+
+        self.redis_adapter.delete(self.lock_name)
+        new_lock = RedisLock(self.redis_adapter, self.lock_name, ttl_ms=10000)
+        new_lock.acquire()
+        new_storage = FencedKeyValueDecorator(RedisStorage(self.redis_adapter), new_lock)
+
+        new_storage.set_value('key', 'new_value')
+        with self.assertRaises(LockLostError):
+            stale_storage.set_value('key', 'stale_value')
+
+        self.assertEqual('new_value', new_storage.get_value('key'))
+        self.assertGreater(new_lock.token, stale_lock.token)
+        new_lock.release()
+        stale_lock.release()
+
+
+if __name__ == '__main__':
+    unittest.main()
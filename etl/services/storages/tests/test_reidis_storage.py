@@ -70,6 +70,18 @@ class Testing(unittest.TestCase):
 
         self.assertEqual(None, storage_value)
 
+    def test_set_many_values(self):
+        """Метод отвечает за тестирование записи и чтения нескольких значений за один запрос."""
+        storage = get_redis_storage()
+        key_values = {'first_key': 'first_value', 'second_key': 2}
+
+        storage.set_many(key_values)
+
+        self.assertEqual(
+            {'first_key': 'first_value', 'second_key': '2', 'i_am_mot_exists_in_redis': None},
+            storage.get_many('first_key', 'second_key', 'i_am_mot_exists_in_redis'),
+        )
+
 
 if __name__ == '__main__':
     unittest.main()
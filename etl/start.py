@@ -1,35 +1,87 @@
 """Модуль отвечает за старт ETL процесса."""
-import contextlib
+from functools import partial
 from time import sleep
 
 import psycopg2
 from psycopg2.extras import DictCursor
 from config.settings import (
-    PG_DSL, ES_CONNECTION, REDIS_HOST, REDIS_PORT, ETLProcessType, TIME_TO_RESTART_PROCESSES_SECONDS,
-    ElasticsearchIndex,
+    PG_DSL, ES_CONNECTION, REDIS_HOST, REDIS_PORT, TIME_TO_RESTART_PROCESSES_SECONDS,
+    ElasticsearchIndex, ETL_SCHEDULER_TYPE, ETL_CHANGE_CAPTURE, ETL_LISTEN_NOTIFY, ETL_NOTIFY_CHANNEL,
+    ETL_FALLBACK_POLL_INTERVAL_SECONDS, ETL_NOTIFY_DEBOUNCE_SECONDS, ETLProcessType, get_active_process_types,
 )
 from services.decorators.resiliency import backoff
 from services.context_managers.managers import redis_context, es_context
-from services.process.helpers import get_etl_params_for_redis_pg_es
-from services.process.processes import ETLProcess
-from services.process.helpers import create_es_index_if_not_exists
+from services.process.helpers import create_es_index_if_not_exists, set_outbox_consumer
+from services.process.listeners import PostgreChangeListener, PostgreConnector, get_process_types_for_tables
+from services.process.schedulers import BaseETLScheduler, ETLSchedulerFactory
+from services.process.sharding import get_shard_membership
+
+
+def run_polling(scheduler: BaseETLScheduler, process_types: list[ETLProcessType]):
+    """
+    Функция выполняет циклы ETL-процессов с фиксированным интервалом.
+
+    Args:
+        scheduler: планировщик ETL-процессов.
+        process_types: типы процессов.
+    """
+    while True:
+        scheduler.run_cycle(process_types)
+        sleep(TIME_TO_RESTART_PROCESSES_SECONDS)
+
+
+def run_on_notify(scheduler: BaseETLScheduler, process_types: list[ETLProcessType], connect: PostgreConnector):
+    """
+    Функция запускает ETL-процессы по уведомлениям PostgreSQL об изменении таблиц.
+
+    Запускаются только процессы, зависящие от измененных таблиц. Если уведомлений нет дольше
+    ETL_FALLBACK_POLL_INTERVAL_SECONDS или соединение слушателя было потеряно, выполняется полный цикл.
+
+    Args:
+        scheduler: планировщик ETL-процессов.
+        process_types: типы процессов.
+        connect: функция, открывающая новое соединение с PostgreSQL.
+    """
+    with PostgreChangeListener(connect, ETL_NOTIFY_CHANNEL, ETL_NOTIFY_DEBOUNCE_SECONDS) as listener:
+        # Изменения, сделанные до подписки на канал, догоняем полным циклом.
+        scheduler.run_cycle(process_types)
+
+        while True:
+            tables = listener.wait(ETL_FALLBACK_POLL_INTERVAL_SECONDS)
+
+            if tables:
+                scheduler.run_cycle(get_process_types_for_tables(tables, process_types))
+            else:
+                scheduler.run_cycle(process_types)
 
 
 def main():
     """Основная функция, стартующая ETL-процессы."""
-    connect = backoff()(psycopg2.connect)
+    connect = partial(backoff()(psycopg2.connect), **PG_DSL, cursor_factory=DictCursor)
 
     with redis_context(REDIS_HOST, REDIS_PORT) as redis, es_context(ES_CONNECTION) as es, \
-            contextlib.closing(connect(**PG_DSL, cursor_factory=DictCursor)) as pg:
+            get_shard_membership(redis) as membership, \
+            ETLSchedulerFactory.scheduler_by_type(
+                ETL_SCHEDULER_TYPE, connect, redis, es, membership=membership,
+            ) as scheduler:
         indexes_info = {index.value for index in ElasticsearchIndex}
         create_es_index_if_not_exists(es, *indexes_info)
+        process_types = get_active_process_types()
 
-        while True:
-            for process_type in ETLProcessType:
-                etl_params = get_etl_params_for_redis_pg_es(process_type, pg, redis, es)
-                with ETLProcess(etl_params) as process:
-                    process.start()
-            sleep(TIME_TO_RESTART_PROCESSES_SECONDS)
+        pg_conn = connect()
+        try:
+            set_outbox_consumer(pg_conn, ETL_CHANGE_CAPTURE)
+        finally:
+            pg_conn.close()
+
+        if ETL_CHANGE_CAPTURE:
+            # Изменения, сделанные до регистрации потребителя outbox, догоняем одним циклом опроса по modified.
+            scheduler.run_cycle(get_active_process_types(change_capture=False))
+
+        if ETL_LISTEN_NOTIFY:
+            run_on_notify(scheduler, process_types, connect)
+        else:
+            run_polling(scheduler, process_types)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,136 @@
+"""
+Модуль сравнивает скорость сериализаторов ответов API фильмов.
+
+Страницы списка фильмов собираются из dumpdata.json в том виде, в котором их отдает MoviesListApi:
+UUID, даты и списки имен жанров и персон.
+
+Запуск из каталога movies_admin:
+    python -m benchmarks.serializers --repeat 200
+"""
+import argparse
+import json
+from collections import defaultdict
+from datetime import date
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Dict, List
+from uuid import UUID
+
+from movies.api.v1.serializers import BaseJSONSerializer, OrjsonSerializer, StdlibJSONSerializer, orjson
+
+DUMPDATA_PATH = Path(__file__).resolve().parent.parent / 'dumpdata.json'
+
+PAGE_SIZE = 50
+
+ROLES = ('actor', 'director', 'writer')
+
+
+def load_movies(dumpdata_path: Path) -> List[Dict[str, Any]]:
+    """
+    Функция собирает фильмы из выгрузки dumpdata в том виде, в котором их отдает API.
+
+    Args:
+        dumpdata_path: путь к выгрузке dumpdata.
+
+    Returns:
+        фильмы.
+    """
+    with open(dumpdata_path, 'r', encoding='utf-8') as dumpdata_file:
+        objects = json.load(dumpdata_file)
+
+    names = {obj['pk']: obj['fields'].get('name') or obj['fields'].get('full_name') for obj in objects}
+    film_names = defaultdict(lambda: defaultdict(set))
+
+    for obj in objects:
+        fields = obj['fields']
+
+        if obj['model'] == 'movies.genrefilmwork':
+            film_names[fields['film_work']]['genres'].add(names[fields['genre']])
+        elif obj['model'] == 'movies.personfilmwork':
+            film_names[fields['film_work']][f'{fields["role"]}s'].add(names[fields['person']])
+
+    # В выгрузке у фильмов нет дат выхода, поэтому для сериализации дат берется дата создания записи.
+    return [
+        {
+            'id': UUID(obj['pk']),
+            'title': obj['fields']['title'],
+            'description': obj['fields']['description'],
+            'creation_date': date.fromisoformat((obj['fields']['creation_date'] or obj['fields']['created'])[:10]),
+            'rating': obj['fields']['rating'],
+            'type': obj['fields']['type'],
+            'genres': sorted(film_names[obj['pk']]['genres']),
+            **{f'{role}s': sorted(film_names[obj['pk']][f'{role}s']) for role in ROLES},
+        }
+        for obj in objects
+        if obj['model'] == 'movies.filmwork'
+    ]
+
+
+def make_pages(movies: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Функция делит фильмы на страницы ответа MoviesListApi.
+
+    Args:
+        movies: фильмы.
+
+    Returns:
+        страницы.
+    """
+    total_pages = -(-len(movies) // PAGE_SIZE)
+    return [
+        {
+            'results': movies[page * PAGE_SIZE:(page + 1) * PAGE_SIZE],
+            'count': len(movies),
+            'total_pages': total_pages,
+            'prev': page if page else None,
+            'next': page + 2 if page + 1 < total_pages else None,
+        }
+        for page in range(total_pages)
+    ]
+
+
+def measure_serializer(serializer: BaseJSONSerializer, pages: List[Dict[str, Any]], repeat: int) -> float:
+    """
+    Функция замеряет сериализацию всех страниц repeat раз.
+
+    Args:
+        serializer: сериализатор.
+        pages: страницы.
+        repeat: количество повторов.
+
+    Returns:
+        время в секундах.
+    """
+    started = perf_counter()
+
+    for _ in range(repeat):
+        for page in pages:
+            serializer.dumps(page)
+
+    return perf_counter() - started
+
+
+def main():
+    """Основная функция, запускающая замер сериализаторов."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=100, help='сколько раз сериализуются все страницы')
+    args = parser.parse_args()
+
+    pages = make_pages(load_movies(DUMPDATA_PATH))
+    serializers = {'stdlib': StdlibJSONSerializer()}
+
+    if orjson is not None:
+        serializers['orjson'] = OrjsonSerializer()
+
+    page_count = len(pages) * args.repeat
+
+    for serializer_name, serializer in serializers.items():
+        elapsed = measure_serializer(serializer, pages, args.repeat)
+        print(
+            f'{serializer_name}: {page_count} страниц за {elapsed:.2f} с, '
+            f'{elapsed / page_count * 1_000_000:.0f} мкс на страницу',
+        )
+
+
+if __name__ == '__main__':
+    main()
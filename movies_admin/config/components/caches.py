@@ -0,0 +1,33 @@
+"""Django cache settings for config project."""
+
+import os
+
+# Кеш ответов API фильмов: locmem - в памяти каждого процесса gunicorn, redis - общий для всех процессов.
+MOVIES_API_CACHE_BACKEND = os.getenv('MOVIES_API_CACHE_BACKEND', 'locmem')
+
+MOVIES_API_CACHE_REDIS_URL = os.getenv('MOVIES_API_CACHE_REDIS_URL', 'redis://redis:6379/1')
+
+# Сколько живет ответ в кеше, если его не сбросили сигналы. Ограничивает устаревание при изменениях в обход ORM.
+MOVIES_API_CACHE_SECONDS = int(os.getenv('MOVIES_API_CACHE_SECONDS', 600))
+
+MOVIES_API_CACHE_BACKENDS = {
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'movies_api',
+        'TIMEOUT': MOVIES_API_CACHE_SECONDS,
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+    'redis': {
+        'BACKEND': 'django_redis.cache.RedisCache',
+        'LOCATION': MOVIES_API_CACHE_REDIS_URL,
+        'TIMEOUT': MOVIES_API_CACHE_SECONDS,
+        'KEY_PREFIX': 'movies_api',
+    },
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'movies_api': MOVIES_API_CACHE_BACKENDS[MOVIES_API_CACHE_BACKEND],
+}
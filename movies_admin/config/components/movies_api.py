@@ -0,0 +1,15 @@
+"""Django movies API settings for config project."""
+
+import os
+
+# True - API фильмов отдает готовые документы из content.film_work_document, которые поддерживают триггеры.
+MOVIES_API_USE_DOCUMENTS = os.getenv('MOVIES_API_USE_DOCUMENTS', 'False') == 'True'
+
+# Способ подсчета общего количества фильмов в списке: exact - COUNT(*) на каждый запрос, cached - COUNT(*)
+# с кешированием, estimated - оценка по статистике PostgreSQL, none - количество не считается.
+MOVIES_API_COUNT_STRATEGY = os.getenv('MOVIES_API_COUNT_STRATEGY', 'exact')
+
+MOVIES_API_COUNT_CACHE_SECONDS = int(os.getenv('MOVIES_API_COUNT_CACHE_SECONDS', 300))
+
+# Сериализатор ответов API фильмов в JSON: orjson или stdlib (модуль json с DjangoJSONEncoder).
+MOVIES_API_JSON_SERIALIZER = os.getenv('MOVIES_API_JSON_SERIALIZER', 'orjson')
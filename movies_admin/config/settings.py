@@ -11,4 +11,6 @@ include(
     'components/database.py',
     'components/internationalization.py',
     'components/corsheaders_setup.py',
+    'components/movies_api.py',
+    'components/caches.py',
 )
@@ -0,0 +1,38 @@
+"""Модуль отвечает за валидаторы условных GET-запросов к API фильмов (ETag и Last-Modified)."""
+from datetime import datetime
+from typing import Optional
+
+from django.http import HttpRequest
+from movies.api.v1.response_cache import get_catalog_modified, get_catalog_version
+
+
+def get_catalog_etag(request: HttpRequest, *args, **kwargs) -> str:
+    """
+    Функция возвращает ETag ответа API фильмов.
+
+    Ответ зависит только от запроса и состояния каталога, поэтому ETag - версия каталога.
+
+    Args:
+        request: запрос.
+        args: позиционные аргументы представления.
+        kwargs: именованные аргументы представления.
+
+    Returns:
+        ETag без кавычек.
+    """
+    return get_catalog_version()
+
+
+def get_catalog_last_modified(request: HttpRequest, *args, **kwargs) -> Optional[datetime]:
+    """
+    Функция возвращает Last-Modified ответа API фильмов: время последнего изменения каталога.
+
+    Args:
+        request: запрос.
+        args: позиционные аргументы представления.
+        kwargs: именованные аргументы представления.
+
+    Returns:
+        время последнего изменения каталога.
+    """
+    return get_catalog_modified()
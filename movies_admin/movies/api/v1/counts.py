@@ -0,0 +1,196 @@
+"""Модуль отвечает за способы подсчета общего количества фильмов для постраничной выдачи."""
+from abc import ABC, abstractmethod
+from typing import Optional, Type
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.core.paginator import Paginator
+from django.db import connection
+from django.db.models import Model, QuerySet
+from django.utils.functional import cached_property
+from movies.api.v1.response_cache import CACHE_ALIAS
+from movies.models import Filmwork
+
+COUNT_CACHE_KEY = 'movies_api_count'
+
+ESTIMATE_SQL = 'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass'
+
+
+class BaseCountStrategy(ABC):
+    """
+    Базовый класс способа подсчета количества фильмов.
+
+    Attributes:
+        is_exact: True - количество точное, по нему можно проверять номер страницы.
+    """
+
+    is_exact = True
+
+    @abstractmethod
+    def count(self, queryset: QuerySet) -> Optional[int]:
+        """
+        Метод возвращает количество фильмов в выдаче.
+
+        Args:
+            queryset: фильмы выдачи.
+
+        Returns:
+            количество фильмов. None - количество не считается.
+        """
+
+
+class ExactCount(BaseCountStrategy):
+    """Класс считает фильмы запросом COUNT(*) при каждом обращении."""
+
+    def count(self, queryset: QuerySet) -> Optional[int]:
+        """
+        Метод возвращает количество фильмов в выдаче.
+
+        Args:
+            queryset: фильмы выдачи.
+
+        Returns:
+            количество фильмов.
+        """
+        return queryset.count()
+
+
+class CachedCount(ExactCount):
+    """
+    Класс хранит точное количество фильмов в кеше ответов API фильмов.
+
+    Значение удаляется из кеша при сохранении и удалении фильма (см. movies.signals). Изменения в обход ORM
+    сигналов не вызывают, поэтому значение в любом случае живет не дольше MOVIES_API_COUNT_CACHE_SECONDS.
+    """
+
+    def count(self, queryset: QuerySet) -> Optional[int]:
+        """
+        Метод возвращает количество фильмов в выдаче.
+
+        Args:
+            queryset: фильмы выдачи.
+
+        Returns:
+            количество фильмов.
+        """
+        cache = caches[CACHE_ALIAS]
+        films_count = cache.get(COUNT_CACHE_KEY)
+
+        if films_count is None:
+            films_count = super().count(queryset)
+            cache.set(COUNT_CACHE_KEY, films_count, settings.MOVIES_API_COUNT_CACHE_SECONDS)
+
+        return films_count
+
+
+class EstimatedCount(BaseCountStrategy):
+    """
+    Класс оценивает количество фильмов по статистике PostgreSQL (pg_class.reltuples).
+
+    Оценка обновляется VACUUM и ANALYZE и подходит только для выдачи всех строк таблицы без фильтров.
+    """
+
+    is_exact = False
+
+    def __init__(self, model: Type[Model]):
+        """
+        Инициализирующий метод.
+
+        Args:
+            model: модель, количество строк таблицы которой оценивается.
+        """
+        self._model = model
+
+    def count(self, queryset: QuerySet) -> Optional[int]:
+        """
+        Метод возвращает оценку количества фильмов в выдаче.
+
+        Args:
+            queryset: фильмы выдачи.
+
+        Returns:
+            оценка количества фильмов. None - таблица еще не анализировалась.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(ESTIMATE_SQL, [f'"{self._model._meta.db_table}"'])
+            row = cursor.fetchone()
+
+        if row is None or row[0] < 0:
+            return None
+
+        return row[0]
+
+
+class NoCount(BaseCountStrategy):
+    """Класс не считает фильмы: в выдаче нет общего количества фильмов и страниц."""
+
+    is_exact = False
+
+    def count(self, queryset: QuerySet) -> Optional[int]:
+        """
+        Метод возвращает количество фильмов в выдаче.
+
+        Args:
+            queryset: фильмы выдачи.
+
+        Returns:
+            None - количество не считается.
+        """
+        return None
+
+
+class CountStrategyPaginator(Paginator):
+    """Класс постраничной выдачи, который считает количество объектов заданным способом."""
+
+    def __init__(self, *args, count_strategy: BaseCountStrategy, **kwargs):
+        """
+        Инициализирующий метод.
+
+        Args:
+            args: позиционные аргументы Paginator.
+            count_strategy: способ подсчета количества объектов. Должен возвращать точное количество.
+            kwargs: именованные аргументы Paginator.
+        """
+        super().__init__(*args, **kwargs)
+        self._count_strategy = count_strategy
+
+    @cached_property
+    def count(self) -> int:
+        """
+        Свойство возвращает общее количество объектов.
+
+        Returns:
+            количество объектов.
+        """
+        return self._count_strategy.count(self.object_list)
+
+
+COUNT_STRATEGIES = {
+    'exact': ExactCount(),
+    'cached': CachedCount(),
+    'estimated': EstimatedCount(Filmwork),
+    'none': NoCount(),
+}
+
+
+def get_count_strategy(strategy_name: str) -> BaseCountStrategy:
+    """
+    Функция возвращает способ подсчета количества фильмов по наименованию.
+
+    Args:
+        strategy_name: наименование способа подсчета.
+
+    Returns:
+        способ подсчета.
+
+    Raises:
+        ImproperlyConfigured: способа подсчета с таким наименованием нет.
+    """
+    try:
+        return COUNT_STRATEGIES[strategy_name]
+    except KeyError as error:
+        raise ImproperlyConfigured(
+            f'Неизвестный способ подсчета MOVIES_API_COUNT_STRATEGY={strategy_name}. '
+            f'Доступные способы: {", ".join(COUNT_STRATEGIES)}.',
+        ) from error
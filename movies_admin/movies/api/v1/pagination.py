@@ -0,0 +1,172 @@
+"""Модуль отвечает за постраничную выдачу фильмов по курсору (keyset pagination)."""
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from typing import Any, List, Optional, Tuple
+from uuid import UUID
+
+from django.db.models import Q, QuerySet
+
+FORWARD = 'next'
+BACKWARD = 'prev'
+
+
+@dataclass(frozen=True)
+class Cursor:
+    """Класс описывает позицию в списке фильмов: ключ сортировки и id крайнего фильма страницы."""
+
+    sort_key: Any
+    id: str
+    direction: str = FORWARD
+
+
+@dataclass
+class CursorPage:
+    """Класс описывает страницу, полученную по курсору."""
+
+    keys: List[Tuple[Any, Any]]
+    next: Optional[str]
+    prev: Optional[str]
+
+
+def encode_cursor(cursor: Cursor) -> str:
+    """
+    Функция кодирует курсор в непрозрачную для клиента строку.
+
+    Args:
+        cursor: курсор.
+
+    Returns:
+        строка курсора.
+    """
+    payload = json.dumps([cursor.sort_key, cursor.id, cursor.direction], separators=(',', ':'), ensure_ascii=False)
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token: str) -> Cursor:
+    """
+    Функция декодирует строку курсора.
+
+    Args:
+        token: строка курсора.
+
+    Returns:
+        курсор.
+
+    Raises:
+        ValueError: строка не является курсором.
+    """
+    try:
+        sort_key, film_id, direction = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as error:
+        raise ValueError(f'Некорректный курсор {token}.') from error
+
+    if direction not in {FORWARD, BACKWARD} or not isinstance(film_id, str):
+        raise ValueError(f'Некорректный курсор {token}.')
+
+    try:
+        UUID(film_id)
+    except ValueError as error:
+        raise ValueError(f'Некорректный курсор {token}.') from error
+
+    return Cursor(sort_key=sort_key, id=film_id, direction=direction)
+
+
+class CursorPaginator:
+    """
+    Класс выбирает страницу фильмов по курсору.
+
+    Страница начинается сразу после пары (ключ сортировки, id) из курсора, поэтому PostgreSQL читает
+    по индексу только строки страницы, а не пропускает все предыдущие строки, как при OFFSET.
+    Пагинатор возвращает только ключи фильмов страницы: тяжелые данные фильмов выбираются
+    отдельным запросом по id страницы.
+    """
+
+    def __init__(self, queryset: QuerySet, sort_field: str, per_page: int):
+        """
+        Инициализирующий метод.
+
+        Args:
+            queryset: фильмы, отсортировать которые можно по sort_field и id.
+            sort_field: поле сортировки. Поле не должно принимать значение NULL.
+            per_page: количество фильмов на странице.
+        """
+        self._queryset = queryset
+        self._sort_field = sort_field
+        self._per_page = per_page
+
+    def get_page(self, token: Optional[str] = None) -> CursorPage:
+        """
+        Метод возвращает страницу по строке курсора.
+
+        Args:
+            token: строка курсора. Пустая строка или None - первая страница.
+
+        Returns:
+            страница.
+
+        Raises:
+            ValueError: строка не является курсором.
+        """
+        cursor = decode_cursor(token) if token else None
+        is_backward = cursor is not None and cursor.direction == BACKWARD
+        keys = list(self._get_keys_queryset(cursor, is_backward)[:self._per_page + 1])
+        has_more = len(keys) > self._per_page
+        keys = keys[:self._per_page]
+
+        if is_backward:
+            keys.reverse()
+
+        has_next = cursor is not None if is_backward else has_more
+        has_prev = has_more if is_backward else cursor is not None
+
+        return CursorPage(
+            keys=keys,
+            next=encode_cursor(self._get_cursor(keys[-1], FORWARD)) if has_next and keys else None,
+            prev=encode_cursor(self._get_cursor(keys[0], BACKWARD)) if has_prev and keys else None,
+        )
+
+    def _get_keys_queryset(self, cursor: Optional[Cursor], is_backward: bool) -> QuerySet:
+        """
+        Метод возвращает запрос ключей фильмов, начиная с позиции курсора.
+
+        Args:
+            cursor: курсор. None - с начала списка.
+            is_backward: True - фильмы перед курсором в обратном порядке.
+
+        Returns:
+            QuerySet пар (ключ сортировки, id).
+        """
+        queryset = self._queryset.values_list(self._sort_field, 'id')
+
+        if is_backward:
+            queryset = queryset.order_by(f'-{self._sort_field}', '-id')
+        else:
+            queryset = queryset.order_by(self._sort_field, 'id')
+
+        if cursor is None:
+            return queryset
+
+        # Нестрогое условие по ключу сортировки задает границу сканирования индекса (sort_field, id),
+        # условие OR отсекает только фильмы с тем же ключом, что и у фильма из курсора.
+        lookup = 'lt' if is_backward else 'gt'
+        return queryset.filter(**{f'{self._sort_field}__{lookup}e': cursor.sort_key}).filter(
+            Q(**{f'{self._sort_field}__{lookup}': cursor.sort_key}) |
+            Q(**{self._sort_field: cursor.sort_key, f'id__{lookup}': cursor.id}),
+        )
+
+    @staticmethod
+    def _get_cursor(key: Tuple[Any, Any], direction: str) -> Cursor:
+        """
+        Метод возвращает курсор для пары (ключ сортировки, id).
+
+        Args:
+            key: пара (ключ сортировки, id).
+            direction: направление перехода.
+
+        Returns:
+            курсор.
+        """
+        sort_key, film_id = key
+        return Cursor(sort_key=sort_key, id=str(film_id), direction=direction)
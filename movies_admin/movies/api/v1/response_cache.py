@@ -0,0 +1,146 @@
+"""Модуль отвечает за кеш ответов API фильмов и версию каталога фильмов."""
+from datetime import datetime
+from hashlib import md5
+from typing import Iterable, Optional
+from uuid import uuid4
+
+from django.core.cache import caches
+from django.db import connection
+from django.http import QueryDict
+from django.utils import timezone
+
+CACHE_ALIAS = 'movies_api'
+
+CATALOG_VERSION_KEY = 'catalog_version'
+
+CATALOG_MODIFIED_KEY = 'catalog_modified'
+
+# Каждый подзапрос читает одну строку с конца индекса по modified.
+CATALOG_MODIFIED_SQL = """
+SELECT GREATEST(
+    (SELECT max(modified) FROM content.film_work),
+    (SELECT max(modified) FROM content.genre),
+    (SELECT max(modified) FROM content.person)
+)
+"""
+
+# Параметры запроса, от которых зависит страница списка фильмов.
+LIST_PARAMS = ('page', 'cursor')
+
+
+def get_detail_cache_key(film_id: str) -> str:
+    """
+    Функция возвращает ключ кеша ответа с фильмом.
+
+    Args:
+        film_id: id фильма.
+
+    Returns:
+        ключ кеша.
+    """
+    return f'detail:{film_id}'
+
+
+def get_list_cache_key(query_params: QueryDict) -> str:
+    """
+    Функция возвращает ключ кеша страницы списка фильмов.
+
+    Ключ содержит версию каталога: после изменения любого фильма версия меняется, и все страницы
+    списка перестают находиться в кеше.
+
+    Args:
+        query_params: параметры запроса.
+
+    Returns:
+        ключ кеша.
+    """
+    page_params = '&'.join(f'{param}={query_params.get(param)}' for param in LIST_PARAMS if param in query_params)
+    return f'list:{get_catalog_version()}:{md5(page_params.encode()).hexdigest()}'
+
+
+def get_catalog_version() -> str:
+    """
+    Функция возвращает текущую версию каталога фильмов, создавая ее при первом обращении.
+
+    Версия меняется при каждом изменении фильмов, жанров, персон и их связей через ORM. Как и ответы, версия
+    хранится в кеше MOVIES_API_CACHE_SECONDS, поэтому изменения в обход ORM меняют ETag не позже этого срока.
+
+    Returns:
+        версия каталога.
+    """
+    cache = caches[CACHE_ALIAS]
+    version = cache.get(CATALOG_VERSION_KEY)
+
+    if version is None:
+        cache.add(CATALOG_VERSION_KEY, uuid4().hex)
+        version = cache.get(CATALOG_VERSION_KEY)
+
+    return version
+
+
+def get_catalog_modified() -> Optional[datetime]:
+    """
+    Функция возвращает время последнего изменения каталога фильмов.
+
+    Время запоминается при изменении каталога через ORM. Если в кеше его нет, оно берется из наибольшего
+    modified фильмов, жанров и персон. Время хранится в кеше MOVIES_API_CACHE_SECONDS, как и ответы.
+
+    Returns:
+        время последнего изменения. None - каталог пуст.
+    """
+    cache = caches[CACHE_ALIAS]
+    modified = cache.get(CATALOG_MODIFIED_KEY)
+
+    if modified is None:
+        with connection.cursor() as cursor:
+            cursor.execute(CATALOG_MODIFIED_SQL)
+            modified = cursor.fetchone()[0]
+
+        if modified is not None:
+            cache.add(CATALOG_MODIFIED_KEY, modified)
+
+    return modified
+
+
+def get_response(cache_key: str) -> Optional[bytes]:
+    """
+    Функция возвращает тело ответа из кеша.
+
+    Args:
+        cache_key: ключ кеша.
+
+    Returns:
+        JSON-тело ответа. None - ответа в кеше нет.
+    """
+    return caches[CACHE_ALIAS].get(cache_key)
+
+
+def set_response(cache_key: str, content: bytes):
+    """
+    Функция сохраняет тело ответа в кеш на MOVIES_API_CACHE_SECONDS.
+
+    Args:
+        cache_key: ключ кеша.
+        content: JSON-тело ответа.
+    """
+    caches[CACHE_ALIAS].set(cache_key, content)
+
+
+def invalidate_films(film_ids: Iterable):
+    """
+    Функция удаляет из кеша ответы, которые зависят от фильмов.
+
+    Удаляются ответы с этими фильмами и все страницы списка фильмов, версия каталога и время его изменения
+    обновляются.
+
+    Args:
+        film_ids: id измененных фильмов.
+    """
+    detail_keys = [get_detail_cache_key(str(film_id)) for film_id in film_ids]
+
+    if not detail_keys:
+        return
+
+    cache = caches[CACHE_ALIAS]
+    cache.delete_many(detail_keys)
+    cache.set_many({CATALOG_VERSION_KEY: uuid4().hex, CATALOG_MODIFIED_KEY: timezone.now()})
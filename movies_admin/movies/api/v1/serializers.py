@@ -0,0 +1,131 @@
+"""Модуль отвечает за сериализацию ответов API фильмов в JSON."""
+import json
+import logging
+from abc import ABC, abstractmethod
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.serializers.json import DjangoJSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+class BaseJSONSerializer(ABC):
+    """Базовый класс сериализатора ответов API в JSON."""
+
+    @abstractmethod
+    def dumps(self, data: Any) -> bytes:
+        """
+        Метод сериализует данные в JSON.
+
+        Args:
+            data: данные ответа.
+
+        Returns:
+            JSON в кодировке UTF-8.
+        """
+
+
+class StdlibJSONSerializer(BaseJSONSerializer):
+    """Класс сериализует данные модулем json с DjangoJSONEncoder, как JsonResponse."""
+
+    def dumps(self, data: Any) -> bytes:
+        """
+        Метод сериализует данные в JSON.
+
+        Args:
+            data: данные ответа.
+
+        Returns:
+            JSON в кодировке UTF-8.
+        """
+        return json.dumps(data, cls=DjangoJSONEncoder).encode()
+
+
+def encode_decimal(value: Any) -> str:
+    """
+    Функция сериализует значения, которые orjson не поддерживает сам.
+
+    Decimal сериализуется строкой, как в DjangoJSONEncoder.
+
+    Args:
+        value: значение.
+
+    Returns:
+        строковое представление значения.
+
+    Raises:
+        TypeError: значение не поддерживается.
+    """
+    if isinstance(value, Decimal):
+        return str(value)
+
+    raise TypeError(f'Тип {type(value).__name__} не сериализуется в JSON.')
+
+
+class OrjsonSerializer(StdlibJSONSerializer):
+    """
+    Класс сериализует данные библиотекой orjson.
+
+    UUID, даты и время orjson сериализует сам, без вызова Python-кода для каждого значения. Время в UTC
+    записывается с суффиксом Z, как в DjangoJSONEncoder. Если orjson не смог сериализовать данные
+    (например, целое число больше 64 бит), используется модуль json.
+    """
+
+    def dumps(self, data: Any) -> bytes:
+        """
+        Метод сериализует данные в JSON.
+
+        Args:
+            data: данные ответа.
+
+        Returns:
+            JSON в кодировке UTF-8.
+        """
+        try:
+            return orjson.dumps(data, default=encode_decimal, option=orjson.OPT_UTC_Z)
+        except TypeError:
+            logger.warning('orjson не смог сериализовать ответ, используется модуль json.', exc_info=True)
+            return super().dumps(data)
+
+
+JSON_SERIALIZERS = {
+    'stdlib': StdlibJSONSerializer,
+    'orjson': OrjsonSerializer,
+}
+
+
+@lru_cache(maxsize=None)
+def get_json_serializer(serializer_name: str) -> BaseJSONSerializer:
+    """
+    Функция возвращает сериализатор по наименованию.
+
+    Если выбран orjson, но библиотека не установлена, используется модуль json.
+
+    Args:
+        serializer_name: наименование сериализатора.
+
+    Returns:
+        сериализатор.
+
+    Raises:
+        ImproperlyConfigured: сериализатора с таким наименованием нет.
+    """
+    if serializer_name not in JSON_SERIALIZERS:
+        raise ImproperlyConfigured(
+            f'Неизвестный сериализатор MOVIES_API_JSON_SERIALIZER={serializer_name}. '
+            f'Доступные сериализаторы: {", ".join(JSON_SERIALIZERS)}.',
+        )
+
+    if serializer_name == 'orjson' and orjson is None:
+        logger.warning('Библиотека orjson не установлена, ответы API сериализуются модулем json.')
+        return StdlibJSONSerializer()
+
+    return JSON_SERIALIZERS[serializer_name]()
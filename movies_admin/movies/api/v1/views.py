@@ -1,11 +1,32 @@
 """Модуль содержит все views для работы api v1."""
+from abc import ABC, abstractmethod
+from http import HTTPStatus
+from math import ceil
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from django.conf import settings
 from django.contrib.postgres.aggregates import ArrayAgg
 from django.db.models import Q, F
 from django.db.models import QuerySet
-from django.http import JsonResponse
+from django.http import Http404, HttpResponse
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
 from django.views.generic.detail import BaseDetailView
 from django.views.generic.list import BaseListView
-from movies.models import Filmwork
+from movies.api.v1.conditional import get_catalog_etag, get_catalog_last_modified
+from movies.api.v1.counts import CountStrategyPaginator, get_count_strategy
+from movies.api.v1.pagination import CursorPaginator
+from movies.api.v1.response_cache import get_detail_cache_key, get_list_cache_key, get_response, set_response
+from movies.api.v1.serializers import get_json_serializer
+from movies.models import Filmwork, FilmworkDocument
+
+# Условные GET-запросы с актуальными If-None-Match или If-Modified-Since получают ответ 304
+# до обращения к кешу ответов и к PostgreSQL.
+catalog_condition = method_decorator(
+    condition(etag_func=get_catalog_etag, last_modified_func=get_catalog_last_modified),
+    name='dispatch',
+)
 
 
 class MoviesApiMixin:
@@ -14,9 +35,18 @@ class MoviesApiMixin:
     def get_queryset(self) -> QuerySet:
         """Метод возвращает QuerySet.
 
+        Если включена настройка MOVIES_API_USE_DOCUMENTS, фильмы берутся из таблицы готовых документов,
+        иначе документы собираются агрегацией при каждом запросе.
+
         Returns:
             QuerySet.
         """
+        if settings.MOVIES_API_USE_DOCUMENTS:
+            return (
+                FilmworkDocument.objects.filter(api_document__isnull=False).
+                values_list('api_document', flat=True)
+            )
+
         array_agg_person = (
             lambda person_type:
             ArrayAgg(F('persons__full_name'), filter=Q(personfilmwork__role=person_type), distinct=True)
@@ -35,22 +65,83 @@ class MoviesApiMixin:
 
     def render_to_response(self, context, **response_kwargs):
         """
-        Метод возвращает JSON-ответ.
+        Метод возвращает JSON-ответ, сериализованный сериализатором из MOVIES_API_JSON_SERIALIZER.
 
         Args:
             context: словарь данных для формирования страницы.
             response_kwargs: именованные аргументы.
 
         Returns:
-            JsonResponse.
+            HttpResponse.
+        """
+        serializer = get_json_serializer(settings.MOVIES_API_JSON_SERIALIZER)
+        return HttpResponse(serializer.dumps(context), content_type='application/json')
+
+
+class CachedResponseMixin(ABC):
+    """
+    Миксин отдает JSON-ответ из кеша ответов API фильмов, а если его там нет - формирует и кеширует.
+
+    Ответы сбрасываются из кеша сигналами моделей (см. movies.signals).
+    """
+
+    def get(self, request, *args, **kwargs):
+        """
+        Метод обрабатывает GET-запрос.
+
+        Args:
+            request: запрос.
+            args: позиционные аргументы.
+            kwargs: именнованые аргументы.
+
+        Returns:
+            HttpResponse.
+        """
+        cache_key = self.get_cache_key()
+        content = get_response(cache_key)
+
+        if content is not None:
+            return HttpResponse(content, content_type='application/json')
+
+        response = super().get(request, *args, **kwargs)
+
+        if response.status_code == HTTPStatus.OK:
+            set_response(cache_key, response.content)
+
+        return response
+
+    @abstractmethod
+    def get_cache_key(self) -> str:
+        """
+        Метод возвращает ключ кеша ответа.
+
+        Returns:
+            ключ кеша.
         """
-        return JsonResponse(context)
 
 
-class MoviesListApi(MoviesApiMixin, BaseListView):
-    """Представление для списка фильмов."""
+@catalog_condition
+class MoviesListApi(CachedResponseMixin, MoviesApiMixin, BaseListView):
+    """
+    Представление для списка фильмов.
+
+    Если в запросе передан параметр cursor, фильмы выдаются по курсору: prev и next содержат курсоры
+    соседних страниц, а стоимость страницы не зависит от ее номера. Пустой cursor - первая страница.
+    Иначе фильмы выдаются по номеру страницы page, а общее количество фильмов считается способом
+    из MOVIES_API_COUNT_STRATEGY.
+    """
 
     paginate_by = 50
+    cursor_sort_field = 'title'
+
+    def get_cache_key(self) -> str:
+        """
+        Метод возвращает ключ кеша страницы списка.
+
+        Returns:
+            ключ кеша.
+        """
+        return get_list_cache_key(self.request.GET)
 
     def get_context_data(self, *, object_list=None, **kwargs):
         """
@@ -63,7 +154,14 @@ class MoviesListApi(MoviesApiMixin, BaseListView):
         Returns:
             словарь данных для формирования страницы.
         """
+        if 'cursor' in self.request.GET:
+            return self.get_cursor_context_data(self.request.GET['cursor'])
+
         queryset = self.get_queryset()
+        count_strategy = get_count_strategy(settings.MOVIES_API_COUNT_STRATEGY)
+
+        if not count_strategy.is_exact:
+            return self.get_uncounted_context_data(queryset, count_strategy.count(queryset))
 
         paginator, page, queryset, is_paginated = self.paginate_queryset(
             queryset,
@@ -78,10 +176,138 @@ class MoviesListApi(MoviesApiMixin, BaseListView):
             'next': page.next_page_number() if page.has_next() else None,
         }
 
+    def get_paginator(self, queryset, per_page, orphans=0, allow_empty_first_page=True, **kwargs):
+        """
+        Метод возвращает пагинатор, который считает фильмы способом из MOVIES_API_COUNT_STRATEGY.
+
+        Args:
+            queryset: фильмы.
+            per_page: количество фильмов на странице.
+            orphans: минимальное количество фильмов на последней странице.
+            allow_empty_first_page: True - первая страница может быть пустой.
+            kwargs: именованные аргументы.
+
+        Returns:
+            CountStrategyPaginator.
+        """
+        return CountStrategyPaginator(
+            queryset,
+            per_page,
+            orphans=orphans,
+            allow_empty_first_page=allow_empty_first_page,
+            count_strategy=get_count_strategy(settings.MOVIES_API_COUNT_STRATEGY),
+            **kwargs,
+        )
+
+    def get_uncounted_context_data(self, queryset: QuerySet, films_count: Optional[int]) -> Dict[str, Any]:
+        """
+        Метод возвращает словарь данных для страницы, если точное количество фильмов неизвестно.
+
+        Наличие следующей страницы определяется по лишнему фильму в выборке страницы, а не по количеству.
+
+        Args:
+            queryset: фильмы.
+            films_count: оценка количества фильмов. None - количество не считается.
+
+        Returns:
+            словарь данных для формирования страницы.
+
+        Raises:
+            Http404: страницы с таким номером нет.
+        """
+        page_number = self.get_page_number()
+        bottom = (page_number - 1) * self.paginate_by
+        movies = list(queryset[bottom:bottom + self.paginate_by + 1])
+
+        if not movies and page_number > 1:
+            raise Http404(f'Страницы {page_number} нет.')
+
+        return {
+            'results': movies[:self.paginate_by],
+            'count': films_count,
+            'total_pages': ceil(films_count / self.paginate_by) if films_count is not None else None,
+            'prev': page_number - 1 if page_number > 1 else None,
+            'next': page_number + 1 if len(movies) > self.paginate_by else None,
+        }
+
+    def get_page_number(self) -> int:
+        """
+        Метод возвращает номер запрошенной страницы.
+
+        Returns:
+            номер страницы.
+
+        Raises:
+            Http404: номер страницы не является положительным целым числом.
+        """
+        page = self.kwargs.get(self.page_kwarg) or self.request.GET.get(self.page_kwarg) or 1
+
+        try:
+            page_number = int(page)
+        except ValueError as error:
+            raise Http404(f'Некорректный номер страницы {page}.') from error
+
+        if page_number < 1:
+            raise Http404(f'Некорректный номер страницы {page}.')
+
+        return page_number
+
+    def get_cursor_context_data(self, cursor: str) -> Dict[str, Any]:
+        """
+        Метод возвращает словарь данных для страницы по курсору.
+
+        Сначала по индексу выбираются id фильмов страницы, затем данные только этих фильмов.
+        Общее количество фильмов не считается: это потребовало бы прочитать весь каталог.
+
+        Args:
+            cursor: строка курсора.
+
+        Returns:
+            словарь данных для формирования страницы.
+
+        Raises:
+            Http404: строка не является курсором.
+        """
+        paginator = CursorPaginator(Filmwork.objects.all(), self.cursor_sort_field, self.paginate_by)
+
+        try:
+            page = paginator.get_page(cursor)
+        except ValueError as error:
+            raise Http404(str(error)) from error
+
+        return {
+            'results': self.get_movies([film_id for _, film_id in page.keys]),
+            'prev': page.prev,
+            'next': page.next,
+        }
+
+    def get_movies(self, film_ids: List[UUID]) -> List[Dict[str, Any]]:
+        """
+        Метод возвращает фильмы с заданными id в том же порядке.
 
-class MoviesDetailApi(MoviesApiMixin, BaseDetailView):
+        Args:
+            film_ids: id фильмов.
+
+        Returns:
+            список фильмов.
+        """
+        movies = {str(movie['id']): movie for movie in self.get_queryset().filter(id__in=film_ids)}
+        return [movies[str(film_id)] for film_id in film_ids if str(film_id) in movies]
+
+
+@catalog_condition
+class MoviesDetailApi(CachedResponseMixin, MoviesApiMixin, BaseDetailView):
     """Представление для конкретного фильма."""
 
+    def get_cache_key(self) -> str:
+        """
+        Метод возвращает ключ кеша ответа с фильмом.
+
+        Returns:
+            ключ кеша.
+        """
+        return get_detail_cache_key(str(self.kwargs[self.pk_url_kwarg]))
+
     def get_context_data(self, *args, **kwargs):
         """
         Метод возвращает словарь данных для формирования страницы.
@@ -1,5 +1,7 @@
 """Конфигурация приложения Фильмы."""
 
+from importlib import import_module
+
 from django.apps import AppConfig
 from django.utils.translation import gettext_lazy as _
 
@@ -10,3 +12,7 @@ class MoviesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'movies'
     verbose_name = _('movies')
+
+    def ready(self):
+        """Метод подключает обработчики сигналов приложения."""
+        import_module('movies.signals')
@@ -0,0 +1,91 @@
+# Generated by Django 3.2 on 2026-10-18 12:00
+
+from django.db import migrations
+
+OUTBOX_SQL = """
+CREATE TABLE IF NOT EXISTS content.etl_outbox (
+    id bigserial PRIMARY KEY,
+    entity text NOT NULL,
+    entity_id uuid NOT NULL,
+    op char(1) NOT NULL,
+    ts timestamp with time zone NOT NULL DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS content.etl_outbox_consumer (
+    name text PRIMARY KEY,
+    registered timestamp with time zone NOT NULL DEFAULT now()
+);
+
+-- Для таблиц связей в outbox пишется id фильма, так как после удаления связи по ее id фильм уже не найти.
+-- Изменения пишутся только тогда, когда у outbox есть потребитель: пока ETL работает в режиме
+-- опроса по modified, таблица не растет.
+CREATE OR REPLACE FUNCTION content.etl_outbox_capture() RETURNS trigger AS $$
+DECLARE
+    changed_row record;
+BEGIN
+    PERFORM 1 FROM content.etl_outbox_consumer LIMIT 1;
+    IF NOT FOUND THEN
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP = 'DELETE' THEN
+        changed_row := OLD;
+    ELSE
+        changed_row := NEW;
+    END IF;
+
+    IF TG_TABLE_NAME IN ('genre_film_work', 'person_film_work') THEN
+        INSERT INTO content.etl_outbox (entity, entity_id, op)
+        VALUES (TG_TABLE_NAME, changed_row.film_work_id, left(TG_OP, 1));
+
+        IF TG_OP = 'UPDATE' THEN
+            IF OLD.film_work_id <> NEW.film_work_id THEN
+                INSERT INTO content.etl_outbox (entity, entity_id, op)
+                VALUES (TG_TABLE_NAME, OLD.film_work_id, left(TG_OP, 1));
+            END IF;
+        END IF;
+    ELSE
+        INSERT INTO content.etl_outbox (entity, entity_id, op)
+        VALUES (TG_TABLE_NAME, changed_row.id, left(TG_OP, 1));
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER etl_outbox_capture AFTER INSERT OR UPDATE OR DELETE ON content.film_work
+    FOR EACH ROW EXECUTE FUNCTION content.etl_outbox_capture();
+CREATE TRIGGER etl_outbox_capture AFTER INSERT OR UPDATE OR DELETE ON content.genre
+    FOR EACH ROW EXECUTE FUNCTION content.etl_outbox_capture();
+CREATE TRIGGER etl_outbox_capture AFTER INSERT OR UPDATE OR DELETE ON content.person
+    FOR EACH ROW EXECUTE FUNCTION content.etl_outbox_capture();
+CREATE TRIGGER etl_outbox_capture AFTER INSERT OR UPDATE OR DELETE ON content.genre_film_work
+    FOR EACH ROW EXECUTE FUNCTION content.etl_outbox_capture();
+CREATE TRIGGER etl_outbox_capture AFTER INSERT OR UPDATE OR DELETE ON content.person_film_work
+    FOR EACH ROW EXECUTE FUNCTION content.etl_outbox_capture();
+"""
+
+OUTBOX_REVERSE_SQL = """
+DROP TRIGGER IF EXISTS etl_outbox_capture ON content.person_film_work;
+DROP TRIGGER IF EXISTS etl_outbox_capture ON content.genre_film_work;
+DROP TRIGGER IF EXISTS etl_outbox_capture ON content.person;
+DROP TRIGGER IF EXISTS etl_outbox_capture ON content.genre;
+DROP TRIGGER IF EXISTS etl_outbox_capture ON content.film_work;
+DROP FUNCTION IF EXISTS content.etl_outbox_capture();
+DROP TABLE IF EXISTS content.etl_outbox_consumer;
+DROP TABLE IF EXISTS content.etl_outbox;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0003_auto_20230111_2029'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=OUTBOX_SQL,
+            reverse_sql=OUTBOX_REVERSE_SQL,
+        ),
+    ]
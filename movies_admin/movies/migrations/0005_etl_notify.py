@@ -0,0 +1,49 @@
+# Generated by Django 3.2 on 2026-10-18 12:00
+
+from django.db import migrations
+
+# Канал должен совпадать с ETL_NOTIFY_CHANNEL в настройках ETL.
+NOTIFY_SQL = """
+-- Триггеры уровня оператора: один массовый UPDATE порождает одно уведомление, а одинаковые уведомления
+-- внутри транзакции PostgreSQL схлопывает сам. Уведомления доставляются слушателям только после COMMIT.
+CREATE OR REPLACE FUNCTION content.etl_notify() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('etl_changes', TG_TABLE_NAME);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER etl_notify AFTER INSERT OR UPDATE OR DELETE ON content.film_work
+    FOR EACH STATEMENT EXECUTE FUNCTION content.etl_notify();
+CREATE TRIGGER etl_notify AFTER INSERT OR UPDATE OR DELETE ON content.genre
+    FOR EACH STATEMENT EXECUTE FUNCTION content.etl_notify();
+CREATE TRIGGER etl_notify AFTER INSERT OR UPDATE OR DELETE ON content.person
+    FOR EACH STATEMENT EXECUTE FUNCTION content.etl_notify();
+CREATE TRIGGER etl_notify AFTER INSERT OR UPDATE OR DELETE ON content.genre_film_work
+    FOR EACH STATEMENT EXECUTE FUNCTION content.etl_notify();
+CREATE TRIGGER etl_notify AFTER INSERT OR UPDATE OR DELETE ON content.person_film_work
+    FOR EACH STATEMENT EXECUTE FUNCTION content.etl_notify();
+"""
+
+NOTIFY_REVERSE_SQL = """
+DROP TRIGGER IF EXISTS etl_notify ON content.person_film_work;
+DROP TRIGGER IF EXISTS etl_notify ON content.genre_film_work;
+DROP TRIGGER IF EXISTS etl_notify ON content.person;
+DROP TRIGGER IF EXISTS etl_notify ON content.genre;
+DROP TRIGGER IF EXISTS etl_notify ON content.film_work;
+DROP FUNCTION IF EXISTS content.etl_notify();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0004_etl_outbox'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=NOTIFY_SQL,
+            reverse_sql=NOTIFY_REVERSE_SQL,
+        ),
+    ]
@@ -0,0 +1,197 @@
+# Generated by Django 3.2 on 2026-10-18 12:00
+
+from django.db import migrations, models
+
+DOCUMENT_TABLES = ('film_work', 'genre', 'person', 'genre_film_work', 'person_film_work')
+
+DOCUMENT_SQL = """
+-- document - документ фильма для Elasticsearch, api_document - ответ API фильмов.
+-- Для удаленного фильма оба документа становятся NULL: так ETL узнает, что документ нужно удалить.
+CREATE TABLE IF NOT EXISTS content.film_work_document (
+    id uuid PRIMARY KEY,
+    document jsonb,
+    api_document jsonb,
+    modified timestamp with time zone NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS film_work_document_modified_idx ON content.film_work_document (modified, id);
+
+-- Транзакции, которые одновременно меняют один фильм, пересобирают его документ по очереди. Иначе документ,
+-- собранный по снимку данных транзакции, которая зафиксируется позже, перезапишет более новый документ.
+-- Блокировка строки фильма не мешает проверкам внешних ключей (FOR KEY SHARE), а строки блокируются
+-- в порядке id, чтобы пересборки пересекающихся наборов фильмов не взаимоблокировались. В READ COMMITTED
+-- следующие запросы функции видят данные транзакции, которая держала блокировку.
+CREATE OR REPLACE FUNCTION content.film_work_document_refresh(film_ids uuid[]) RETURNS void AS $$
+BEGIN
+    PERFORM 1 FROM content.film_work fw WHERE fw.id = ANY(film_ids) ORDER BY fw.id FOR NO KEY UPDATE;
+
+    UPDATE content.film_work_document d
+    SET document = NULL, api_document = NULL, modified = now()
+    WHERE d.id = ANY(film_ids)
+        AND d.document IS NOT NULL
+        AND NOT EXISTS (SELECT 1 FROM content.film_work fw WHERE fw.id = d.id);
+
+    INSERT INTO content.film_work_document AS d (id, document, api_document)
+    SELECT
+        fw.id,
+        jsonb_build_object(
+            'id', fw.id,
+            'imdb_rating', fw.rating,
+            'genres', COALESCE(
+                jsonb_agg(DISTINCT jsonb_build_object('id', g.id, 'name', g.name)) FILTER (WHERE g.id IS NOT NULL),
+                '[]'
+            ),
+            'title', fw.title,
+            'description', fw.description,
+            'persons', array_agg(DISTINCT p.id::text) FILTER (WHERE p.id IS NOT NULL),
+            'directors_names',
+                array_agg(DISTINCT p.full_name) FILTER (WHERE p.id IS NOT NULL AND pfw.role = 'director'),
+            'actors_names', array_agg(DISTINCT p.full_name) FILTER (WHERE p.id IS NOT NULL AND pfw.role = 'actor'),
+            'writers_names', array_agg(DISTINCT p.full_name) FILTER (WHERE p.id IS NOT NULL AND pfw.role = 'writer'),
+            'actors', COALESCE(
+                jsonb_agg(DISTINCT jsonb_build_object('id', p.id, 'name', p.full_name))
+                    FILTER (WHERE p.id IS NOT NULL AND pfw.role = 'actor'),
+                '[]'
+            ),
+            'writers', COALESCE(
+                jsonb_agg(DISTINCT jsonb_build_object('id', p.id, 'name', p.full_name))
+                    FILTER (WHERE p.id IS NOT NULL AND pfw.role = 'writer'),
+                '[]'
+            ),
+            'directors', COALESCE(
+                jsonb_agg(DISTINCT jsonb_build_object('id', p.id, 'name', p.full_name))
+                    FILTER (WHERE p.id IS NOT NULL AND pfw.role = 'director'),
+                '[]'
+            )
+        ),
+        jsonb_build_object(
+            'id', fw.id,
+            'title', fw.title,
+            'description', fw.description,
+            'creation_date', fw.creation_date,
+            'rating', fw.rating,
+            'type', fw.type,
+            'genres', COALESCE(array_agg(DISTINCT g.name) FILTER (WHERE g.id IS NOT NULL), '{}'),
+            'actors', COALESCE(array_agg(DISTINCT p.full_name) FILTER (WHERE pfw.role = 'actor'), '{}'),
+            'directors', COALESCE(array_agg(DISTINCT p.full_name) FILTER (WHERE pfw.role = 'director'), '{}'),
+            'writers', COALESCE(array_agg(DISTINCT p.full_name) FILTER (WHERE pfw.role = 'writer'), '{}')
+        )
+    FROM content.film_work fw
+    LEFT JOIN content.person_film_work pfw ON pfw.film_work_id = fw.id
+    LEFT JOIN content.person p ON p.id = pfw.person_id
+    LEFT JOIN content.genre_film_work gfw ON gfw.film_work_id = fw.id
+    LEFT JOIN content.genre g ON g.id = gfw.genre_id
+    WHERE fw.id = ANY(film_ids)
+    GROUP BY fw.id
+    -- Неизмененный документ не перезаписывается, чтобы ETL не загружал его повторно.
+    ON CONFLICT (id) DO UPDATE
+    SET document = EXCLUDED.document, api_document = EXCLUDED.api_document, modified = now()
+    WHERE d.document IS DISTINCT FROM EXCLUDED.document OR d.api_document IS DISTINCT FROM EXCLUDED.api_document;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Триггеры уровня оператора с таблицами переходов: массовое изменение жанра или персоны пересобирает
+-- документы всех затронутых фильмов одним запросом, а не отдельным запросом на каждую строку.
+CREATE OR REPLACE FUNCTION content.film_work_document_capture() RETURNS trigger AS $$
+DECLARE
+    key_column text := CASE
+        WHEN TG_TABLE_NAME IN ('genre_film_work', 'person_film_work') THEN 'film_work_id'
+        ELSE 'id'
+    END;
+    changed_ids uuid[] := '{}';
+    film_ids uuid[];
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        changed_ids := changed_ids || ARRAY(SELECT (to_jsonb(o) ->> key_column)::uuid FROM old_rows o);
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        changed_ids := changed_ids || ARRAY(SELECT (to_jsonb(n) ->> key_column)::uuid FROM new_rows n);
+    END IF;
+
+    IF TG_TABLE_NAME = 'genre' THEN
+        film_ids := ARRAY(
+            SELECT DISTINCT gfw.film_work_id FROM content.genre_film_work gfw WHERE gfw.genre_id = ANY(changed_ids)
+        );
+    ELSIF TG_TABLE_NAME = 'person' THEN
+        film_ids := ARRAY(
+            SELECT DISTINCT pfw.film_work_id FROM content.person_film_work pfw WHERE pfw.person_id = ANY(changed_ids)
+        );
+    ELSE
+        film_ids := ARRAY(SELECT DISTINCT unnest(changed_ids));
+    END IF;
+
+    IF cardinality(film_ids) > 0 THEN
+        PERFORM content.film_work_document_refresh(film_ids);
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+# Таблицы переходов нельзя объявить у триггера на несколько событий, поэтому у каждой таблицы три триггера.
+TRIGGERS_SQL = """
+CREATE TRIGGER film_work_document_insert AFTER INSERT ON content.{table}
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION content.film_work_document_capture();
+CREATE TRIGGER film_work_document_update AFTER UPDATE ON content.{table}
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION content.film_work_document_capture();
+CREATE TRIGGER film_work_document_delete AFTER DELETE ON content.{table}
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION content.film_work_document_capture();
+"""
+
+FILL_SQL = """
+SELECT content.film_work_document_refresh(ARRAY(SELECT fw.id FROM content.film_work fw));
+"""
+
+DROP_TRIGGERS_SQL = """
+DROP TRIGGER IF EXISTS film_work_document_delete ON content.{table};
+DROP TRIGGER IF EXISTS film_work_document_update ON content.{table};
+DROP TRIGGER IF EXISTS film_work_document_insert ON content.{table};
+"""
+
+DOCUMENT_REVERSE_SQL = """
+DROP FUNCTION IF EXISTS content.film_work_document_capture();
+DROP FUNCTION IF EXISTS content.film_work_document_refresh(uuid[]);
+DROP TABLE IF EXISTS content.film_work_document;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0005_etl_notify'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=DOCUMENT_SQL,
+            reverse_sql=DOCUMENT_REVERSE_SQL,
+        ),
+        migrations.RunSQL(
+            sql=''.join(TRIGGERS_SQL.format(table=table) for table in DOCUMENT_TABLES),
+            reverse_sql=''.join(DROP_TRIGGERS_SQL.format(table=table) for table in reversed(DOCUMENT_TABLES)),
+        ),
+        migrations.RunSQL(
+            sql=FILL_SQL,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.CreateModel(
+            name='FilmworkDocument',
+            fields=[
+                ('id', models.UUIDField(primary_key=True, serialize=False)),
+                ('document', models.JSONField(null=True)),
+                ('api_document', models.JSONField(null=True)),
+                ('modified', models.DateTimeField()),
+            ],
+            options={
+                'verbose_name': 'Filmwork document',
+                'verbose_name_plural': 'Filmwork documents',
+                'db_table': 'content"."film_work_document',
+                'managed': False,
+            },
+        ),
+    ]
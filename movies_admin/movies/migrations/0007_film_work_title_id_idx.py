@@ -0,0 +1,17 @@
+# Generated by Django 3.2 on 2026-10-18 14:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0006_film_work_document'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='filmwork',
+            index=models.Index(fields=['title', 'id'], name='film_work_title_id_idx'),
+        ),
+    ]
@@ -109,6 +109,7 @@ class Filmwork(UUIDMixin, TimeStampedMixin):
         verbose_name_plural = _('Filmworks')
         indexes = [
             models.Index(fields=['title'], name='film_work_title_idx'),
+            models.Index(fields=['title', 'id'], name='film_work_title_id_idx'),
             models.Index(fields=['creation_date'], name='film_work_creation_date_idx'),
             models.Index(fields=['rating'], name='film_work_rating_idx'),
             models.Index(fields=['modified'], name='film_work_modified_idx'),
@@ -196,3 +197,31 @@ class PersonFilmwork(UUIDMixin):
             film=self.film_work.title,
             person=self.person.full_name,
         )
+
+
+class FilmworkDocument(models.Model):
+    """
+    Описание модели таблицы готовых документов кинопроизведений.
+
+    Таблица заполняется триггерами PostgreSQL при изменении фильмов, жанров, персон и связей.
+    """
+
+    id = models.UUIDField(primary_key=True)
+    document = models.JSONField(null=True)
+    api_document = models.JSONField(null=True)
+    modified = models.DateTimeField()
+
+    class Meta:
+        db_table = "content\".\"film_work_document"
+        verbose_name = _('Filmwork document')
+        verbose_name_plural = _('Filmwork documents')
+        managed = False
+
+    def __str__(self):
+        """
+        Строковое представление.
+
+        Returns:
+            str: представление в виде строки
+        """
+        return str(self.id)
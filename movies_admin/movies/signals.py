@@ -0,0 +1,123 @@
+"""Модуль содержит обработчики сигналов моделей приложения Фильмы."""
+from functools import partial
+from typing import Iterable
+
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from movies.api.v1.counts import COUNT_CACHE_KEY
+from movies.api.v1.response_cache import CACHE_ALIAS, invalidate_films
+from movies.models import Filmwork, Genre, GenreFilmwork, Person, PersonFilmwork
+
+# Модель связи с фильмами и ее поле, указывающее на жанр или персону.
+RELATED_LINKS = {
+    Genre: (GenreFilmwork, 'genre'),
+    Person: (PersonFilmwork, 'person'),
+}
+
+LINK_FIELDS = {link_model: field_name for link_model, field_name in RELATED_LINKS.values()}
+
+# Действия m2m_changed, после которых меняются фильмы. Для очистки связи фильмы нужно найти до нее.
+M2M_ACTIONS = frozenset(('post_add', 'post_remove', 'pre_clear'))
+
+
+def invalidate_films_on_commit(film_ids: Iterable):
+    """
+    Функция удаляет из кеша ответы API, зависящие от фильмов, после фиксации текущей транзакции.
+
+    Если удалить ответы до фиксации, запрос между сигналом и фиксацией прочитает старые данные и сохранит
+    их в кеш под новой версией каталога. id фильмов вычисляются сразу, пока связи еще не изменены.
+
+    Args:
+        film_ids: id измененных фильмов.
+    """
+    transaction.on_commit(partial(invalidate_films, list(film_ids)))
+
+
+@receiver(post_save, sender=Filmwork)
+@receiver(post_delete, sender=Filmwork)
+def reset_movies_count(sender, **kwargs):
+    """
+    Функция удаляет из кеша количество фильмов после фиксации транзакции, сохранившей или удалившей фильм.
+
+    Args:
+        sender: модель, отправившая сигнал.
+        kwargs: именованные аргументы сигнала.
+    """
+    transaction.on_commit(partial(caches[CACHE_ALIAS].delete, COUNT_CACHE_KEY))
+
+
+@receiver(post_save, sender=Filmwork)
+@receiver(post_delete, sender=Filmwork)
+def reset_film_responses(sender, instance, **kwargs):
+    """
+    Функция удаляет из кеша ответы API, зависящие от сохраненного или удаленного фильма.
+
+    Args:
+        sender: модель, отправившая сигнал.
+        instance: фильм.
+        kwargs: именованные аргументы сигнала.
+    """
+    invalidate_films_on_commit([instance.pk])
+
+
+@receiver(post_save, sender=GenreFilmwork)
+@receiver(post_delete, sender=GenreFilmwork)
+@receiver(post_save, sender=PersonFilmwork)
+@receiver(post_delete, sender=PersonFilmwork)
+def reset_link_responses(sender, instance, **kwargs):
+    """
+    Функция удаляет из кеша ответы API, зависящие от фильма измененной связи с жанром или персоной.
+
+    Args:
+        sender: модель, отправившая сигнал.
+        instance: связь фильма.
+        kwargs: именованные аргументы сигнала.
+    """
+    invalidate_films_on_commit([instance.film_work_id])
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_save, sender=Person)
+def reset_related_responses(sender, instance, **kwargs):
+    """
+    Функция удаляет из кеша ответы API с фильмами измененного жанра или персоны.
+
+    При удалении жанра или персоны удаляются и их связи с фильмами, поэтому ответы сбрасывают сигналы связей.
+
+    Args:
+        sender: модель, отправившая сигнал.
+        instance: жанр или персона.
+        kwargs: именованные аргументы сигнала.
+    """
+    link_model, field_name = RELATED_LINKS[sender]
+    invalidate_films_on_commit(
+        link_model.objects.filter(**{field_name: instance}).values_list('film_work_id', flat=True).distinct(),
+    )
+
+
+@receiver(m2m_changed, sender=GenreFilmwork)
+@receiver(m2m_changed, sender=PersonFilmwork)
+def reset_m2m_responses(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Функция удаляет из кеша ответы API с фильмами, связи которых изменены через ManyToManyField.
+
+    Args:
+        sender: модель связи.
+        instance: фильм, если связь изменена со стороны фильма, иначе жанр или персона.
+        action: действие со связью.
+        reverse: True - связь изменена со стороны жанра или персоны.
+        pk_set: id добавленных или удаленных объектов другой стороны связи.
+        kwargs: именованные аргументы сигнала.
+    """
+    if action not in M2M_ACTIONS:
+        return
+
+    if not reverse:
+        invalidate_films_on_commit([instance.pk])
+    elif action == 'pre_clear':
+        links = sender.objects.filter(**{LINK_FIELDS[sender]: instance})
+        invalidate_films_on_commit(links.values_list('film_work_id', flat=True))
+    else:
+        invalidate_films_on_commit(pk_set)
@@ -1 +1,200 @@
 """Модуль для реализации тестов приложения."""
+import json
+from datetime import date
+from decimal import Decimal
+from unittest import mock
+from uuid import UUID
+
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.http import Http404, HttpRequest, HttpResponse, QueryDict
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.views.decorators.http import condition
+
+from movies.api.v1.conditional import get_catalog_etag, get_catalog_last_modified
+from movies.api.v1.counts import COUNT_CACHE_KEY, CachedCount, EstimatedCount, ExactCount, get_count_strategy
+from movies.api.v1.pagination import BACKWARD, Cursor, decode_cursor, encode_cursor
+from movies.api.v1.response_cache import (
+    CACHE_ALIAS, get_catalog_modified, get_catalog_version, get_detail_cache_key, get_list_cache_key, get_response,
+    invalidate_films, set_response,
+)
+from movies.api.v1.serializers import OrjsonSerializer, StdlibJSONSerializer
+from movies.api.v1.views import MoviesListApi
+from movies.models import Filmwork
+
+TEST_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+    'movies_api': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'movies_api_tests'},
+}
+
+
+@condition(etag_func=get_catalog_etag, last_modified_func=get_catalog_last_modified)
+def catalog_view(request: HttpRequest) -> HttpResponse:
+    """
+    Функция отвечает на запрос с валидаторами каталога, как представления API фильмов.
+
+    Args:
+        request: запрос.
+
+    Returns:
+        HttpResponse.
+    """
+    return HttpResponse(b'{}', content_type='application/json')
+
+
+class CursorTests(SimpleTestCase):
+    """Класс для тестирования курсоров постраничной выдачи фильмов."""
+
+    def test_cursor_round_trip(self):
+        """Метод проверяет, что курсор восстанавливается из строки без изменений."""
+        cursor = Cursor(sort_key='Звездные войны', id='3d825f60-9fff-4dfe-b294-1a45fa1e115d', direction=BACKWARD)
+        self.assertEqual(decode_cursor(encode_cursor(cursor)), cursor)
+
+    def test_invalid_cursor(self):
+        """Метод проверяет, что строка, не являющаяся курсором, отклоняется."""
+        tokens = (
+            'not-a-cursor',
+            encode_cursor(Cursor(sort_key='a', id='3d825f60-9fff-4dfe-b294-1a45fa1e115d', direction='up')),
+            encode_cursor(Cursor(sort_key='a', id='not-a-uuid')),
+        )
+
+        for token in tokens:
+            with self.assertRaises(ValueError):
+                decode_cursor(token)
+
+
+@override_settings(CACHES=TEST_CACHES)
+class ResponseCacheTests(SimpleTestCase):
+    """Класс для тестирования кеша ответов API фильмов."""
+
+    film_id = '3d825f60-9fff-4dfe-b294-1a45fa1e115d'
+
+    def test_invalidate_films(self):
+        """Метод проверяет, что изменение фильма сбрасывает ответ с фильмом, все страницы списка и версию каталога."""
+        list_key = get_list_cache_key(QueryDict('page=2'))
+        catalog_version = get_catalog_version()
+        set_response(list_key, b'{"results": []}')
+        set_response(get_detail_cache_key(self.film_id), b'{}')
+
+        invalidate_films([self.film_id])
+
+        self.assertIsNone(get_response(get_detail_cache_key(self.film_id)))
+        self.assertNotEqual(get_list_cache_key(QueryDict('page=2')), list_key)
+        self.assertNotEqual(get_catalog_version(), catalog_version)
+        self.assertIsNotNone(get_catalog_modified())
+
+    def test_list_key_ignores_other_params(self):
+        """Метод проверяет, что ключ страницы списка зависит только от номера страницы и курсора."""
+        self.assertEqual(get_list_cache_key(QueryDict('page=2&utm=1')), get_list_cache_key(QueryDict('page=2')))
+        self.assertNotEqual(get_list_cache_key(QueryDict('page=2')), get_list_cache_key(QueryDict('page=3')))
+
+
+@override_settings(CACHES=TEST_CACHES)
+class ConditionalTests(SimpleTestCase):
+    """Класс для тестирования условных GET-запросов к API фильмов."""
+
+    film_id = '3d825f60-9fff-4dfe-b294-1a45fa1e115d'
+
+    def test_not_modified_until_catalog_changes(self):
+        """Метод проверяет, что актуальный ETag получает 304, а после изменения каталога - 200."""
+        factory = RequestFactory()
+        invalidate_films([self.film_id])
+        etag = catalog_view(factory.get('/api/v1/movies/'))['ETag']
+
+        response = catalog_view(factory.get('/api/v1/movies/', HTTP_IF_NONE_MATCH=etag))
+        self.assertEqual(response.status_code, 304)
+
+        invalidate_films([self.film_id])
+        response = catalog_view(factory.get('/api/v1/movies/', HTTP_IF_NONE_MATCH=etag))
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+
+@override_settings(CACHES=TEST_CACHES)
+class CountStrategyTests(SimpleTestCase):
+    """Класс для тестирования способов подсчета количества фильмов."""
+
+    def test_get_count_strategy(self):
+        """Метод проверяет, что способ подсчета выбирается по наименованию, а неизвестное наименование отклоняется."""
+        self.assertIsInstance(get_count_strategy('exact'), ExactCount)
+
+        with self.assertRaises(ImproperlyConfigured):
+            get_count_strategy('approximate')
+
+    def test_cached_count(self):
+        """Метод проверяет, что кешированное количество считается один раз."""
+        caches[CACHE_ALIAS].delete(COUNT_CACHE_KEY)
+        queryset = mock.Mock()
+        queryset.count.return_value = 3
+
+        self.assertEqual(CachedCount().count(queryset), 3)
+        self.assertEqual(CachedCount().count(queryset), 3)
+        queryset.count.assert_called_once()
+
+    @mock.patch('movies.api.v1.counts.connection')
+    def test_estimated_count(self, connection):
+        """Метод проверяет, что для неанализированной таблицы оценки нет."""
+        cursor = connection.cursor.return_value.__enter__.return_value
+
+        for row, estimate in (((42,), 42), ((-1,), None), (None, None)):
+            with self.subTest(row=row):
+                cursor.fetchone.return_value = row
+                self.assertEqual(EstimatedCount(Filmwork).count(Filmwork.objects.none()), estimate)
+
+
+class UncountedPageTests(SimpleTestCase):
+    """Класс для тестирования постраничной выдачи фильмов без точного количества."""
+
+    films = list(range(101))
+
+    def get_context_data(self, query: str, films_count=None):
+        """
+        Метод возвращает данные страницы списка фильмов для строки запроса.
+
+        Args:
+            query: строка запроса.
+            films_count: оценка количества фильмов.
+
+        Returns:
+            словарь данных для формирования страницы.
+        """
+        view = MoviesListApi()
+        view.setup(RequestFactory().get(f'/api/v1/movies/?{query}'))
+        return view.get_uncounted_context_data(self.films, films_count)
+
+    def test_next_page_by_extra_film(self):
+        """Метод проверяет, что следующая страница определяется по лишнему фильму в выборке."""
+        context = self.get_context_data('page=2', films_count=100)
+
+        self.assertEqual(context['results'], self.films[50:100])
+        self.assertEqual((context['prev'], context['next']), (1, 3))
+        self.assertEqual(context['total_pages'], 2)
+
+        context = self.get_context_data('page=3')
+
+        self.assertEqual(context['results'], [100])
+        self.assertEqual((context['prev'], context['next']), (2, None))
+        self.assertIsNone(context['total_pages'])
+
+    def test_invalid_page(self):
+        """Метод проверяет, что несуществующая и некорректная страница дают 404."""
+        for query in ('page=4', 'page=0', 'page=abc'):
+            with self.subTest(query=query):
+                with self.assertRaises(Http404):
+                    self.get_context_data(query)
+
+
+class SerializerTests(SimpleTestCase):
+    """Класс для тестирования сериализаторов ответов API фильмов."""
+
+    def test_orjson_matches_stdlib(self):
+        """Метод проверяет, что orjson сериализует UUID, даты и Decimal так же, как DjangoJSONEncoder."""
+        data = {
+            'id': UUID('3d825f60-9fff-4dfe-b294-1a45fa1e115d'),
+            'creation_date': date(1977, 5, 25),
+            'rating': Decimal('8.6'),
+            'actors': ['Mark Hamill', 'Harrison Ford'],
+            'big': 2 ** 70,
+        }
+
+        self.assertEqual(json.loads(OrjsonSerializer().dumps(data)), json.loads(StdlibJSONSerializer().dumps(data)))